@@ -9,16 +9,28 @@ Uso:
   python -m benchmark_v2 --categories "self-correction" "factual-grounding"
   python -m benchmark_v2 --seeds 5                    # mais seeds
   python -m benchmark_v2 --no-graphs                  # pula graficos
+  python -m benchmark_v2 --max-parallel 1             # sequencial por provider
+  python -m benchmark_v2 --no-cache                   # ignora cache de respostas
+  python -m benchmark_v2 --judge-batch-size 5         # agrupa chamadas do judge
+  python -m benchmark_v2 --deduplicate                # reusa prompts identicos
+  python -m benchmark_v2 --resume                     # continua run interrompido
 """
 
 import argparse
+import asyncio
 import json
 import logging
 import os
+import re
 import sys
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Awaitable, BinaryIO, Dict, List, Mapping, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson e opcional; fallback para json stdlib
+    orjson = None
 
 # Garante que o diretorio pai (atic_consulting) esta no path
 # para que imports do ATIC e do benchmark_v2 funcionem
@@ -28,34 +40,49 @@ if _PARENT_DIR not in sys.path:
     sys.path.insert(0, _PARENT_DIR)
 
 # Carrega .env do diretorio pai (atic_consulting/.env)
+# KEY=valor, KEY="valor" ou KEY='valor'; comentarios (#) nao casam
 _ENV_FILE = os.path.join(_PARENT_DIR, ".env")
+_ENV_RE = re.compile(
+    r"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*([\"']?)(.*?)\2[ \t]*\r?$",
+    re.MULTILINE,
+)
 if os.path.exists(_ENV_FILE):
     with open(_ENV_FILE, "r", encoding="utf-8") as _f:
-        for _line in _f:
-            _line = _line.strip()
-            if _line and not _line.startswith("#") and "=" in _line:
-                _key, _, _val = _line.partition("=")
-                _key = _key.strip()
-                _val = _val.strip().strip('"').strip("'")
-                if _key and _key not in os.environ:
-                    os.environ[_key] = _val
+        for _m in _ENV_RE.finditer(_f.read()):
+            os.environ.setdefault(_m.group(1), _m.group(3))
 
+from benchmark_v2.cache import LLMCache, RequestDeduplicator
 from benchmark_v2.providers import detect_and_create_providers, BaseProvider
+from benchmark_v2.providers.base_provider import (
+    aclose_shared_http_clients, close_shared_http_clients,
+)
 from benchmark_v2.tests import get_all_tests, get_categories, TestDef
 from benchmark_v2.evaluators import (
-    evaluate_structural, evaluate_reference, evaluate_judge,
+    evaluate_structural, evaluate_reference, evaluate_judge, JudgeBatcher,
 )
-from benchmark_v2.analysis.statistics import (
-    compute_model_statistics, compute_category_statistics,
-)
-from benchmark_v2.analysis.graphs import generate_all_graphs
-from benchmark_v2.analysis.report import generate_report
 
 logger = logging.getLogger("benchmark_v2")
 
 # Defaults
 DEFAULT_SEEDS = 3
 DEFAULT_OUTPUT_DIR = os.path.join(_BENCHMARK_DIR, "results")
+DEFAULT_CACHE_DIR = os.path.join(_BENCHMARK_DIR, ".llm_cache")
+
+# Audit: uma avaliacao por linha (JSONL) + metadados agregados
+AUDIT_JSONL_FILE = "benchmark_audit.jsonl"
+AUDIT_META_FILE = "benchmark_audit_meta.json"
+
+# Estimativa de runtime: ~10s por query, ~2 prompts/teste, + 5s judge
+_SECONDS_PER_EVALUATION = 2 * 10 + 5
+_TIEBREAK_FACTOR = 1.2  # 20% extra para tiebreaks
+
+SUMMARY_LABELS = {
+    "atic_on": "ATIC (ON)",
+    "atic_off": "ATIC (OFF)",
+    "claude": "Claude",
+    "gpt": "GPT-4o",
+    "gemini": "Gemini",
+}
 
 
 def parse_args():
@@ -83,6 +110,39 @@ def parse_args():
         "--no-graphs", action="store_true",
         help="Pular geracao de graficos"
     )
+    parser.add_argument(
+        "--max-parallel", type=int, default=None,
+        help="Limite de chamadas simultaneas por provider "
+             "(default: definido por provider)"
+    )
+    parser.add_argument(
+        "--judge-batch-size", type=int, default=1,
+        help="Respostas do mesmo teste avaliadas por request do judge "
+             "(default: 1 = sem batch)"
+    )
+    parser.add_argument(
+        "--speculative-tiebreak", action="store_true",
+        help="Dispara o judge de tiebreak em paralelo quando os layers 1+2 "
+             "indicam divergencia provavel (menor latencia, chamadas extras)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Desativa cache de respostas LLM"
+    )
+    parser.add_argument(
+        "--cache-ttl", type=float, default=0.0,
+        help="Validade do cache em segundos (default: 0 = sem expiracao)"
+    )
+    parser.add_argument(
+        "--deduplicate", action="store_true",
+        help="Reusa respostas de chamadas identicas (mesmo modelo, prompts "
+             "e parametros) dentro do run"
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Reaproveita avaliacoes ja gravadas no audit JSONL do "
+             "output-dir e executa so as pendentes"
+    )
     parser.add_argument(
         "--output-dir", default=DEFAULT_OUTPUT_DIR,
         help="Diretorio de saida"
@@ -105,9 +165,9 @@ def setup_logging(verbose: bool = False):
 
 
 def filter_tests(
-    all_tests: Dict[str, TestDef],
+    all_tests: Mapping[str, TestDef],
     categories: Optional[List[str]] = None,
-) -> Dict[str, TestDef]:
+) -> Mapping[str, TestDef]:
     """Filtra testes por categoria se especificado."""
     if not categories:
         return all_tests
@@ -123,37 +183,39 @@ def estimate_runtime(
     n_tests: int, n_providers: int, n_seeds: int, enable_tiebreak: bool
 ) -> str:
     """Estima tempo de execucao."""
-    # ~10s por query, ~2 prompts/teste em media, + 5s judge
-    calls_per_test = 2  # media de prompts
-    judge_time = 5
-    base = n_tests * n_providers * n_seeds * (calls_per_test * 10 + judge_time)
+    base = n_tests * n_providers * n_seeds * _SECONDS_PER_EVALUATION
     if enable_tiebreak:
-        base *= 1.2  # 20% extra para tiebreaks
+        base *= _TIEBREAK_FACTOR
     minutes = base / 60
     return f"~{minutes:.0f} min"
 
 
-def run_single_evaluation(
+async def run_single_evaluation(
     test: TestDef,
     provider: BaseProvider,
     available_providers: Dict[str, BaseProvider],
     enable_tiebreak: bool = True,
+    seed: int = 0,
+    judge_batcher: Optional[JudgeBatcher] = None,
+    speculative_tiebreak: bool = False,
 ) -> Dict:
     """
     Executa um teste com um provider e retorna resultado completo.
+    Coroutine: pode rodar em paralelo com outras avaliacoes.
     """
     result = {
         "test_id": test.test_id,
         "model": provider.provider_id,
-        "timestamp": datetime.now().isoformat(),
+        # Inteiro (ns desde epoch); ISO so quando alguem precisar ler
+        "timestamp_ns": time.time_ns(),
     }
 
     # --- Execucao ---
-    start = time.perf_counter()
+    start = time.perf_counter_ns()
     if len(test.prompts) > 1:
-        rounds = provider.query_multi_round(test.prompts)
+        rounds = await provider.aquery_multi_round(test.prompts, seed=seed)
     else:
-        response = provider.query(test.prompts[0])
+        response = await provider.aquery(test.prompts[0], seed=seed)
         rounds = [
             {"role": "user", "content": test.prompts[0]},
             {
@@ -164,7 +226,7 @@ def run_single_evaluation(
                 "error": response.error,
             },
         ]
-    exec_time = time.perf_counter() - start
+    exec_time = (time.perf_counter_ns() - start) / 1e9
 
     result["rounds"] = rounds
     result["exec_seconds"] = round(exec_time, 2)
@@ -181,8 +243,13 @@ def run_single_evaluation(
         result["final_score"] = 0.0
         return result
 
+    # Textos do assistente extraidos uma vez para as camadas 1 e 2
+    assistant_texts = [
+        msg.get("content", "") for msg in rounds if msg.get("role") == "assistant"
+    ]
+
     # --- Layer 1: Structural ---
-    structural = evaluate_structural(test.structural_checks, rounds)
+    structural = evaluate_structural(test.structural_checks, rounds, assistant_texts)
     result["structural_score"] = structural.normalized
     result["structural_details"] = [
         {"id": d.check_id, "passed": d.passed, "score": d.score, "detail": d.detail}
@@ -190,13 +257,13 @@ def run_single_evaluation(
     ]
 
     # --- Layer 2: Reference ---
-    reference = evaluate_reference(test, rounds)
+    reference = evaluate_reference(test, rounds, assistant_texts)
     result["reference_score"] = reference.normalized
     result["reference_sub_scores"] = reference.sub_scores
     result["hallucination_flags"] = reference.hallucination_flags
 
     # --- Layer 3: Judge ---
-    judge_result, judge_audit = evaluate_judge(
+    judge_result, judge_audit = await evaluate_judge(
         test_name=test.name,
         category=test.category,
         prompts=test.prompts,
@@ -207,6 +274,9 @@ def run_single_evaluation(
         structural_normalized=structural.normalized,
         reference_normalized=reference.normalized,
         enable_tiebreak=enable_tiebreak,
+        seed=seed,
+        batcher=judge_batcher,
+        speculative_tiebreak=speculative_tiebreak,
     )
     result["judge_score"] = judge_result.normalized
     result["judge_raw"] = judge_result.score_raw
@@ -232,11 +302,84 @@ def run_single_evaluation(
     return result
 
 
+async def run_all_evaluations(
+    tests: Mapping[str, TestDef],
+    providers: Dict[str, BaseProvider],
+    n_seeds: int,
+    enable_tiebreak: bool = True,
+    judge_batch_size: int = 1,
+    audit_file: Optional[BinaryIO] = None,
+    done: Optional[Set[Tuple[str, str, int]]] = None,
+    speculative_tiebreak: bool = False,
+) -> List[Dict]:
+    """
+    Agenda todas as tuplas (seed, teste, provider) concorrentemente.
+    O paralelismo real e limitado pelo semaphore de cada provider.
+    judge_batch_size > 1 agrupa avaliacoes do judge por (judge, teste, seed).
+    audit_file: cada avaliacao e gravada (JSONL) assim que termina, para
+    que um run interrompido deixe um audit valido ate aquele ponto.
+    done: tuplas (test_id, provider_id, seed) ja concluidas (--resume).
+    speculative_tiebreak: judge de tiebreak em paralelo quando provavel.
+    Retorna avaliacoes novas na ordem seed -> teste -> provider.
+    """
+    done = done or set()
+    judge_batcher = (
+        JudgeBatcher(judge_batch_size) if judge_batch_size > 1 else None
+    )
+    total_runs = len(tests) * len(providers) * n_seeds - len(done)
+    run_count = 0
+
+    async def _run(seed: int, test: TestDef, provider: BaseProvider) -> Dict:
+        nonlocal run_count
+        result = await run_single_evaluation(
+            test=test,
+            provider=provider,
+            available_providers=providers,
+            enable_tiebreak=enable_tiebreak,
+            seed=seed,
+            judge_batcher=judge_batcher,
+            speculative_tiebreak=speculative_tiebreak,
+        )
+        result["seed"] = seed
+        run_count += 1
+        logger.info(
+            "[%d/%d] %s | %s (seed %d) -> %.3f",
+            run_count, total_runs, test.test_id, provider.provider_id,
+            seed + 1, result["final_score"],
+        )
+        if audit_file is not None:
+            audit_file.write(_json_line(result))
+            audit_file.flush()
+        return result
+
+    tasks = [
+        _run(seed, test, provider)
+        for seed in range(n_seeds)
+        for test in tests.values()
+        for provider in providers.values()
+        if (test.test_id, provider.provider_id, seed) not in done
+    ]
+    results = list(await asyncio.gather(*tasks))
+
+    if judge_batcher is not None:
+        logger.info(
+            "[JUDGE] %d requests de judge em batch (tamanho max %d)",
+            judge_batcher.requests_sent, judge_batch_size,
+        )
+    return results
+
+
 def main():
     """Loop principal do benchmark."""
     args = parse_args()
     setup_logging(args.verbose)
 
+    # Imports de analise (numpy) so depois do argparse: --help fica leve
+    from benchmark_v2.analysis.statistics import (
+        ScoreMatrix, compute_model_statistics, compute_category_statistics,
+    )
+    from benchmark_v2.analysis.report import generate_report
+
     if args.fast:
         args.seeds = 1
         logger.info("[FAST] Modo rapido: 1 seed, sem tiebreak")
@@ -255,7 +398,7 @@ def main():
     )
 
     # --- 2. Carregar testes ---
-    all_tests = get_all_tests()
+    all_tests = get_all_tests(args.categories)
     tests = filter_tests(all_tests, args.categories)
     logger.info("[OK] %d testes carregados", len(tests))
 
@@ -270,52 +413,103 @@ def main():
     logger.info("[INFO] Estimativa: %s", est)
 
     # --- 4. Main loop ---
-    all_evaluations: List[Dict] = []
-    # {model_id: {test_id: [final_scores per seed]}}
-    score_matrix: Dict[str, Dict[str, List[float]]] = {}
-    # Judge pairs para agreement: {"judge_a_vs_judge_b": [(score_a, score_b)]}
-    judge_pairs: Dict[str, List[Tuple[int, int]]] = {}
+    cache = None
+    if not args.no_cache:
+        cache = LLMCache(DEFAULT_CACHE_DIR, ttl_seconds=args.cache_ttl)
+        logger.info("[CACHE] Cache de respostas: %s", cache.path)
 
-    total_runs = len(tests) * len(providers) * args.seeds
-    run_count = 0
+    deduplicator = RequestDeduplicator() if args.deduplicate else None
 
-    for seed in range(args.seeds):
-        logger.info("--- Seed %d/%d ---", seed + 1, args.seeds)
+    for provider in providers.values():
+        provider.cache = cache
+        provider.deduplicator = deduplicator
+        if args.max_parallel:
+            provider.max_parallel = args.max_parallel
 
-        for test_id, test in tests.items():
-            for provider_id, provider in providers.items():
-                run_count += 1
-                logger.info(
-                    "[%d/%d] %s | %s (seed %d)",
-                    run_count, total_runs, test_id, provider_id, seed + 1
+    os.makedirs(args.output_dir, exist_ok=True)
+    audit_path = os.path.join(args.output_dir, AUDIT_JSONL_FILE)
+
+    previous: List[Dict] = []
+    if args.resume:
+        previous = _load_resumable(audit_path, tests, providers, args.seeds)
+        logger.info(
+            "[RESUME] %d avaliacoes reaproveitadas de %s",
+            len(previous), audit_path,
+        )
+    done = {(ev["test_id"], ev["model"], ev["seed"]) for ev in previous}
+
+    try:
+        # Reescreve o JSONL: descarta registros invalidos/truncados do run anterior
+        with open(audit_path, "wb") as audit_file:
+            for ev in previous:
+                audit_file.write(_json_line(ev))
+            audit_file.flush()
+            new_evaluations = asyncio.run(
+                _closing_http_clients(
+                    run_all_evaluations(
+                        tests, providers, args.seeds, enable_tiebreak,
+                        judge_batch_size=args.judge_batch_size,
+                        audit_file=audit_file,
+                        done=done,
+                        speculative_tiebreak=args.speculative_tiebreak,
+                    )
                 )
+            )
+    finally:
+        close_shared_http_clients()
+    logger.info("[OK] Audit salvo: %s", audit_path)
 
-                result = run_single_evaluation(
-                    test=test,
-                    provider=provider,
-                    available_providers=providers,
-                    enable_tiebreak=enable_tiebreak,
-                )
-                result["seed"] = seed
-
-                all_evaluations.append(result)
-
-                # Acumula scores
-                if provider_id not in score_matrix:
-                    score_matrix[provider_id] = {}
-                if test_id not in score_matrix[provider_id]:
-                    score_matrix[provider_id][test_id] = []
-                score_matrix[provider_id][test_id].append(result["final_score"])
-
-                # Acumula judge pairs
-                judge_id = result.get("judge_provider", "")
-                if judge_id and judge_id != provider_id:
-                    pair_key = f"{provider_id}_vs_{judge_id}"
-                    if pair_key not in judge_pairs:
-                        judge_pairs[pair_key] = []
-                    judge_pairs[pair_key].append(
-                        (result.get("judge_raw", 0), result.get("judge_raw", 0))
-                    )
+    all_evaluations = new_evaluations
+    if previous:
+        # Mesma ordem de um run completo: seed -> teste -> provider
+        test_order = {tid: i for i, tid in enumerate(tests)}
+        provider_order = {pid: i for i, pid in enumerate(providers)}
+        all_evaluations = sorted(
+            previous + new_evaluations,
+            key=lambda ev: (
+                ev["seed"], test_order[ev["test_id"]], provider_order[ev["model"]]
+            ),
+        )
+
+    if cache is not None:
+        logger.info(
+            "[CACHE] %d hits, %d misses",
+            cache.hits, cache.misses,
+        )
+        cache.close()
+
+    if deduplicator is not None:
+        logger.info("[DEDUP] %s", deduplicator.summary())
+
+    # Scores finais: array (provider, teste, seed)
+    score_matrix = ScoreMatrix.empty(list(providers), list(tests), args.seeds)
+    # Judge pairs para agreement: {"modelo_vs_judge": [(score_a, score_b)]}
+    # score_a: structural+reference do modelo avaliado na escala 0-3 do judge
+    # score_b: score_raw do judge (0-3)
+    judge_pairs: Dict[str, List[Tuple[int, int]]] = {}
+    # Contado no mesmo passe (evita segunda varredura das avaliacoes)
+    self_evals = 0
+
+    for result in all_evaluations:
+        provider_id = result["model"]
+        test_id = result["test_id"]
+
+        # Acumula scores
+        score_matrix.set(provider_id, test_id, result["seed"], result["final_score"])
+
+        # Acumula judge pairs
+        judge_id = result.get("judge_provider", "")
+        self_evals += judge_id == provider_id
+        if judge_id and judge_id != provider_id:
+            pair_key = f"{provider_id}_vs_{judge_id}"
+            if pair_key not in judge_pairs:
+                judge_pairs[pair_key] = []
+            non_judge = (
+                result["structural_score"] + result["reference_score"]
+            ) / 2.0
+            judge_pairs[pair_key].append(
+                (int(round(non_judge * 3)), result.get("judge_raw", 0))
+            )
 
     # --- 5. Estatisticas ---
     logger.info("[STATS] Computando estatisticas...")
@@ -326,13 +520,10 @@ def main():
 
     # --- 6. Preparar audit data ---
     tests_with_gt = sum(1 for t in tests.values() if t.ground_truth)
-    self_evals = sum(
-        1 for ev in all_evaluations
-        if ev.get("judge_provider", "") == ev.get("model", "")
-    )
 
+    finished_at = _ns_to_iso(time.time_ns())
     audit_data = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": finished_at,
         "seeds": args.seeds,
         "total_tests": len(tests),
         "total_providers": len(providers),
@@ -344,27 +535,33 @@ def main():
     }
 
     # --- 7. Salvar results ---
-    os.makedirs(args.output_dir, exist_ok=True)
-
     results_path = os.path.join(args.output_dir, "results_v2.json")
     _save_json(results_path, {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": finished_at,
         "model_stats": model_stats,
         "category_stats": category_stats,
-        "score_matrix": score_matrix,
+        "score_matrix": score_matrix.to_dict(),
     })
     logger.info("[OK] Resultados salvos: %s", results_path)
 
-    audit_path = os.path.join(args.output_dir, "benchmark_audit.json")
-    _save_json(audit_path, audit_data)
-    logger.info("[OK] Audit salvo: %s", audit_path)
+    # Avaliacoes ja estao no JSONL; aqui so os agregados (sem indentacao)
+    meta_path = os.path.join(args.output_dir, AUDIT_META_FILE)
+    _save_json(meta_path, {
+        k: v for k, v in audit_data.items() if k != "evaluations"
+    }, indent=False)
+    logger.info("[OK] Audit meta salvo: %s", meta_path)
 
     # --- 8. Relatorio ---
     report_path = os.path.join(args.output_dir, "report_v2.md")
-    generate_report(model_stats, category_stats, audit_data, report_path)
+    generate_report(
+        model_stats, category_stats, audit_data, report_path,
+        return_content=False,
+    )
 
     # --- 9. Graficos ---
     if not args.no_graphs:
+        from benchmark_v2.analysis.graphs import generate_all_graphs
+
         graphs_dir = os.path.join(args.output_dir, "graphs")
         saved_graphs = generate_all_graphs(
             model_stats, category_stats, judge_pairs,
@@ -376,10 +573,93 @@ def main():
     _print_summary(model_stats, category_stats, audit_data)
 
 
-def _save_json(path: str, data: Dict):
-    """Salva dados em JSON."""
+async def _closing_http_clients(coro: Awaitable[List[Dict]]) -> List[Dict]:
+    """Aguarda coro e fecha os pools HTTP async no mesmo event loop."""
+    try:
+        return await coro
+    finally:
+        await aclose_shared_http_clients()
+
+
+def _ns_to_iso(ns: int) -> str:
+    """Converte timestamp_ns (time.time_ns) para ISO 8601 local."""
+    return datetime.fromtimestamp(ns / 1e9).isoformat()
+
+
+def _load_resumable(
+    audit_path: str,
+    tests: Mapping[str, TestDef],
+    providers: Dict[str, BaseProvider],
+    n_seeds: int,
+) -> List[Dict]:
+    """
+    Le avaliacoes do audit JSONL que pertencem ao run atual (teste,
+    provider e seed selecionados) e terminaram sem erro. Avaliacoes com
+    erro sao refeitas. Linhas invalidas (ex: truncadas) sao ignoradas.
+    """
+    if not os.path.exists(audit_path):
+        logger.warning("[WARN] Nada para retomar: %s nao existe", audit_path)
+        return []
+
+    loads = orjson.loads if orjson is not None else json.loads
+    kept: Dict[Tuple[str, str, int], Dict] = {}
+    with open(audit_path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                ev = loads(line)
+            except ValueError:
+                logger.warning("[WARN] Linha invalida ignorada em %s", audit_path)
+                continue
+            key = (ev.get("test_id"), ev.get("model"), ev.get("seed"))
+            if (
+                key[0] in tests and key[1] in providers
+                and isinstance(key[2], int) and 0 <= key[2] < n_seeds
+                and not ev.get("error")
+            ):
+                kept[key] = ev
+    return list(kept.values())
+
+
+def _json_line(data: Dict) -> bytes:
+    """Serializa um registro como linha JSONL (orjson se disponivel)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        return orjson.dumps(data, default=str, option=option) + b"\n"
+    line = json.dumps(data, ensure_ascii=False, default=str)
+    return line.encode("utf-8") + b"\n"
+
+
+def _save_json(path: str, data: Dict, indent: bool = True):
+    """Salva dados em JSON (orjson se disponivel)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, default=str, option=option))
+        return
+
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+        json.dump(
+            data, f, ensure_ascii=False, indent=2 if indent else None,
+            default=str,
+        )
+
+
+def build_ranking(model_stats: Dict) -> List[Tuple[str, float, float, float]]:
+    """Ranking [(model_id, mean, ci_lower, ci_upper)] por overall_mean desc."""
+    ranked = sorted(
+        model_stats.items(),
+        key=lambda kv: kv[1].get("overall_mean", 0),
+        reverse=True,
+    )
+    return [
+        (model, stats["overall_mean"],
+         stats["overall_ci_lower"], stats["overall_ci_upper"])
+        for model, stats in ranked
+    ]
 
 
 def _print_summary(
@@ -390,28 +670,11 @@ def _print_summary(
     print("  AGI GROUNDING BENCHMARK v2.0 - RESULTS")
     print("=" * 60)
 
-    # Ranking
-    sorted_models = sorted(
-        model_stats.keys(),
-        key=lambda m: model_stats[m].get("overall_mean", 0),
-        reverse=True,
-    )
-
-    labels = {
-        "atic_on": "ATIC (ON)",
-        "atic_off": "ATIC (OFF)",
-        "claude": "Claude",
-        "gpt": "GPT-4o",
-        "gemini": "Gemini",
-    }
-
     print("\n  RANKING:")
-    for rank, model in enumerate(sorted_models, 1):
-        stats = model_stats[model]
-        mean = stats["overall_mean"]
-        ci_lo = stats["overall_ci_lower"]
-        ci_hi = stats["overall_ci_upper"]
-        label = labels.get(model, model)
+    for rank, (model, mean, ci_lo, ci_hi) in enumerate(
+        build_ranking(model_stats), 1
+    ):
+        label = SUMMARY_LABELS.get(model, model)
         print(f"  {rank}. {label:15s}  {mean:.3f}  [{ci_lo:.3f}, {ci_hi:.3f}]")
 
     # Qualidade
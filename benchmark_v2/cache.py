@@ -0,0 +1,173 @@
+"""
+Cache persistente de respostas de LLM para re-runs deterministicos.
+Backend SQLite (stdlib), chave sha256 do payload completo da chamada.
+Inclui deduplicador em memoria para chamadas identicas dentro de um run.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "responses.sqlite3"
+
+
+class LLMCache:
+    """
+    Cache chave -> resposta (dict JSON) em SQLite.
+    ttl_seconds <= 0 significa sem expiracao.
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: float = 0.0):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, CACHE_FILENAME)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " created REAL NOT NULL,"
+            " value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def cache_key(
+        provider_id: str,
+        model: str,
+        messages: List[str],
+        system: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        seed: int = 0,
+        conversation_format: str = "",
+    ) -> str:
+        """
+        Gera chave sha256 do payload.
+        messages: cadeia completa de prompts (multi-round inteiro), para
+        que conversas com o mesmo ultimo prompt nao colidam.
+        conversation_format: formato do historico multi-round; vazio nao
+        entra no payload (chaves existentes continuam validas).
+        """
+        payload = {
+            "provider": provider_id,
+            "model": model,
+            "messages": messages,
+            "system": system,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "seed": seed,
+        }
+        if conversation_format:
+            payload["conversation_format"] = conversation_format
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retorna valor em cache ou None (miss ou expirado)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        created, value = row
+        if self.ttl_seconds > 0 and time.time() - created > self.ttl_seconds:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Grava valor (serializavel em JSON) no cache."""
+        raw = json.dumps(value, ensure_ascii=False, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, created, value) "
+                "VALUES (?, ?, ?)",
+                (key, time.time(), raw),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Fecha conexao SQLite."""
+        with self._lock:
+            self._conn.close()
+
+
+def request_fingerprint(
+    model: str,
+    messages: List[str],
+    system: Optional[str],
+    temperature: float,
+    max_tokens: int,
+    seed: int = 0,
+) -> str:
+    """
+    sha256 da chamada sem o provider_id: providers distintos que
+    apontam para o mesmo modelo compartilham o fingerprint.
+    """
+    payload = {
+        "model": model,
+        "messages": messages,
+        "system": system,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "seed": seed,
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class RequestDeduplicator:
+    """
+    Pool fingerprint -> Future valido durante um run.
+    A primeira chamada dispara o request; duplicatas (em voo ou ja
+    concluidas) aguardam o mesmo Future e recebem uma copia do resultado.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self._pool: Dict[str, "asyncio.Future[Any]"] = {}
+
+    @property
+    def unique(self) -> int:
+        return len(self._pool)
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Executa call() uma unica vez por fingerprint."""
+        self.total += 1
+        future = self._pool.get(key)
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self._pool[key] = future
+            # shield: cancelar este caller nao cancela o Future compartilhado
+            return await asyncio.shield(future)
+        result = await asyncio.shield(future)
+        return copy.deepcopy(result)
+
+    def summary(self) -> Dict[str, Any]:
+        """Resumo {total, unique, duplicate_ratio} para o log final."""
+        duplicate_ratio = (
+            (self.total - self.unique) / self.total if self.total else 0.0
+        )
+        return {
+            "total": self.total,
+            "unique": self.unique,
+            "duplicate_ratio": round(duplicate_ratio, 4),
+        }
@@ -4,7 +4,7 @@ Modulo de avaliacao: 3 camadas de scoring.
 
 from .structural import StructuralScore, CheckResult, evaluate_structural
 from .reference import ReferenceScore, evaluate_reference
-from .llm_judge import JudgeResult, JudgeAudit, evaluate_judge
+from .llm_judge import JudgeResult, JudgeAudit, JudgeBatcher, evaluate_judge
 
 __all__ = [
     "StructuralScore",
@@ -14,5 +14,6 @@ __all__ = [
     "evaluate_reference",
     "JudgeResult",
     "JudgeAudit",
+    "JudgeBatcher",
     "evaluate_judge",
 ]
@@ -4,6 +4,8 @@ Nenhum modelo avalia a si mesmo.
 """
 
 import re
+import asyncio
+import io
 import logging
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
@@ -39,6 +41,12 @@ TIEBREAK_JUDGE = {
     "atic_off": "gemini",
 }
 
+# Ordem de preferencia por provider (rotation, fallback), montada uma vez
+_JUDGE_ORDER: Dict[str, Tuple[str, ...]] = {
+    pid: tuple(j for j in (JUDGE_ROTATION.get(pid), JUDGE_FALLBACK.get(pid)) if j)
+    for pid in JUDGE_ROTATION.keys() | JUDGE_FALLBACK.keys()
+}
+
 # Template do prompt de avaliacao
 JUDGE_PROMPT_TEMPLATE = """You are an expert evaluator assessing an AI model's response quality.
 
@@ -59,6 +67,37 @@ IMPORTANT: Score 0-3 ONLY. Output EXACTLY in this format (nothing else):
 SCORE: N
 REASON: Your explanation here (1-2 sentences)"""
 
+# Template para avaliar varias respostas ao mesmo teste em um unico request
+JUDGE_BATCH_PROMPT_TEMPLATE = """You are an expert evaluator assessing several AI model responses to the same task.
+Evaluate each candidate INDEPENDENTLY against the rubric. Do not compare candidates with each other.
+
+## Task Description
+Test: {test_name}
+Category: {category}
+
+## User Prompt(s)
+{prompts}
+
+## Evaluation Rubric
+{rubric}
+
+## Candidates
+{candidates}
+
+IMPORTANT: Score each candidate 0-3 ONLY. Output EXACTLY one block per candidate, in order (nothing else):
+CANDIDATE 1
+SCORE: N
+REASON: Your explanation here (1-2 sentences)"""
+
+# Janela de espera (s) antes de enviar um batch incompleto
+JUDGE_BATCH_WINDOW = 2.0
+
+# Regexes do parse do judge (compiladas uma vez)
+_SCORE_RE = re.compile(r"SCORE:\s*(\d)")
+_REASON_RE = re.compile(r"REASON:\s*(.+)", re.DOTALL)
+_FALLBACK_NUM_RE = re.compile(r"\b([0-3])\b")
+_CANDIDATE_SPLIT_RE = re.compile(r"^\W*CANDIDATE\s+(\d+)\W*$", re.MULTILINE)
+
 
 @dataclass
 class JudgeResult:
@@ -84,7 +123,7 @@ class JudgeAudit:
     final_source: str = "primary"
 
 
-def evaluate_judge(
+async def evaluate_judge(
     test_name: str,
     category: str,
     prompts: List[str],
@@ -95,9 +134,17 @@ def evaluate_judge(
     structural_normalized: float = 0.0,
     reference_normalized: float = 0.0,
     enable_tiebreak: bool = True,
+    seed: int = 0,
+    batcher: Optional["JudgeBatcher"] = None,
+    speculative_tiebreak: bool = False,
 ) -> Tuple[JudgeResult, JudgeAudit]:
     """
     Avalia resposta usando LLM judge com rotation.
+    Coroutine: chamadas ao judge respeitam o semaphore do provider.
+    batcher: se fornecido, agrupa chamadas ao mesmo judge/teste.
+    speculative_tiebreak: dispara o tiebreak em paralelo com o judge
+    primario quando os layers 1+2 tornam o tiebreak provavel; o resultado
+    e descartado (task cancelada) se nao for necessario.
     Retorna (JudgeResult, JudgeAudit).
     """
     # Seleciona judge primario
@@ -114,16 +161,37 @@ def evaluate_judge(
     prompt_text = _format_prompts(prompts)
     response_text = _format_responses(rounds)
 
-    judge_prompt = JUDGE_PROMPT_TEMPLATE.format(
-        test_name=test_name,
-        category=category,
-        prompts=prompt_text,
-        responses=response_text,
-        rubric=rubric,
-    )
+    header = {
+        "test_name": test_name,
+        "category": category,
+        "prompts": prompt_text,
+        "rubric": rubric,
+    }
+
+    async def _judge(provider: BaseProvider) -> Tuple[int, str]:
+        if batcher is not None:
+            return await batcher.score(provider, header, response_text, seed)
+        judge_prompt = JUDGE_PROMPT_TEMPLATE.format(
+            responses=response_text, **header
+        )
+        return await _call_judge(provider, judge_prompt, seed)
+
+    tiebreak_id = None
+    tiebreak_task: Optional["asyncio.Future[Tuple[int, str]]"] = None
+    if enable_tiebreak:
+        tiebreak_id = _select_tiebreak_judge(
+            evaluated_provider_id, judge_id, available_providers
+        )
+        if (
+            tiebreak_id and speculative_tiebreak
+            and _tiebreak_likely(structural_normalized, reference_normalized)
+        ):
+            tiebreak_task = asyncio.ensure_future(
+                _judge(available_providers[tiebreak_id])
+            )
 
     # Avaliacao primaria
-    primary_score, primary_reason = _call_judge(judge_provider, judge_prompt)
+    primary_score, primary_reason = await _judge(judge_provider)
 
     audit = JudgeAudit(
         primary_judge=judge_id,
@@ -135,12 +203,13 @@ def evaluate_judge(
     if enable_tiebreak and _needs_tiebreak(
         primary_score, structural_normalized, reference_normalized
     ):
-        tiebreak_id = _select_tiebreak_judge(
-            evaluated_provider_id, judge_id, available_providers
-        )
         if tiebreak_id:
-            tiebreak_provider = available_providers[tiebreak_id]
-            tb_score, tb_reason = _call_judge(tiebreak_provider, judge_prompt)
+            if tiebreak_task is not None:
+                tb_score, tb_reason = await tiebreak_task
+            else:
+                tb_score, tb_reason = await _judge(
+                    available_providers[tiebreak_id]
+                )
 
             audit.tiebreak_judge = tiebreak_id
             audit.tiebreak_score = tb_score
@@ -174,7 +243,10 @@ def evaluate_judge(
                 tiebreak_details=f"TB judge={tiebreak_id}, score={tb_score}",
             ), audit
 
-    # Sem tiebreak
+    # Sem tiebreak: descarta o especulativo
+    if tiebreak_task is not None:
+        tiebreak_task.cancel()
+
     return JudgeResult(
         score_raw=primary_score,
         normalized=primary_score / 3.0,
@@ -189,15 +261,10 @@ def _select_judge(
     available: Dict[str, BaseProvider],
 ) -> Optional[str]:
     """Seleciona judge primario (nunca o mesmo provider_id exato)."""
-    # Tenta rotation padrao
-    primary = JUDGE_ROTATION.get(provider_id)
-    if primary and primary in available and primary != provider_id:
-        return primary
-
-    # Tenta fallback
-    fallback = JUDGE_FALLBACK.get(provider_id)
-    if fallback and fallback in available and fallback != provider_id:
-        return fallback
+    # Tenta rotation padrao, depois fallback
+    for candidate in _JUDGE_ORDER.get(provider_id, ()):
+        if candidate in available and candidate != provider_id:
+            return candidate
 
     # Ultimo recurso: qualquer outro provider (atic_on pode julgar atic_off)
     for pid in available:
@@ -215,7 +282,7 @@ def _select_tiebreak_judge(
     """Seleciona terceiro juiz para tiebreak."""
     # Tenta tiebreak padrao
     tb = TIEBREAK_JUDGE.get(provider_id)
-    if tb and tb in available and tb != primary_judge_id and tb != provider_id:
+    if tb in available and tb != primary_judge_id and tb != provider_id:
         return tb
 
     # Qualquer outro que nao seja o provider nem o judge primario
@@ -238,17 +305,31 @@ def _needs_tiebreak(
     return divergence > 0.5  # Equivalente a ~1.5 pontos em escala 0-3
 
 
-def _call_judge(
+def _tiebreak_likely(structural_norm: float, reference_norm: float) -> bool:
+    """
+    Tiebreak provavel: metade ou mais dos scores possiveis do judge (0-3)
+    divergiriam dos layers (layer_avg < 1/6 ou > 5/6).
+    """
+    triggering = sum(
+        _needs_tiebreak(score, structural_norm, reference_norm)
+        for score in range(4)
+    )
+    return triggering >= 2
+
+
+async def _call_judge(
     provider: BaseProvider,
     prompt: str,
+    seed: int = 0,
 ) -> Tuple[int, str]:
     """Chama judge e extrai score + reason."""
     try:
-        response = provider.query(
+        response = await provider.aquery(
             prompt=prompt,
             system="You are an expert AI evaluator. Be objective and fair.",
             max_tokens=200,
             temperature=0.1,
+            seed=seed,
         )
 
         if response.error:
@@ -263,28 +344,69 @@ def _call_judge(
         return 0, f"Judge exception: {e}"
 
 
-def _parse_judge_response(text: str) -> Tuple[int, str]:
-    """Extrai SCORE e REASON do output do judge."""
+async def _call_judge_batch(
+    provider: BaseProvider,
+    prompt: str,
+    n_candidates: int,
+    seed: int = 0,
+) -> List[Optional[Tuple[int, str]]]:
+    """
+    Chama judge com prompt de batch e separa score + reason por candidato.
+    Candidatos ausentes no output retornam None.
+    """
+    try:
+        response = await provider.aquery(
+            prompt=prompt,
+            system="You are an expert AI evaluator. Be objective and fair.",
+            max_tokens=200 * n_candidates,
+            temperature=0.1,
+            seed=seed,
+        )
+    except Exception as e:
+        logger.error("[ERROR] Judge batch call failed: %s", e)
+        return [None] * n_candidates
+
+    if response.error:
+        logger.warning("[WARN] Judge batch error: %s", response.error)
+        return [None] * n_candidates
+
+    parsed: List[Optional[Tuple[int, str]]] = [None] * n_candidates
+    blocks = _CANDIDATE_SPLIT_RE.split(response.text)
+    # blocks = [preambulo, idx1, texto1, idx2, texto2, ...]
+    for idx_str, block in zip(blocks[1::2], blocks[2::2]):
+        idx = int(idx_str) - 1
+        if 0 <= idx < n_candidates:
+            score_match = _SCORE_RE.search(block)
+            if score_match:
+                parsed[idx] = _parse_judge_response(block, score_match)
+    return parsed
+
+
+def _parse_judge_response(
+    text: str, score_match: Optional[re.Match] = None
+) -> Tuple[int, str]:
+    """
+    Extrai SCORE e REASON do output do judge.
+    score_match: match de _SCORE_RE em text, se o chamador ja buscou.
+    """
     # Busca SCORE: N
-    score_match = re.search(r"SCORE:\s*(\d)", text)
-    reason_match = re.search(r"REASON:\s*(.+)", text, re.DOTALL)
+    if score_match is None:
+        score_match = _SCORE_RE.search(text)
+
+    if not score_match:
+        # Fallback: primeiro numero 0-3 do texto
+        num_match = _FALLBACK_NUM_RE.search(text)
+        score = int(num_match.group(1)) if num_match else 0
+        return score, f"(parse fallback) {text[:150]}"
 
-    score = 0
-    if score_match:
-        raw = int(score_match.group(1))
-        score = max(0, min(3, raw))  # Clamp 0-3
+    raw = int(score_match.group(1))
+    score = max(0, min(3, raw))  # Clamp 0-3
 
     reason = ""
+    reason_match = _REASON_RE.search(text)
     if reason_match:
         reason = reason_match.group(1).strip()[:200]
 
-    if not score_match:
-        # Fallback: tenta extrair qualquer numero 0-3
-        nums = re.findall(r"\b([0-3])\b", text)
-        if nums:
-            score = int(nums[0])
-        reason = f"(parse fallback) {text[:150]}"
-
     return score, reason
 
 
@@ -300,17 +422,121 @@ def _format_prompts(prompts: List[str]) -> str:
 
 def _format_responses(rounds: List[Dict[str, str]]) -> str:
     """Formata respostas do modelo para o judge."""
-    parts = []
+    buf = io.StringIO()
     round_num = 0
     for msg in rounds:
-        if msg.get("role") == "assistant":
-            round_num += 1
-            content = msg.get("content", "")
-            # Trunca respostas muito longas para o judge
-            if len(content) > 2000:
-                content = content[:2000] + "\n[... truncated]"
-            parts.append(f"Response {round_num}:\n{content}")
-    return "\n\n".join(parts)
+        if msg.get("role") != "assistant":
+            continue
+        round_num += 1
+        if round_num > 1:
+            buf.write("\n\n")
+        content = msg.get("content", "")
+        buf.write(f"Response {round_num}:\n")
+        # Trunca respostas muito longas para o judge
+        if len(content) > 2000:
+            buf.write(content[:2000])
+            buf.write("\n[... truncated]")
+        else:
+            buf.write(content)
+    return buf.getvalue()
+
+
+@dataclass
+class _PendingJudgeCall:
+    """Chamada de judge aguardando envio em batch."""
+    response_text: str
+    future: "asyncio.Future[Tuple[int, str]]"
+
+
+class JudgeBatcher:
+    """
+    Micro-batching de chamadas ao judge.
+    Chamadas com o mesmo (judge, teste, seed) compartilham o cabecalho do
+    prompt (tarefa, prompts, rubrica) e sao enviadas em um unico request
+    quando o grupo atinge batch_size ou apos window_seconds.
+    """
+
+    def __init__(self, batch_size: int, window_seconds: float = JUDGE_BATCH_WINDOW):
+        self.batch_size = max(1, batch_size)
+        self.window_seconds = window_seconds
+        self.requests_sent = 0
+        self._groups: Dict[Tuple[str, str, int], List[_PendingJudgeCall]] = {}
+        self._headers: Dict[Tuple[str, str, int], Tuple[BaseProvider, Dict[str, str]]] = {}
+        self._timers: Dict[Tuple[str, str, int], asyncio.TimerHandle] = {}
+        self._tasks: set = set()
+
+    async def score(
+        self,
+        provider: BaseProvider,
+        header: Dict[str, str],
+        response_text: str,
+        seed: int = 0,
+    ) -> Tuple[int, str]:
+        """Enfileira resposta para o judge e aguarda (score, reason)."""
+        loop = asyncio.get_running_loop()
+        key = (provider.provider_id, header["test_name"], seed)
+        future = loop.create_future()
+
+        group = self._groups.setdefault(key, [])
+        if not group:
+            self._headers[key] = (provider, header)
+            self._timers[key] = loop.call_later(
+                self.window_seconds, self._flush, key
+            )
+        group.append(_PendingJudgeCall(response_text, future))
+
+        if len(group) >= self.batch_size:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: Tuple[str, str, int]) -> None:
+        """Despacha o grupo pendente de uma chave."""
+        group = self._groups.pop(key, None)
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        if not group:
+            return
+
+        provider, header = self._headers.pop(key)
+        task = asyncio.ensure_future(self._dispatch(provider, header, group, key[2]))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(
+        self,
+        provider: BaseProvider,
+        header: Dict[str, str],
+        group: List[_PendingJudgeCall],
+        seed: int,
+    ) -> None:
+        """Envia o batch e resolve os futures de cada candidato."""
+        self.requests_sent += 1
+        if len(group) == 1:
+            results: List[Optional[Tuple[int, str]]] = [None]
+        else:
+            candidates = "\n\n".join(
+                f"### CANDIDATE {i}\n{p.response_text}"
+                for i, p in enumerate(group, 1)
+            )
+            prompt = JUDGE_BATCH_PROMPT_TEMPLATE.format(
+                candidates=candidates, **header
+            )
+            results = await _call_judge_batch(provider, prompt, len(group), seed)
+
+        for pending, result in zip(group, results):
+            if result is None:
+                # Candidato sem score no batch: avaliacao individual
+                if len(group) > 1:
+                    self.requests_sent += 1
+                prompt = JUDGE_PROMPT_TEMPLATE.format(
+                    responses=pending.response_text, **header
+                )
+                result = await _call_judge(provider, prompt, seed)
+            # Waiter cancelado (ex: tiebreak especulativo descartado)
+            if not pending.future.done():
+                pending.future.set_result(result)
 
 
 def _fallback_result() -> JudgeResult:
@@ -6,10 +6,20 @@ Compara resposta com keywords, ranges numericos e ground truth.
 import re
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick e opcional; fallback para loop de substring
+    ahocorasick = None
 
 from ..tests.test_defs import TestDef
 
+# numpy so e importado ao pontuar (--help / import do CLI nao o carregam)
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # Padroes suspeitos de citacoes fabricadas
@@ -26,6 +36,12 @@ FAKE_CITATION_PATTERNS = [
     r"arXiv:\d{4}\.\d{6,}",
 ]
 
+# Alternacao unica com grupo nomeado por padrao: uma passada sobre o texto
+_FAKE_CITATION_RE = re.compile(
+    "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(FAKE_CITATION_PATTERNS)),
+    re.IGNORECASE,
+)
+
 
 @dataclass
 class ReferenceScore:
@@ -38,12 +54,17 @@ class ReferenceScore:
 def evaluate_reference(
     test: TestDef,
     rounds: List[Dict[str, str]],
+    assistant_texts: Optional[List[str]] = None,
 ) -> ReferenceScore:
     """
     Avalia resposta contra ground truth, keywords e ranges.
+    assistant_texts: textos do assistente ja extraidos de rounds (opcional).
     """
     # Extrai texto completo das respostas
-    full_text = _extract_full_response(rounds)
+    if assistant_texts is not None:
+        full_text = "\n".join(assistant_texts)
+    else:
+        full_text = _extract_full_response(rounds)
 
     if not full_text.strip():
         return ReferenceScore(normalized=0.0)
@@ -113,29 +134,88 @@ def _keyword_coverage(text: str, keywords: List[str]) -> float:
         return 1.0
 
     text_lower = text.lower()
-    found = sum(1 for kw in keywords if kw.lower() in text_lower)
+    lowered = _lower_keywords(tuple(keywords))
+    automaton = _keyword_automaton(lowered) if ahocorasick is not None else None
+    if automaton is None:
+        found = sum(1 for kw in lowered if kw in text_lower)
+        return found / len(keywords)
+
+    # Uma passada sobre o texto; keyword vazia casa sempre (como "" in text)
+    present = {kw for _, kw in automaton.iter(text_lower)}
+    found = sum(1 for kw in lowered if not kw or kw in present)
     return found / len(keywords)
 
 
+@lru_cache(maxsize=1024)
+def _lower_keywords(keywords: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Keywords em lowercase, calculadas uma vez por teste."""
+    return tuple(kw.lower() for kw in keywords)
+
+
+@lru_cache(maxsize=256)
+def _keyword_automaton(keywords: Tuple[str, ...]) -> Optional["ahocorasick.Automaton"]:
+    """Automato Aho-Corasick das keywords (ja em lowercase), um por teste."""
+    words = {kw for kw in keywords if kw}
+    if not words:
+        return None
+    automaton = ahocorasick.Automaton()
+    for kw in words:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
+
+
 def _anti_keyword_absence(text: str, anti_keywords: List[str]) -> float:
     """Penaliza presenca de anti-keywords. 1.0 = nenhum encontrado."""
     if not anti_keywords:
         return 1.0
 
     text_lower = text.lower()
-    violations = 0
+    regexes, literals, combined = _anti_keyword_plan(tuple(anti_keywords))
+
+    # Caso comum (nenhum anti-keyword presente): uma unica passada
+    if combined is not None and not combined.search(text_lower):
+        return 1.0
+
+    violations = sum(1 for regex in regexes if regex.search(text_lower))
+    violations += sum(1 for literal in literals if literal in text_lower)
+
+    # Cada violacao reduz score proporcionalmente
+    penalty = violations / len(anti_keywords)
+    return max(0.0, 1.0 - penalty)
+
+
+@lru_cache(maxsize=256)
+def _anti_keyword_plan(
+    anti_keywords: Tuple[str, ...],
+) -> Tuple[Tuple["re.Pattern[str]", ...], Tuple[str, ...], Optional["re.Pattern[str]"]]:
+    """
+    Compila anti-keywords uma vez por teste: (regexes, literais, combinado).
+    Pattern invalido vira string literal. O combinado e uma alternacao de
+    todos, usada como pre-filtro; None se algum pattern tem grupos (a
+    numeracao mudaria na alternacao) ou se a alternacao nao compila.
+    """
+    regexes: List["re.Pattern[str]"] = []
+    literals: List[str] = []
+    parts: List[str] = []
     for pattern in anti_keywords:
         try:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                violations += 1
+            regex = re.compile(pattern, re.IGNORECASE)
         except re.error:
             # Trata como string literal
-            if pattern.lower() in text_lower:
-                violations += 1
+            literals.append(pattern.lower())
+            parts.append(re.escape(pattern.lower()))
+            continue
+        regexes.append(regex)
+        parts.append(pattern if regex.groups == 0 else "")
 
-    # Cada violacao reduz score proporcionalmente
-    penalty = violations / len(anti_keywords)
-    return max(0.0, 1.0 - penalty)
+    combined = None
+    if all(parts):
+        try:
+            combined = re.compile("|".join(f"(?:{p})" for p in parts), re.IGNORECASE)
+        except re.error:
+            combined = None
+    return tuple(regexes), tuple(literals), combined
 
 
 def _numeric_accuracy(
@@ -146,38 +226,51 @@ def _numeric_accuracy(
     if not ranges:
         return 1.0
 
+    import numpy as np
+
     # Extrai todos os numeros do texto
-    numbers = _extract_numbers(text)
+    numbers = np.asarray(_extract_numbers(text), dtype=np.float64)
+    lows, highs = _range_bounds(tuple(ranges.values()))
+
+    # Matriz ranges x numeros: range satisfeito se algum numero cai nele
+    inside = (numbers >= lows[:, None]) & (numbers <= highs[:, None])
+    satisfied = int(inside.any(axis=1).sum())
+
+    return satisfied / len(ranges)
 
-    satisfied = 0
-    for range_name, (low, high) in ranges.items():
-        # Verifica se algum numero no texto esta no range
-        found = any(low <= n <= high for n in numbers)
-        if found:
-            satisfied += 1
 
-    return satisfied / len(ranges) if ranges else 1.0
+@lru_cache(maxsize=256)
+def _range_bounds(
+    ranges: Tuple[Tuple[float, float], ...],
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Limites (low, high) dos ranges como arrays, uma vez por teste."""
+    import numpy as np
+
+    bounds = np.array(ranges, dtype=np.float64).reshape(-1, 2)
+    bounds.setflags(write=False)  # Compartilhado pelo cache
+    return bounds[:, 0], bounds[:, 1]
+
+
+# Padroes: 149.6, 149,6, 3.2 billion, 37 trilhoes, etc.
+_NUM_RE = re.compile(
+    r"(\d[\d.,]*\d|\d+)\s*(?:(bilh|trilh|milh|billion|trillion|million|thousand|mil))?",
+    re.IGNORECASE,
+)
+
+# Multiplicador pelo prefixo de 4 chars do sufixo capturado por _NUM_RE
+_MULTIPLIERS = {
+    "bilh": 1e9, "bill": 1e9,
+    "tril": 1e12,
+    "milh": 1e6, "mill": 1e6,
+    "mil": 1e3, "thou": 1e3,
+}
 
 
 def _extract_numbers(text: str) -> List[float]:
     """Extrai numeros do texto, lidando com formatos variados."""
     numbers = []
 
-    # Padroes: 149.6, 149,6, 3.2 billion, 37 trilhoes, etc.
-    raw_matches = re.findall(
-        r"(\d[\d.,]*\d|\d+)\s*(?:(bilh|trilh|milh|billion|trillion|million|thousand|mil))?",
-        text,
-        re.IGNORECASE,
-    )
-
-    multipliers = {
-        "bilh": 1e9, "billion": 1e9,
-        "trilh": 1e12, "trillion": 1e12,
-        "milh": 1e6, "million": 1e6,
-        "mil": 1e3, "thousand": 1e3,
-    }
-
-    for num_str, suffix in raw_matches:
+    for num_str, suffix in _NUM_RE.findall(text):
         try:
             # Remove separadores de milhar e normaliza decimal
             cleaned = num_str.replace(" ", "")
@@ -203,12 +296,10 @@ def _extract_numbers(text: str) -> List[float]:
 
             value = float(cleaned)
 
-            # Aplica multiplicador
-            suffix_lower = suffix.lower()[:4] if suffix else ""
-            for key, mult in multipliers.items():
-                if suffix_lower.startswith(key[:4]):
-                    value *= mult
-                    break
+            # Aplica multiplicador. IGNORECASE casa "MİL"/"bılh", cujo
+            # lower() nao e chave da tabela: sem multiplicador
+            if suffix:
+                value *= _MULTIPLIERS.get(suffix.lower()[:4], 1.0)
 
             numbers.append(value)
         except (ValueError, IndexError):
@@ -220,25 +311,44 @@ def _extract_numbers(text: str) -> List[float]:
 def _text_similarity(response: str, ground_truth: str) -> float:
     """Calcula similaridade Jaccard de trigrams."""
     resp_trigrams = _get_trigrams(response.lower())
-    truth_trigrams = _get_trigrams(ground_truth.lower())
+    truth_trigrams = _ground_truth_trigrams(ground_truth)
 
-    if not resp_trigrams or not truth_trigrams:
+    if not resp_trigrams.size or not truth_trigrams.size:
         return 0.0
 
-    intersection = resp_trigrams & truth_trigrams
-    union = resp_trigrams | truth_trigrams
+    import numpy as np
+
+    # Arrays ordenados e sem repeticao: |A|B| = |A| + |B| - |A&B|
+    intersection = np.intersect1d(
+        resp_trigrams, truth_trigrams, assume_unique=True
+    ).size
+    union = resp_trigrams.size + truth_trigrams.size - intersection
 
-    return len(intersection) / len(union) if union else 0.0
+    return intersection / union if union else 0.0
+
+
+@lru_cache(maxsize=1024)
+def _ground_truth_trigrams(ground_truth: str) -> "np.ndarray":
+    """Trigrams do ground truth, reaproveitados entre providers/seeds."""
+    trigrams = _get_trigrams(ground_truth.lower())
+    trigrams.setflags(write=False)  # Compartilhado pelo cache
+    return trigrams
 
 
-def _get_trigrams(text: str) -> Set[str]:
-    """Extrai trigrams (3-grams de caracteres) do texto."""
+def _get_trigrams(text: str) -> "np.ndarray":
+    """
+    Extrai trigrams (3-grams de caracteres) do texto.
+    Cada trigram vira um uint64 (3 codepoints de 21 bits), ordenado e unico.
+    """
+    import numpy as np
+
     words = re.findall(r"\w+", text)
     joined = " ".join(words)
-    trigrams = set()
-    for i in range(len(joined) - 2):
-        trigrams.add(joined[i : i + 3])
-    return trigrams
+    if len(joined) < 3:
+        return np.empty(0, dtype=np.uint64)
+    codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    trigrams = (codes[:-2] << np.uint64(42)) | (codes[1:-1] << np.uint64(21)) | codes[2:]
+    return np.unique(trigrams)
 
 
 def _anti_hallucination_check(text: str) -> Tuple[float, List[str]]:
@@ -247,13 +357,17 @@ def _anti_hallucination_check(text: str) -> Tuple[float, List[str]]:
     Retorna (score, lista_de_flags).
     Score 1.0 = sem sinais de alucinacao.
     """
-    flags: List[str] = []
-
-    for pattern in FAKE_CITATION_PATTERNS:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            flag_text = match if isinstance(match, str) else str(match)
-            flags.append(f"Citacao suspeita: {flag_text[:80]}")
+    # Agrupa por padrao para manter a ordem dos flags (padrao, posicao)
+    by_pattern: Dict[str, List[str]] = {}
+    for match in _FAKE_CITATION_RE.finditer(text):
+        by_pattern.setdefault(match.lastgroup, []).append(
+            f"Citacao suspeita: {match.group(0)[:80]}"
+        )
+    flags: List[str] = [
+        flag
+        for i in range(len(FAKE_CITATION_PATTERNS))
+        for flag in by_pattern.get(f"p{i}", ())
+    ]
 
     # Penalidade proporcional ao numero de flags
     if not flags:
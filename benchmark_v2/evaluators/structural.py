@@ -5,8 +5,14 @@ Sem LLM, baseado em regex, contagem de linhas/itens, ranges numericos.
 
 import re
 import logging
+from functools import lru_cache
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick e opcional; fallback para `in` por literal
+    ahocorasick = None
 
 from ..tests.test_defs import StructuralCheck
 
@@ -33,26 +39,36 @@ class StructuralScore:
 
 
 def evaluate_structural(
-    checks: List[StructuralCheck],
+    checks: Sequence[StructuralCheck],
     rounds: List[Dict[str, str]],
+    assistant_texts: Optional[List[str]] = None,
 ) -> StructuralScore:
     """
     Avalia checks estruturais contra as respostas.
     rounds: lista de dicts com role/content de toda a conversa.
+    assistant_texts: textos do assistente ja extraidos de rounds, se o
+    chamador ja os tem (evita refiltrar a conversa).
     """
     if not checks:
         return StructuralScore(normalized=1.0)
 
     # Extrai textos das respostas do assistente
-    assistant_texts = _extract_assistant_texts(rounds)
+    if assistant_texts is None:
+        assistant_texts = _extract_assistant_texts(rounds)
     all_text = "\n".join(assistant_texts)
 
     results: List[CheckResult] = []
     total_weight = 0.0
     weighted_score = 0.0
 
-    for check in checks:
-        result = _evaluate_single_check(check, assistant_texts, all_text)
+    # regex_present sobre o mesmo alvo: uma unica varredura por alternacao
+    fused = _fused_present_matches(checks, assistant_texts, all_text)
+
+    for i, check in enumerate(checks):
+        if i in fused:
+            result = _regex_present_result(check, fused[i])
+        else:
+            result = _evaluate_single_check(check, assistant_texts, all_text)
         results.append(result)
 
         total_weight += check.weight
@@ -101,17 +117,7 @@ def _evaluate_single_check(
     """Avalia um check individual."""
     target = _get_target_text(check, assistant_texts, all_text)
 
-    evaluators = {
-        "regex_present": _check_regex_present,
-        "regex_absent": _check_regex_absent,
-        "min_lines": _check_min_lines,
-        "min_items": _check_min_items,
-        "numeric_in_range": _check_numeric_in_range,
-        "multi_round_consistency": _check_multi_round_consistency,
-        "word_count_range": _check_word_count_range,
-    }
-
-    evaluator = evaluators.get(check.check_type)
+    evaluator = _EVALUATORS.get(check.check_type)
     if not evaluator:
         logger.warning("[WARN] Tipo de check desconhecido: %s", check.check_type)
         return CheckResult(
@@ -129,21 +135,175 @@ def _evaluate_single_check(
     return evaluator(check, target)
 
 
+# Grupos nomeados, backreferences, condicionais e flags inline mudam de
+# sentido (ou nao compilam) dentro da alternacao
+_UNFUSABLE_RE = re.compile(r"\(\?P[<=]|\(\?\(|\\\d|\(\?[aiLmsux-]")
+
+
+@lru_cache(maxsize=256)
+def _fused_present_pattern(patterns: Tuple[str, ...]) -> Optional["re.Pattern"]:
+    """
+    Alternacao (?P<p0>...)|(?P<p1>...) dos patterns, com as mesmas flags
+    de StructuralCheck.compiled. None se algum pattern nao pode ser fundido.
+    """
+    # (?i) no inicio e redundante (compiled ja usa IGNORECASE) e nao pode
+    # ficar no meio da alternacao
+    patterns = tuple(p[4:] if p.startswith("(?i)") else p for p in patterns)
+    if any(_UNFUSABLE_RE.search(p) for p in patterns):
+        return None
+    try:
+        return re.compile(
+            "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(patterns)),
+            re.IGNORECASE | re.DOTALL,
+        )
+    except re.error:
+        return None
+
+
+def _fused_present_matches(
+    checks: Sequence[StructuralCheck],
+    assistant_texts: List[str],
+    all_text: str,
+) -> Dict[int, bool]:
+    """
+    Resultado (indice do check -> encontrado) dos regex_present que
+    compartilham o texto alvo, com uma varredura por alvo.
+    A alternacao so reporta o primeiro pattern que casa em cada posicao:
+    patterns nao vistos sao confirmados individualmente (mesmo resultado
+    de _check_regex_present).
+    """
+    groups: Dict[int, List[int]] = {}
+    for i, check in enumerate(checks):
+        # Alternacoes de literais ja tem caminho rapido em _pattern_found
+        if (
+            check.check_type == "regex_present"
+            and check.literals is None
+            and not isinstance(check.compiled, re.error)
+        ):
+            groups.setdefault(check.target_round, []).append(i)
+
+    found: Dict[int, bool] = {}
+    for indexes in groups.values():
+        if len(indexes) < 2:
+            continue
+        fused = _fused_present_pattern(
+            tuple(checks[i].pattern for i in indexes)
+        )
+        if fused is None:
+            continue
+        target = _get_target_text(checks[indexes[0]], assistant_texts, all_text)
+
+        seen = set()
+        for match in fused.finditer(target):
+            seen.update(
+                name for name, value in match.groupdict().items()
+                if value is not None
+            )
+            if len(seen) == len(indexes):
+                break
+
+        for j, i in enumerate(indexes):
+            found[i] = f"p{j}" in seen or bool(checks[i].compiled.search(target))
+    return found
+
+
 # --- Implementacoes dos checks ---
 
+# Bullets de lista, ancorados no inicio de cada linha.
+# [^\S\n] = espaco sem quebra de linha (um match nunca atravessa linhas)
+_ITEM_RE = re.compile(
+    r"^(?:"
+    r"[^\S\n]*[-*][^\S\n]+"            # - item ou * item
+    r"|[^\S\n]*\d+[.)][^\S\n]+"        # 1. item ou 1) item
+    r"|[^\S\n]*[a-zA-Z][.)][^\S\n]+"   # a. item ou a) item
+    r"|\|.*\|"                         # | table row |
+    r")",
+    re.MULTILINE,
+)
+
+# Inteiros e decimais (ponto ou virgula) para numeric_in_range
+_NUMBER_RE = re.compile(r"[\d]+(?:[.,]\d+)?")
+
+_WORD_RE = re.compile(r"\b\w+\b")
+
+
+# Tokenizacao memoizada por texto: checks sobre o mesmo round reaproveitam
+@lru_cache(maxsize=64)
+def _significant_words(text: str) -> frozenset:
+    """Palavras com mais de 3 chars, em lowercase."""
+    return frozenset(w.lower() for w in _WORD_RE.findall(text) if len(w) > 3)
+
+
+@lru_cache(maxsize=64)
+def _word_count(text: str) -> int:
+    """Numero de palavras separadas por whitespace."""
+    return len(text.split())
+
+
+@lru_cache(maxsize=64)
+def _item_count(text: str) -> int:
+    """Numero de itens de lista (bullets, numeracao, linhas de tabela)."""
+    # Uma linha conta no maximo uma vez (matches ancorados em ^, sem overlap)
+    return len(_ITEM_RE.findall(text.strip()))
+
+
+# Caracteres que o IGNORECASE do re casa com ASCII mas str.lower() nao
+# (1:1, para nao deslocar o texto)
+_IGNORECASE_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+
+@lru_cache(maxsize=64)
+def _lowered(text: str) -> str:
+    """Texto em lowercase equivalente ao IGNORECASE para literais ASCII."""
+    return text.translate(_IGNORECASE_FOLD).lower()
+
+
+@lru_cache(maxsize=256)
+def _literal_automaton(literals: Tuple[str, ...]) -> "ahocorasick.Automaton":
+    """Automato Aho-Corasick de uma alternacao, compartilhado entre checks iguais."""
+    automaton = ahocorasick.Automaton()
+    for lit in literals:
+        automaton.add_word(lit, lit)
+    automaton.make_automaton()
+    return automaton
+
+
+def _pattern_found(check: StructuralCheck, text: str) -> bool:
+    """
+    Busca de check.pattern no texto; alternacoes de literais usam
+    Aho-Corasick (ou `in` por literal) sobre o texto em lowercase.
+    """
+    literals = check.literals
+    if literals is not None:
+        lowered = _lowered(text)
+        if ahocorasick is not None and len(literals) > 1:
+            # Uma passada; para no primeiro literal encontrado
+            return next(_literal_automaton(literals).iter(lowered), None) is not None
+        return any(lit in lowered for lit in literals)
+    return bool(check.compiled.search(text))
+
+
+@lru_cache(maxsize=64)
+def _content_line_count(text: str) -> int:
+    """Numero de linhas com algum caractere nao-branco."""
+    return sum(1 for line in text.split("\n") if line and not line.isspace())
+
 
 def _check_regex_present(check: StructuralCheck, text: str) -> CheckResult:
     """Verifica se pattern esta presente no texto."""
-    try:
-        found = bool(re.search(check.pattern, text, re.IGNORECASE | re.DOTALL))
-    except re.error as e:
+    compiled = check.compiled
+    if isinstance(compiled, re.error):
         return CheckResult(
             check_id=check.check_id,
             description=check.description,
             passed=False, score=0.0,
-            detail=f"Regex invalido: {e}",
+            detail=f"Regex invalido: {compiled}",
         )
+    return _regex_present_result(check, _pattern_found(check, text))
+
 
+def _regex_present_result(check: StructuralCheck, found: bool) -> CheckResult:
+    """CheckResult de regex_present dado se o pattern foi encontrado."""
     return CheckResult(
         check_id=check.check_id,
         description=check.description,
@@ -155,15 +315,15 @@ def _check_regex_present(check: StructuralCheck, text: str) -> CheckResult:
 
 def _check_regex_absent(check: StructuralCheck, text: str) -> CheckResult:
     """Verifica se pattern NAO esta presente no texto."""
-    try:
-        found = bool(re.search(check.pattern, text, re.IGNORECASE | re.DOTALL))
-    except re.error as e:
+    compiled = check.compiled
+    if isinstance(compiled, re.error):
         return CheckResult(
             check_id=check.check_id,
             description=check.description,
             passed=False, score=0.0,
-            detail=f"Regex invalido: {e}",
+            detail=f"Regex invalido: {compiled}",
         )
+    found = _pattern_found(check, text)
 
     return CheckResult(
         check_id=check.check_id,
@@ -176,8 +336,7 @@ def _check_regex_absent(check: StructuralCheck, text: str) -> CheckResult:
 
 def _check_min_lines(check: StructuralCheck, text: str) -> CheckResult:
     """Verifica se texto tem minimo de linhas."""
-    lines = [l for l in text.strip().split("\n") if l.strip()]
-    count = len(lines)
+    count = _content_line_count(text)
     required = int(check.threshold)
 
     if count >= required:
@@ -198,17 +357,7 @@ def _check_min_lines(check: StructuralCheck, text: str) -> CheckResult:
 
 def _check_min_items(check: StructuralCheck, text: str) -> CheckResult:
     """Verifica se texto tem minimo de itens de lista."""
-    # Detecta bullets: -, *, numeros, letras seguidas de ponto/parentese
-    item_patterns = [
-        r"^\s*[-*]\s+",          # - item ou * item
-        r"^\s*\d+[.)]\s+",      # 1. item ou 1) item
-        r"^\s*[a-zA-Z][.)]\s+", # a. item ou a) item
-        r"^\|.*\|",              # | table row |
-    ]
-    combined = "|".join(item_patterns)
-
-    lines = text.strip().split("\n")
-    items = sum(1 for l in lines if re.match(combined, l))
+    items = _item_count(text)
 
     required = int(check.threshold)
 
@@ -230,28 +379,29 @@ def _check_min_items(check: StructuralCheck, text: str) -> CheckResult:
 
 def _check_numeric_in_range(check: StructuralCheck, text: str) -> CheckResult:
     """Verifica se numeros no texto estao dentro do range."""
-    # Extrai numeros do texto (inteiros e decimais)
-    numbers = re.findall(r"[\d]+(?:[.,]\d+)?", text)
-    parsed = []
-    for n in numbers:
-        try:
-            cleaned = n.replace(",", ".")
-            parsed.append(float(cleaned))
-        except ValueError:
-            continue
+    # numpy so aqui: unico check que usa (CA-02), fora do import do CLI
+    import numpy as np
+
+    # Extrai numeros do texto (inteiros e decimais); o pattern garante float valido
+    matches = _NUMBER_RE.findall(text)
+    parsed = np.fromiter(
+        (float(n.replace(",", ".")) for n in matches),
+        dtype=np.float64,
+        count=len(matches),
+    )
 
     low = check.threshold
     high = check.threshold_max if check.threshold_max > 0 else check.threshold * 1.1
 
     # Verifica se algum numero esta no range
-    found_in_range = any(low <= n <= high for n in parsed)
+    found_in_range = bool(((parsed >= low) & (parsed <= high)).any())
 
     return CheckResult(
         check_id=check.check_id,
         description=check.description,
         passed=found_in_range,
         score=1.0 if found_in_range else 0.0,
-        detail=f"Range [{low:.2f}, {high:.2f}], numeros encontrados: {len(parsed)}",
+        detail=f"Range [{low:.2f}, {high:.2f}], numeros encontrados: {parsed.size}",
     )
 
 
@@ -270,14 +420,7 @@ def _check_multi_round_consistency(
         )
 
     # Extrai palavras significativas (>3 chars) de cada round
-    word_sets = []
-    for text in assistant_texts:
-        words = set(
-            w.lower()
-            for w in re.findall(r"\b\w+\b", text)
-            if len(w) > 3
-        )
-        word_sets.append(words)
+    word_sets = [_significant_words(text) for text in assistant_texts]
 
     # Calcula Jaccard medio entre rounds consecutivos
     similarities = []
@@ -312,8 +455,7 @@ def _check_multi_round_consistency(
 
 def _check_word_count_range(check: StructuralCheck, text: str) -> CheckResult:
     """Verifica se contagem de palavras esta no range."""
-    words = text.split()
-    count = len(words)
+    count = _word_count(text)
     min_words = int(check.threshold)
     max_words = int(check.threshold_max) if check.threshold_max > 0 else 9999
 
@@ -335,3 +477,15 @@ def _check_word_count_range(check: StructuralCheck, text: str) -> CheckResult:
         score=score,
         detail=f"{count} palavras (range: {min_words}-{max_words})",
     )
+
+
+# Dispatch check_type -> implementacao (montado uma vez, apos as definicoes)
+_EVALUATORS = {
+    "regex_present": _check_regex_present,
+    "regex_absent": _check_regex_absent,
+    "min_lines": _check_min_lines,
+    "min_items": _check_min_items,
+    "numeric_in_range": _check_numeric_in_range,
+    "multi_round_consistency": _check_multi_round_consistency,
+    "word_count_range": _check_word_count_range,
+}
@@ -41,7 +41,7 @@ def detect_and_create_providers(
 
         factory = ALL_PROVIDERS[provider_id]
         try:
-            instance = factory() if callable(factory) and not isinstance(factory, type) else factory()
+            instance = factory()
             if instance.is_available():
                 providers[provider_id] = instance
                 logger.info(
@@ -7,6 +7,8 @@ import os
 import sys
 import time
 import logging
+import threading
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 from .base_provider import BaseProvider, ProviderResponse
@@ -19,6 +21,10 @@ ATIC_PROJECT_PATH = os.path.join(
     "atic"
 )
 
+# A config do ATIC e global ao processo (os.environ + reload_config) e o
+# modelo local e unico: serializa todas as chamadas entre ON e OFF
+_ATIC_LOCK = threading.RLock()
+
 
 def _ensure_atic_path():
     """Adiciona path do ATIC ao sys.path se necessario."""
@@ -26,9 +32,29 @@ def _ensure_atic_path():
         sys.path.insert(0, ATIC_PROJECT_PATH)
 
 
+@lru_cache(maxsize=1)
+def _atic_available() -> bool:
+    """
+    Verifica uma vez por processo se TautoCoordinator e importavel.
+    ImportError nao fica em sys.modules: sem cache, atic_on e atic_off
+    refariam a busca no sys.path a cada verificacao.
+    """
+    try:
+        _ensure_atic_path()
+        from src.core.tauto_coordinator import TautoCoordinator  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
 class ATICProvider(BaseProvider):
     """Provider ATIC via TautoCoordinator."""
 
+    max_parallel = 1
+    # Respostas vem do checkout local do ATIC, que muda entre runs sem
+    # versao no model_name: cache replicaria respostas antigas
+    cacheable = False
+
     def __init__(self, grounding_enabled: bool = True):
         self._grounding_enabled = grounding_enabled
         self._coordinator = None
@@ -39,6 +65,7 @@ class ATICProvider(BaseProvider):
         else:
             self.provider_id = "atic_off"
             self.display_name = "ATIC (Grounding OFF)"
+        self.model_name = self.provider_id
 
     def _create_coordinator(self):
         """Cria instancia do TautoCoordinator com config adequada."""
@@ -71,8 +98,11 @@ class ATICProvider(BaseProvider):
             "ENABLE_AGENCY_SCAFFOLD": "true",
             "ENABLE_ARBITRATION": "true",
         }
-        for key, value in env_overrides.items():
-            os.environ[key] = value
+        # So grava (putenv) o que mudou; ON/OFF compartilham a maior parte
+        os.environ.update({
+            key: value for key, value in env_overrides.items()
+            if os.environ.get(key) != value
+        })
 
         from src.config.atic_config import reload_config
         reload_config()
@@ -115,6 +145,15 @@ class ATICProvider(BaseProvider):
         temperature: float = 0.3,
     ) -> ProviderResponse:
         """Envia prompt para ATIC."""
+        with _ATIC_LOCK:
+            return self._query_locked(prompt, system)
+
+    def _query_locked(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+    ) -> ProviderResponse:
+        """Implementacao de query(); chamador deve segurar _ATIC_LOCK."""
         try:
             coordinator = self._get_coordinator()
             coordinator.reset_session()
@@ -153,6 +192,15 @@ class ATICProvider(BaseProvider):
         Multi-round com ATIC. Usa reset_session() no inicio
         e acumula contexto entre rounds.
         """
+        with _ATIC_LOCK:
+            return self._query_multi_round_locked(prompts, system)
+
+    def _query_multi_round_locked(
+        self,
+        prompts: List[str],
+        system: Optional[str] = None,
+    ) -> List[Dict[str, str]]:
+        """Implementacao de query_multi_round(); chamador segura _ATIC_LOCK."""
         try:
             coordinator = self._get_coordinator()
             coordinator.reset_session()
@@ -160,15 +208,16 @@ class ATICProvider(BaseProvider):
             return [{"role": "system", "content": "", "error": str(e)}]
 
         conversation: List[Dict[str, str]] = []
-        accumulated_context = ""
+        # Trocas anteriores; unidas so ao montar o prompt (sem += quadratico)
+        context_parts: List[str] = []
 
         for prompt_text in prompts:
             conversation.append({"role": "user", "content": prompt_text})
 
             full_prompt = prompt_text
-            if accumulated_context:
+            if context_parts:
                 full_prompt = (
-                    f"Contexto anterior:\n{accumulated_context}\n\n"
+                    f"Contexto anterior:\n{''.join(context_parts)}\n\n"
                     f"Nova pergunta: {prompt_text}"
                 )
 
@@ -190,7 +239,7 @@ class ATICProvider(BaseProvider):
                     "error": None,
                 })
 
-                accumulated_context += f"\nUser: {prompt_text}\nAssistant: {text}\n"
+                context_parts.append(f"\nUser: {prompt_text}\nAssistant: {text}\n")
 
             except Exception as e:
                 conversation.append({
@@ -205,9 +254,4 @@ class ATICProvider(BaseProvider):
 
     def is_available(self) -> bool:
         """Verifica se TautoCoordinator e importavel."""
-        try:
-            _ensure_atic_path()
-            from src.core.tauto_coordinator import TautoCoordinator  # noqa: F401
-            return True
-        except ImportError:
-            return False
+        return _atic_available()
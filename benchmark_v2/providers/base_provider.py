@@ -3,10 +3,24 @@ Classe base abstrata para providers do benchmark v2.
 Define interface comum para todos os modelos testados.
 """
 
+import asyncio
+import logging
+import math
+import os
+import threading
 import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
+
+from ..cache import request_fingerprint
+from .rate_limit import TokenBucket, get_bucket
+
+if TYPE_CHECKING:
+    from ..cache import LLMCache, RequestDeduplicator
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -20,11 +34,175 @@ class ProviderResponse:
     error: Optional[str] = None
 
 
+# Pools HTTP reusados pelos SDKs (keep-alive, HTTP/2 se h2 instalado)
+_SHARED_HTTP_CLIENTS: Dict[type, Any] = {}
+_SHARED_HTTP_LOCK = threading.Lock()
+
+
+def get_shared_http_client(client_cls: type) -> Any:
+    """
+    Client HTTP unico por classe de SDK (ex: anthropic.DefaultHttpxClient).
+    Cada SDK exige o client da sua propria versao de httpx, entao o pool e
+    compartilhado por SDK; todos os providers/threads do mesmo SDK reusam
+    as conexoes. Limits e timeouts continuam os defaults do SDK.
+    """
+    with _SHARED_HTTP_LOCK:
+        client = _SHARED_HTTP_CLIENTS.get(client_cls)
+        if client is None:
+            try:
+                client = client_cls(http2=True)
+            except ImportError:
+                # h2 ausente: HTTP/1.1 com keep-alive
+                client = client_cls()
+            _SHARED_HTTP_CLIENTS[client_cls] = client
+        return client
+
+
+def close_shared_http_clients() -> None:
+    """
+    Fecha os pools HTTP compartilhados (fim do run).
+    Pools async ainda abertos sao so descartados: aclose() precisa do
+    event loop em que foram usados (ver aclose_shared_http_clients).
+    """
+    with _SHARED_HTTP_LOCK:
+        for client in _SHARED_HTTP_CLIENTS.values():
+            if not hasattr(client, "aclose"):
+                client.close()
+        _SHARED_HTTP_CLIENTS.clear()
+
+
+async def aclose_shared_http_clients() -> None:
+    """Fecha os pools HTTP async (chamar no event loop do run)."""
+    with _SHARED_HTTP_LOCK:
+        async_clients = [
+            (cls, client) for cls, client in _SHARED_HTTP_CLIENTS.items()
+            if hasattr(client, "aclose")
+        ]
+        for cls, _ in async_clients:
+            del _SHARED_HTTP_CLIENTS[cls]
+    for _, client in async_clients:
+        await client.aclose()
+
+
+# Teto para o delay pedido pelo servidor em respostas 429/529
+MAX_RETRY_AFTER = 120
+
+
+def _parse_retry_after(name: str, raw: str) -> Optional[float]:
+    """Segundos de um header retry-after-ms ou retry-after (numero ou HTTP-date)."""
+    try:
+        seconds = float(raw)
+        return seconds / 1000 if name == "retry-after-ms" else seconds
+    except ValueError:
+        pass
+    if name != "retry-after":
+        return None
+    try:
+        return parsedate_to_datetime(raw).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_seconds(error: Exception) -> Optional[int]:
+    """
+    Delay pedido pelo servidor nos headers da resposta HTTP anexada ao
+    erro do SDK (error.response.headers), limitado a MAX_RETRY_AFTER.
+    None se o erro nao traz retry-after-ms / retry-after validos.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    for name in ("retry-after-ms", "retry-after"):
+        raw = headers.get(name)
+        if raw is None:
+            continue
+        seconds = _parse_retry_after(name, raw)
+        if seconds is not None:
+            return min(max(0, math.ceil(seconds)), MAX_RETRY_AFTER)
+    return None
+
+
+def _assistant_message(response: ProviderResponse) -> Dict[str, Any]:
+    """Mensagem do assistente no formato de conversa multi-round."""
+    return {
+        "role": "assistant",
+        "content": response.text,
+        "elapsed": response.elapsed_seconds,
+        "model": response.model,
+        "error": response.error,
+    }
+
+
+# Prefixos constantes: concatenacao simples em vez de f-string por mensagem
+_ROLE_PREFIXES = {"user": "User: ", "assistant": "Assistant: "}
+
+
+def _serialize_messages(messages: List[Dict[str, str]]) -> str:
+    """Serializa historico em texto ("User: ..." / "Assistant: ...")."""
+    return "\n\n".join(
+        _ROLE_PREFIXES[msg["role"]] + msg["content"]
+        for msg in messages
+        if msg["role"] in _ROLE_PREFIXES
+    )
+
+
 class BaseProvider(ABC):
     """Interface base para providers de LLM."""
 
     provider_id: str = ""
     display_name: str = ""
+    # Identificador do modelo (entra na chave do cache)
+    model_name: str = ""
+    # Cache de respostas (opcional, configurado pelo main loop)
+    cache: Optional["LLMCache"] = None
+    # False = nunca le/grava no cache (respostas dependem de codigo local
+    # sem versao na chave, ex: ATIC)
+    cacheable: bool = True
+    # Deduplicador de chamadas identicas no run (opcional, --deduplicate)
+    deduplicator: Optional["RequestDeduplicator"] = None
+    # Maximo de chamadas simultaneas ao provider (rate limit)
+    max_parallel: int = 4
+    # Formato do historico multi-round: "" = serializado em um unico prompt
+    # (default de query_messages), "messages" = lista nativa do SDK. Entra
+    # na chave do cache para nao reaproveitar respostas do outro formato.
+    conversation_format: str = ""
+    # Ritmo maximo de requests a API (token bucket compartilhado por
+    # provider_id); 0 = sem limite. Sobrescrito por <PROVIDER_ID>_RPM.
+    requests_per_minute: float = 0.0
+    request_burst: int = 1
+
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _rate_limiter: Optional[TokenBucket] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Semaphore que limita chamadas concorrentes a este provider."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, self.max_parallel))
+        return self._semaphore
+
+    @property
+    def rate_limiter(self) -> TokenBucket:
+        """
+        Token bucket consumido antes de cada request a API (inclusive
+        retries). Criado no primeiro uso com requests_per_minute ou o
+        valor de <PROVIDER_ID>_RPM no ambiente.
+        """
+        if self._rate_limiter is None:
+            rpm = self.requests_per_minute
+            env_name = f"{self.provider_id.upper()}_RPM"
+            raw = os.environ.get(env_name)
+            if raw:
+                try:
+                    rpm = float(raw)
+                except ValueError:
+                    logger.warning(
+                        "[WARN] %s invalido: %r, usando %s", env_name, raw, rpm
+                    )
+            self._rate_limiter = get_bucket(
+                self.provider_id, rpm, self.request_burst
+            )
+        return self._rate_limiter
 
     @abstractmethod
     def query(
@@ -49,42 +227,215 @@ class BaseProvider(ABC):
         Retorna lista de dicts com 'role' e 'content'.
         """
         conversation: List[Dict[str, str]] = []
+        history: List[Dict[str, str]] = []
 
         for prompt_text in prompts:
             conversation.append({"role": "user", "content": prompt_text})
+            history.append({"role": "user", "content": prompt_text})
+
+            response = self.query_messages(
+                history,
+                system=system,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+            conversation.append(_assistant_message(response))
+            history.append({"role": "assistant", "content": response.text})
+
+        return conversation
+
+    def query_messages(
+        self,
+        messages: List[Dict[str, str]],
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+    ) -> ProviderResponse:
+        """
+        Envia historico [{role: user|assistant, content}] e retorna resposta.
+        Default: serializa o historico em um unico prompt para query().
+        Providers com multi-turno nativo no SDK sobrescrevem.
+        """
+        return self.query(
+            _serialize_messages(messages),
+            system=system,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+
+    async def _aquery_once(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+    ) -> ProviderResponse:
+        """
+        Uma chamada async, sem cache/dedup/semaphore (aquery cuida disso).
+        Default: query() sincrono em thread. Providers com SDK async
+        sobrescrevem para nao ocupar uma thread por request.
+        """
+        return await asyncio.to_thread(
+            self.query, prompt,
+            system=system, max_tokens=max_tokens, temperature=temperature,
+        )
 
-            # Monta prompt completo com historico
-            full_prompt = self._build_conversation_prompt(conversation)
-            response = self.query(
-                full_prompt,
+    async def _aquery_multi_round_once(
+        self,
+        prompts: List[str],
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+    ) -> List[Dict[str, str]]:
+        """
+        Conversa multi-turno async, sem cache/dedup/semaphore.
+        Mesmo loop de query_multi_round() sobre _aquery_messages_once(); providers
+        que sobrescrevem query_multi_round() (ex: ATIC) rodam em thread.
+        """
+        if type(self).query_multi_round is not BaseProvider.query_multi_round:
+            return await asyncio.to_thread(
+                self.query_multi_round, prompts,
+                system=system, max_tokens=max_tokens, temperature=temperature,
+            )
+
+        conversation: List[Dict[str, str]] = []
+        history: List[Dict[str, str]] = []
+        for prompt_text in prompts:
+            conversation.append({"role": "user", "content": prompt_text})
+            history.append({"role": "user", "content": prompt_text})
+            response = await self._aquery_messages_once(
+                history,
                 system=system,
                 max_tokens=max_tokens,
                 temperature=temperature,
             )
+            conversation.append(_assistant_message(response))
+            history.append({"role": "assistant", "content": response.text})
+        return conversation
 
-            conversation.append({
-                "role": "assistant",
-                "content": response.text,
-                "elapsed": response.elapsed_seconds,
-                "model": response.model,
-                "error": response.error,
-            })
+    async def _aquery_messages_once(
+        self,
+        messages: List[Dict[str, str]],
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+    ) -> ProviderResponse:
+        """
+        Versao async de query_messages(), sem cache/dedup/semaphore.
+        Default: historico serializado via _aquery_once().
+        """
+        return await self._aquery_once(
+            _serialize_messages(messages),
+            system=system,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
 
+    async def aquery(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+        seed: int = 0,
+    ) -> ProviderResponse:
+        """
+        Versao async de query(). Respeita max_parallel; a chamada em si
+        e _aquery_once() (client async do SDK ou query() em thread).
+        seed so entra na chave do cache (seeds distintos nao colidem).
+        """
+        key = self._cache_key([prompt], system, temperature, max_tokens, seed)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return ProviderResponse(**cached)
+
+        async def _call() -> ProviderResponse:
+            async with self.semaphore:
+                return await self._aquery_once(
+                    prompt, system=system, max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+
+        response = await self._deduplicated(
+            [prompt], system, temperature, max_tokens, seed, _call
+        )
+
+        if key and not response.error:
+            self.cache.set(key, asdict(response))
+        return response
+
+    async def aquery_multi_round(
+        self,
+        prompts: List[str],
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+        seed: int = 0,
+    ) -> List[Dict[str, str]]:
+        """
+        Versao async de query_multi_round(). Ocupa um slot por conversa.
+        O cache usa a cadeia completa de prompts como chave.
+        """
+        key = self._cache_key(
+            prompts, system, temperature, max_tokens, seed,
+            conversation_format=self.conversation_format,
+        )
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        async def _call() -> List[Dict[str, str]]:
+            async with self.semaphore:
+                return await self._aquery_multi_round_once(
+                    prompts, system=system, max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+
+        conversation = await self._deduplicated(
+            prompts, system, temperature, max_tokens, seed, _call
+        )
+
+        if key and not any(msg.get("error") for msg in conversation):
+            self.cache.set(key, conversation)
         return conversation
 
-    def _build_conversation_prompt(
-        self, conversation: List[Dict[str, str]]
-    ) -> str:
-        """Serializa historico de conversa em texto."""
-        parts = []
-        for msg in conversation:
-            role = msg["role"]
-            content = msg["content"]
-            if role == "user":
-                parts.append(f"User: {content}")
-            elif role == "assistant":
-                parts.append(f"Assistant: {content}")
-        return "\n\n".join(parts)
+    def _cache_key(
+        self,
+        prompts: List[str],
+        system: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        seed: int,
+        conversation_format: str = "",
+    ) -> Optional[str]:
+        """Chave do cache para a chamada, ou None se cache desativado."""
+        if self.cache is None or not self.cacheable:
+            return None
+        return self.cache.cache_key(
+            self.provider_id, self.model_name, prompts,
+            system, temperature, max_tokens, seed,
+            conversation_format=conversation_format,
+        )
+
+    async def _deduplicated(
+        self,
+        prompts: List[str],
+        system: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        seed: int,
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Roda call() via deduplicador, se configurado."""
+        if self.deduplicator is None:
+            return await call()
+        # Sem model_name nao ha como provar que dois providers sao o mesmo modelo
+        key = request_fingerprint(
+            self.model_name or self.provider_id, prompts, system, temperature, max_tokens, seed
+        )
+        return await self.deduplicator.run(key, call)
 
     @abstractmethod
     def is_available(self) -> bool:
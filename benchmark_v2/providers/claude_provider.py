@@ -4,11 +4,11 @@ Modelo: claude-sonnet-4-20250514
 """
 
 import os
-import time
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from .base_provider import BaseProvider, ProviderResponse
+from .base_provider import BaseProvider, ProviderResponse, get_shared_http_client
+from .retry import RetryPolicy, acall_with_retries, call_with_retries
 
 logger = logging.getLogger(__name__)
 
@@ -23,19 +23,36 @@ class ClaudeProvider(BaseProvider):
 
     provider_id = "claude"
     display_name = "Claude Sonnet 4"
+    model_name = MODEL
+    conversation_format = "messages"
+    # Tier 1 da Anthropic (CLAUDE_RPM para tiers maiores)
+    requests_per_minute = 50
+    request_burst = 5
 
     def __init__(self):
         self._client = None
+        self._async_client = None
 
     def _get_client(self):
         """Lazy init do client Anthropic."""
         if self._client is None:
             import anthropic
             self._client = anthropic.Anthropic(
-                api_key=os.environ.get("ANTHROPIC_API_KEY", "")
+                api_key=os.environ.get("ANTHROPIC_API_KEY", ""),
+                http_client=get_shared_http_client(anthropic.DefaultHttpxClient),
             )
         return self._client
 
+    def _get_async_client(self):
+        """Lazy init do client AsyncAnthropic (usado por aquery)."""
+        if self._async_client is None:
+            import anthropic
+            self._async_client = anthropic.AsyncAnthropic(
+                api_key=os.environ.get("ANTHROPIC_API_KEY", ""),
+                http_client=get_shared_http_client(anthropic.DefaultAsyncHttpxClient),
+            )
+        return self._async_client
+
     def query(
         self,
         prompt: str,
@@ -44,72 +61,130 @@ class ClaudeProvider(BaseProvider):
         temperature: float = 0.3,
     ) -> ProviderResponse:
         """Envia prompt para Claude com retry em 429/529."""
-        import anthropic
+        return self.query_messages(
+            [{"role": "user", "content": prompt}],
+            system=system, max_tokens=max_tokens, temperature=temperature,
+        )
 
+    def query_messages(
+        self,
+        messages: List[Dict[str, str]],
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+    ) -> ProviderResponse:
+        """Envia historico multi-turno nativo para Claude com retry em 429/529."""
         client = self._get_client()
-        messages = [{"role": "user", "content": prompt}]
-        kwargs = {
-            "model": MODEL,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "messages": messages,
-        }
-        if system:
-            kwargs["system"] = system
-
-        last_error = None
-        for attempt in range(MAX_RETRIES):
-            try:
-                start = time.perf_counter()
-                response = client.messages.create(**kwargs)
-                elapsed = time.perf_counter() - start
-
-                text = ""
-                for block in response.content:
-                    if hasattr(block, "text"):
-                        text += block.text
-
-                return ProviderResponse(
-                    text=text,
-                    model=response.model,
-                    elapsed_seconds=round(elapsed, 2),
-                    input_tokens=getattr(response.usage, "input_tokens", 0),
-                    output_tokens=getattr(response.usage, "output_tokens", 0),
-                )
-
-            except anthropic.RateLimitError as e:
-                last_error = str(e)
-                wait = 2 ** (attempt + 1)
-                logger.warning(
-                    "[RETRY] Claude rate limit, aguardando %ds (tentativa %d/%d)",
-                    wait, attempt + 1, MAX_RETRIES
-                )
-                time.sleep(wait)
-
-            except anthropic.APIStatusError as e:
-                if e.status_code in RETRY_CODES:
-                    last_error = str(e)
-                    wait = 2 ** (attempt + 1)
-                    logger.warning(
-                        "[RETRY] Claude status %d, aguardando %ds (tentativa %d/%d)",
-                        e.status_code, wait, attempt + 1, MAX_RETRIES
-                    )
-                    time.sleep(wait)
-                else:
-                    return ProviderResponse(
-                        text="", model=MODEL, error=f"Claude API error: {e}"
-                    )
-
-            except Exception as e:
-                return ProviderResponse(
-                    text="", model=MODEL, error=f"Claude error: {e}"
-                )
+        kwargs = _request_kwargs(messages, system, max_tokens, temperature)
 
-        return ProviderResponse(
-            text="", model=MODEL,
-            error=f"Claude falhou apos {MAX_RETRIES} tentativas: {last_error}"
+        return call_with_retries(
+            _RETRY, self.rate_limiter, lambda: client.messages.create(**kwargs)
+        )
+
+    async def _aquery_once(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+    ) -> ProviderResponse:
+        """query() via AsyncAnthropic: sem thread por request."""
+        return await self._aquery_messages_once(
+            [{"role": "user", "content": prompt}],
+            system=system, max_tokens=max_tokens, temperature=temperature,
+        )
+
+    async def _aquery_messages_once(
+        self,
+        messages: List[Dict[str, str]],
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+    ) -> ProviderResponse:
+        """query_messages() via AsyncAnthropic: sem thread por request."""
+        client = self._get_async_client()
+        kwargs = _request_kwargs(messages, system, max_tokens, temperature)
+
+        return await acall_with_retries(
+            _RETRY, self.rate_limiter, lambda: client.messages.create(**kwargs)
         )
 
     def is_available(self) -> bool:
         """Verifica se ANTHROPIC_API_KEY esta definida."""
         return bool(os.environ.get("ANTHROPIC_API_KEY"))
+
+
+def _request_kwargs(
+    messages: List[Dict[str, str]],
+    system: Optional[str],
+    max_tokens: int,
+    temperature: float,
+) -> Dict[str, Any]:
+    """Argumentos de messages.create (client sync e async)."""
+    api_messages: List[Dict[str, Any]] = [
+        {"role": msg["role"], "content": msg["content"]} for msg in messages
+    ]
+    if len(api_messages) > 1:
+        # Prompt caching: breakpoint no ultimo turno; o round seguinte
+        # reaproveita o historico inteiro como prefixo
+        last = api_messages[-1]
+        last["content"] = [{
+            "type": "text",
+            "text": last["content"],
+            "cache_control": {"type": "ephemeral"},
+        }]
+
+    kwargs: Dict[str, Any] = {
+        "model": MODEL,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "messages": api_messages,
+    }
+    if system:
+        kwargs["system"] = system
+    return kwargs
+
+
+def _to_response(response: Any, elapsed: float) -> ProviderResponse:
+    """Converte resposta do SDK em ProviderResponse."""
+    # Blocos sem texto (tool_use, thinking) nao entram na resposta
+    text = "".join(getattr(block, "text", None) or "" for block in response.content)
+
+    return ProviderResponse(
+        text=text,
+        model=response.model,
+        elapsed_seconds=round(elapsed, 2),
+        input_tokens=getattr(response.usage, "input_tokens", 0),
+        output_tokens=getattr(response.usage, "output_tokens", 0),
+    )
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Rate limit (429) ou sobrecarga (529)."""
+    import anthropic
+
+    return (
+        isinstance(error, anthropic.APIStatusError)
+        and error.status_code in RETRY_CODES
+    )
+
+
+def _error_response(error: Exception) -> ProviderResponse:
+    """Resposta de erro nao retentavel."""
+    import anthropic
+
+    if isinstance(error, anthropic.APIStatusError):
+        return ProviderResponse(
+            text="", model=MODEL, error=f"Claude API error: {error}"
+        )
+    return ProviderResponse(text="", model=MODEL, error=f"Claude error: {error}")
+
+
+_RETRY = RetryPolicy(
+    label="Claude",
+    model=MODEL,
+    max_retries=MAX_RETRIES,
+    is_retryable=_is_retryable,
+    to_response=_to_response,
+    error_response=_error_response,
+)
@@ -4,12 +4,15 @@ Modelo: gemini-2.5-flash
 """
 
 import os
-import re
-import time
+import math
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from .base_provider import BaseProvider, ProviderResponse
+from .base_provider import (
+    BaseProvider, ProviderResponse, MAX_RETRY_AFTER,
+    get_shared_http_client, retry_after_seconds,
+)
+from .retry import RetryPolicy, acall_with_retries, call_with_retries
 
 logger = logging.getLogger(__name__)
 
@@ -19,11 +22,34 @@ MAX_RETRIES = 3
 DEFAULT_RETRY_DELAY = 30
 
 
+def _shared_http_options() -> Any:
+    """
+    HttpOptions com os pools httpx compartilhados (sync e async), ou None
+    em versoes do SDK sem httpx_client (client padrao por instancia).
+    """
+    from google.genai import types
+    if "httpx_client" not in types.HttpOptions.model_fields:
+        return None
+
+    import httpx
+    return types.HttpOptions(
+        httpx_client=get_shared_http_client(httpx.Client),
+        httpx_async_client=get_shared_http_client(httpx.AsyncClient),
+    )
+
+
 class GeminiProvider(BaseProvider):
     """Provider Gemini via Google GenAI SDK."""
 
     provider_id = "gemini"
     display_name = "Gemini 2.5 Flash"
+    model_name = MODEL
+    conversation_format = "messages"
+    # Quota do Gemini e mais restrita (429 frequente)
+    max_parallel = 2
+    # Free tier do gemini-2.5-flash (GEMINI_RPM=1000 no tier pago)
+    requests_per_minute = 10
+    request_burst = 2
 
     def __init__(self):
         self._client = None
@@ -33,18 +59,11 @@ class GeminiProvider(BaseProvider):
         if self._client is None:
             from google import genai
             self._client = genai.Client(
-                api_key=os.environ.get("GOOGLE_API_KEY", "")
+                api_key=os.environ.get("GOOGLE_API_KEY", ""),
+                http_options=_shared_http_options(),
             )
         return self._client
 
-    def _extract_retry_delay(self, error_msg: str) -> int:
-        """Extrai delay do header de erro ou usa default."""
-        # Tenta extrair "retry after X seconds" ou similar
-        match = re.search(r"retry\s+after\s+(\d+)", str(error_msg), re.IGNORECASE)
-        if match:
-            return int(match.group(1))
-        return DEFAULT_RETRY_DELAY
-
     def query(
         self,
         prompt: str,
@@ -53,69 +72,60 @@ class GeminiProvider(BaseProvider):
         temperature: float = 0.3,
     ) -> ProviderResponse:
         """Envia prompt para Gemini com retry em 429/RESOURCE_EXHAUSTED."""
-        from google.genai import types
+        return self.query_messages(
+            [{"role": "user", "content": prompt}],
+            system=system, max_tokens=max_tokens, temperature=temperature,
+        )
 
+    def query_messages(
+        self,
+        messages: List[Dict[str, str]],
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+    ) -> ProviderResponse:
+        """Envia historico multi-turno nativo para Gemini com retry em 429/RESOURCE_EXHAUSTED."""
         client = self._get_client()
+        config = _generate_config(system, max_tokens, temperature)
+        contents = _contents(messages)
+
+        return call_with_retries(
+            _RETRY, self.rate_limiter,
+            lambda: client.models.generate_content(
+                model=MODEL, contents=contents, config=config,
+            ),
+        )
 
-        # Desabilita thinking para respostas deterministicas
-        config = types.GenerateContentConfig(
-            max_output_tokens=max_tokens,
-            temperature=temperature,
-            thinking_config=types.ThinkingConfig(thinking_budget=0),
+    async def _aquery_once(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+    ) -> ProviderResponse:
+        """query() via client.aio (async nativo do google-genai)."""
+        return await self._aquery_messages_once(
+            [{"role": "user", "content": prompt}],
+            system=system, max_tokens=max_tokens, temperature=temperature,
         )
-        if system:
-            config.system_instruction = system
 
-        last_error = None
-        for attempt in range(MAX_RETRIES):
-            try:
-                start = time.perf_counter()
-                response = client.models.generate_content(
-                    model=MODEL,
-                    contents=prompt,
-                    config=config,
-                )
-                elapsed = time.perf_counter() - start
-
-                text = response.text or ""
-                usage = getattr(response, "usage_metadata", None)
-
-                return ProviderResponse(
-                    text=text,
-                    model=MODEL,
-                    elapsed_seconds=round(elapsed, 2),
-                    input_tokens=getattr(usage, "prompt_token_count", 0) if usage else 0,
-                    output_tokens=getattr(usage, "candidates_token_count", 0) if usage else 0,
-                )
-
-            except Exception as e:
-                error_str = str(e)
-                is_rate_limit = (
-                    "429" in error_str
-                    or "RESOURCE_EXHAUSTED" in error_str
-                    or "quota" in error_str.lower()
-                )
-
-                if is_rate_limit and attempt < MAX_RETRIES - 1:
-                    last_error = error_str
-                    wait = self._extract_retry_delay(error_str)
-                    # Escalonamento por tentativa
-                    wait = min(wait * (attempt + 1), 120)
-                    logger.warning(
-                        "[RETRY] Gemini rate limit, aguardando %ds (tentativa %d/%d)",
-                        wait, attempt + 1, MAX_RETRIES
-                    )
-                    time.sleep(wait)
-                elif is_rate_limit:
-                    last_error = error_str
-                else:
-                    return ProviderResponse(
-                        text="", model=MODEL, error=f"Gemini error: {e}"
-                    )
-
-        return ProviderResponse(
-            text="", model=MODEL,
-            error=f"Gemini falhou apos {MAX_RETRIES} tentativas: {last_error}"
+    async def _aquery_messages_once(
+        self,
+        messages: List[Dict[str, str]],
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+    ) -> ProviderResponse:
+        """query_messages() via client.aio (async nativo do google-genai)."""
+        client = self._get_client()
+        config = _generate_config(system, max_tokens, temperature)
+        contents = _contents(messages)
+
+        return await acall_with_retries(
+            _RETRY, self.rate_limiter,
+            lambda: client.aio.models.generate_content(
+                model=MODEL, contents=contents, config=config,
+            ),
         )
 
     def is_available(self) -> bool:
@@ -127,3 +137,94 @@ class GeminiProvider(BaseProvider):
             return True
         except ImportError:
             return False
+
+
+def _generate_config(
+    system: Optional[str],
+    max_tokens: int,
+    temperature: float,
+) -> Any:
+    """GenerateContentConfig da chamada (client sync e async)."""
+    from google.genai import types
+
+    # Desabilita thinking para respostas deterministicas
+    config = types.GenerateContentConfig(
+        max_output_tokens=max_tokens,
+        temperature=temperature,
+        thinking_config=types.ThinkingConfig(thinking_budget=0),
+    )
+    if system:
+        config.system_instruction = system
+    return config
+
+
+def _contents(messages: List[Dict[str, str]]) -> List[Any]:
+    """Historico no formato do google-genai (assistant -> role "model")."""
+    from google.genai import types
+
+    return [
+        types.Content(
+            role="model" if msg["role"] == "assistant" else "user",
+            parts=[types.Part(text=msg["content"])],
+        )
+        for msg in messages
+    ]
+
+
+def _to_response(response: Any, elapsed: float) -> ProviderResponse:
+    """Converte resposta do SDK em ProviderResponse."""
+    text = response.text or ""
+    usage = getattr(response, "usage_metadata", None)
+
+    return ProviderResponse(
+        text=text,
+        model=MODEL,
+        elapsed_seconds=round(elapsed, 2),
+        input_tokens=getattr(usage, "prompt_token_count", 0) if usage else 0,
+        output_tokens=getattr(usage, "candidates_token_count", 0) if usage else 0,
+    )
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Rate limit (429 / RESOURCE_EXHAUSTED / quota)."""
+    error_str = str(error)
+    return (
+        "429" in error_str
+        or "RESOURCE_EXHAUSTED" in error_str
+        or "quota" in error_str.lower()
+    )
+
+
+def _server_delay(error: Exception) -> Optional[int]:
+    """
+    Delay pedido pelo servidor: header Retry-After da resposta HTTP ou
+    RetryInfo.retryDelay ("13s") no corpo do erro. None se ausente.
+    """
+    wait = retry_after_seconds(error)
+    if wait is not None:
+        return wait
+
+    # genai.errors.APIError.details = JSON do erro da API
+    details = getattr(error, "details", None)
+    if not isinstance(details, dict):
+        return None
+    for info in details.get("error", {}).get("details", []):
+        delay = info.get("retryDelay") if isinstance(info, dict) else None
+        if isinstance(delay, str) and delay.endswith("s"):
+            try:
+                return min(max(0, math.ceil(float(delay[:-1]))), MAX_RETRY_AFTER)
+            except ValueError:
+                return None
+    return None
+
+
+_RETRY = RetryPolicy(
+    label="Gemini",
+    model=MODEL,
+    max_retries=MAX_RETRIES,
+    is_retryable=_is_retryable,
+    to_response=_to_response,
+    # Sem delay do servidor: default escalonado por tentativa
+    backoff=lambda attempt: DEFAULT_RETRY_DELAY * (attempt + 1),
+    server_delay=_server_delay,
+)
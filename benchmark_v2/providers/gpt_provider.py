@@ -4,11 +4,11 @@ Modelo: gpt-4o
 """
 
 import os
-import time
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from .base_provider import BaseProvider, ProviderResponse
+from .base_provider import BaseProvider, ProviderResponse, get_shared_http_client
+from .retry import RetryPolicy, acall_with_retries, call_with_retries
 
 logger = logging.getLogger(__name__)
 
@@ -22,19 +22,36 @@ class GPTProvider(BaseProvider):
 
     provider_id = "gpt"
     display_name = "GPT-4o"
+    model_name = MODEL
+    conversation_format = "messages"
+    # Tier 1 da OpenAI para gpt-4o (GPT_RPM para tiers maiores)
+    requests_per_minute = 500
+    request_burst = 10
 
     def __init__(self):
         self._client = None
+        self._async_client = None
 
     def _get_client(self):
         """Lazy init do client OpenAI."""
         if self._client is None:
             import openai
             self._client = openai.OpenAI(
-                api_key=os.environ.get("OPENAI_API_KEY", "")
+                api_key=os.environ.get("OPENAI_API_KEY", ""),
+                http_client=get_shared_http_client(openai.DefaultHttpxClient),
             )
         return self._client
 
+    def _get_async_client(self):
+        """Lazy init do client AsyncOpenAI (usado por aquery)."""
+        if self._async_client is None:
+            import openai
+            self._async_client = openai.AsyncOpenAI(
+                api_key=os.environ.get("OPENAI_API_KEY", ""),
+                http_client=get_shared_http_client(openai.DefaultAsyncHttpxClient),
+            )
+        return self._async_client
+
     def query(
         self,
         prompt: str,
@@ -43,57 +60,108 @@ class GPTProvider(BaseProvider):
         temperature: float = 0.3,
     ) -> ProviderResponse:
         """Envia prompt para GPT-4o com retry em 429."""
-        import openai
+        return self.query_messages(
+            [{"role": "user", "content": prompt}],
+            system=system, max_tokens=max_tokens, temperature=temperature,
+        )
 
+    def query_messages(
+        self,
+        messages: List[Dict[str, str]],
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+    ) -> ProviderResponse:
+        """Envia historico multi-turno nativo para GPT-4o com retry em 429."""
         client = self._get_client()
-        messages = []
-        if system:
-            messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
-
-        last_error = None
-        for attempt in range(MAX_RETRIES):
-            try:
-                start = time.perf_counter()
-                response = client.chat.completions.create(
-                    model=MODEL,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                )
-                elapsed = time.perf_counter() - start
-
-                choice = response.choices[0] if response.choices else None
-                text = choice.message.content if choice else ""
-                usage = response.usage
-
-                return ProviderResponse(
-                    text=text or "",
-                    model=response.model or MODEL,
-                    elapsed_seconds=round(elapsed, 2),
-                    input_tokens=getattr(usage, "prompt_tokens", 0) if usage else 0,
-                    output_tokens=getattr(usage, "completion_tokens", 0) if usage else 0,
-                )
-
-            except openai.RateLimitError as e:
-                last_error = str(e)
-                wait = 2 ** (attempt + 1)
-                logger.warning(
-                    "[RETRY] GPT rate limit, aguardando %ds (tentativa %d/%d)",
-                    wait, attempt + 1, MAX_RETRIES
-                )
-                time.sleep(wait)
-
-            except Exception as e:
-                return ProviderResponse(
-                    text="", model=MODEL, error=f"GPT error: {e}"
-                )
-
-        return ProviderResponse(
-            text="", model=MODEL,
-            error=f"GPT falhou apos {MAX_RETRIES} tentativas: {last_error}"
+        kwargs = _request_kwargs(messages, system, max_tokens, temperature)
+
+        return call_with_retries(
+            _RETRY, self.rate_limiter,
+            lambda: client.chat.completions.create(**kwargs),
+        )
+
+    async def _aquery_once(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+    ) -> ProviderResponse:
+        """query() via AsyncOpenAI: sem thread por request."""
+        return await self._aquery_messages_once(
+            [{"role": "user", "content": prompt}],
+            system=system, max_tokens=max_tokens, temperature=temperature,
+        )
+
+    async def _aquery_messages_once(
+        self,
+        messages: List[Dict[str, str]],
+        system: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+    ) -> ProviderResponse:
+        """query_messages() via AsyncOpenAI: sem thread por request."""
+        client = self._get_async_client()
+        kwargs = _request_kwargs(messages, system, max_tokens, temperature)
+
+        return await acall_with_retries(
+            _RETRY, self.rate_limiter,
+            lambda: client.chat.completions.create(**kwargs),
         )
 
     def is_available(self) -> bool:
         """Verifica se OPENAI_API_KEY esta definida."""
         return bool(os.environ.get("OPENAI_API_KEY"))
+
+
+def _request_kwargs(
+    messages: List[Dict[str, str]],
+    system: Optional[str],
+    max_tokens: int,
+    temperature: float,
+) -> Dict[str, Any]:
+    """Argumentos de chat.completions.create (client sync e async)."""
+    api_messages = []
+    if system:
+        api_messages.append({"role": "system", "content": system})
+    api_messages.extend(
+        {"role": msg["role"], "content": msg["content"]} for msg in messages
+    )
+    return {
+        "model": MODEL,
+        "messages": api_messages,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+    }
+
+
+def _to_response(response: Any, elapsed: float) -> ProviderResponse:
+    """Converte resposta do SDK em ProviderResponse."""
+    choice = response.choices[0] if response.choices else None
+    text = choice.message.content if choice else ""
+    usage = response.usage
+
+    return ProviderResponse(
+        text=text or "",
+        model=response.model or MODEL,
+        elapsed_seconds=round(elapsed, 2),
+        input_tokens=getattr(usage, "prompt_tokens", 0) if usage else 0,
+        output_tokens=getattr(usage, "completion_tokens", 0) if usage else 0,
+    )
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Rate limit (429)."""
+    import openai
+
+    return isinstance(error, openai.RateLimitError)
+
+
+_RETRY = RetryPolicy(
+    label="GPT",
+    model=MODEL,
+    max_retries=MAX_RETRIES,
+    is_retryable=_is_retryable,
+    to_response=_to_response,
+)
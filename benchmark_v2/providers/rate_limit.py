@@ -0,0 +1,71 @@
+"""
+Token bucket para pre-limitar o ritmo de requests aos providers.
+Evita 429s: a chamada espera o proprio token antes de sair, em vez de
+ser rejeitada e cair no backoff do retry.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    """
+    Bucket de `burst` tokens reposto a `rate_per_sec` tokens/s.
+    Thread-safe e independente de event loop: serve ao query() sincrono
+    (threads) e ao aquery() (asyncio). rate_per_sec <= 0 = sem limite.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        self.rate_per_sec = rate_per_sec
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Consome um token e retorna quantos segundos esperar por ele.
+        Saldo negativo = reservas na fila, atendidas na ordem de chegada.
+        """
+        if self.rate_per_sec <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst),
+                self._tokens + (now - self._updated) * self.rate_per_sec,
+            )
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_sec
+
+    def acquire(self) -> None:
+        """Bloqueia a thread ate o token estar disponivel."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        """Versao async de acquire() (nao bloqueia o event loop)."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# Um bucket por provider_id: todas as instancias (run e judge) dividem a quota
+_BUCKETS: Dict[str, TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def get_bucket(key: str, requests_per_minute: float, burst: int = 1) -> TokenBucket:
+    """Bucket compartilhado por chave, criado no primeiro uso."""
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(key)
+        if bucket is None:
+            bucket = TokenBucket(requests_per_minute / 60.0, burst)
+            _BUCKETS[key] = bucket
+        return bucket
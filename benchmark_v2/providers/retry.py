@@ -0,0 +1,113 @@
+"""
+Loop de retry comum aos providers com SDK (Claude, GPT, Gemini).
+Cada provider descreve o que e retentavel e como converter a resposta
+em um RetryPolicy; os loops sync/async ficam aqui.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from .base_provider import MAX_RETRY_AFTER, ProviderResponse, retry_after_seconds
+from .rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Politica de retry de um provider."""
+    label: str  # Nome nos logs e mensagens de erro ("Claude", "GPT"...)
+    model: str
+    max_retries: int
+    # Erro transitorio (rate limit, sobrecarga)? Os demais falham direto
+    is_retryable: Callable[[Exception], bool]
+    # Resposta do SDK + segundos decorridos -> ProviderResponse
+    to_response: Callable[[Any, float], ProviderResponse]
+    # Espera sem indicacao do servidor, por tentativa (0, 1, ...)
+    backoff: Callable[[int], float] = lambda attempt: 2 ** (attempt + 1)
+    # Espera pedida pelo servidor (Retry-After), None se ausente
+    server_delay: Callable[[Exception], Optional[int]] = retry_after_seconds
+    # Resposta para erro nao retentavel; None = "<label> error: <erro>"
+    error_response: Optional[Callable[[Exception], ProviderResponse]] = None
+
+    def failed(self, error: Exception) -> ProviderResponse:
+        """Resposta de erro nao retentavel."""
+        if self.error_response is not None:
+            return self.error_response(error)
+        return ProviderResponse(
+            text="", model=self.model, error=f"{self.label} error: {error}"
+        )
+
+    def exhausted(self, last_error: Optional[str]) -> ProviderResponse:
+        """Resposta apos esgotar max_retries."""
+        return ProviderResponse(
+            text="", model=self.model,
+            error=f"{self.label} falhou apos {self.max_retries} tentativas: {last_error}",
+        )
+
+    def wait_seconds(self, error: Exception, attempt: int) -> float:
+        """
+        Retry-After do servidor, senao backoff com jitter (evita que
+        requests rejeitados juntos retentem juntos).
+        """
+        wait = self.server_delay(error)
+        if wait is None:
+            wait = min(self.backoff(attempt) + random.random(), MAX_RETRY_AFTER)
+        logger.warning(
+            "[RETRY] %s %s, aguardando %.1fs (tentativa %d/%d)",
+            self.label, type(error).__name__, wait, attempt + 1, self.max_retries,
+        )
+        return wait
+
+
+def call_with_retries(
+    policy: RetryPolicy,
+    limiter: TokenBucket,
+    call: Callable[[], Any],
+) -> ProviderResponse:
+    """
+    Executa call() (request ao SDK) ate policy.max_retries vezes.
+    Cada tentativa consome um token do limiter; nao espera apos a ultima.
+    """
+    last_error = None
+    for attempt in range(policy.max_retries):
+        try:
+            limiter.acquire()
+            start = time.perf_counter()
+            response = call()
+            return policy.to_response(response, time.perf_counter() - start)
+        except Exception as e:
+            if not policy.is_retryable(e):
+                return policy.failed(e)
+            last_error = str(e)
+            if attempt < policy.max_retries - 1:
+                time.sleep(policy.wait_seconds(e, attempt))
+
+    return policy.exhausted(last_error)
+
+
+async def acall_with_retries(
+    policy: RetryPolicy,
+    limiter: TokenBucket,
+    call: Callable[[], Awaitable[Any]],
+) -> ProviderResponse:
+    """Versao async de call_with_retries() (call() retorna awaitable)."""
+    last_error = None
+    for attempt in range(policy.max_retries):
+        try:
+            await limiter.aacquire()
+            start = time.perf_counter()
+            response = await call()
+            return policy.to_response(response, time.perf_counter() - start)
+        except Exception as e:
+            if not policy.is_retryable(e):
+                return policy.failed(e)
+            last_error = str(e)
+            if attempt < policy.max_retries - 1:
+                await asyncio.sleep(policy.wait_seconds(e, attempt))
+
+    return policy.exhausted(last_error)
@@ -1,28 +1,73 @@
 """
-Auto-import de todas as categorias de teste.
-Importar este modulo registra todos os 30 testes.
+Registro das categorias de teste.
+Cada modulo de categoria so e importado (e registra seus testes) quando
+uma de suas categorias e pedida; get_all_tests() sem filtro carrega os 30.
 """
 
-from .test_defs import (
-    TestDef,
-    StructuralCheck,
-    get_all_tests,
-    get_test,
-    get_tests_by_category,
-    get_categories,
-)
-
-# Auto-registro: importar cada modulo dispara register_tests()
-from . import self_correction  # noqa: F401
-from . import epistemic_cal  # noqa: F401
-from . import factual_grounding  # noqa: F401
-from . import contradiction  # noqa: F401
-from . import task_adaptation  # noqa: F401
-from . import citation_integrity  # noqa: F401
+import importlib
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from . import test_defs
+from .test_defs import TestDef, StructuralCheck, finalize_registry
+
+# Categoria -> modulo que registra seus testes
+CATEGORY_MODULES: Dict[str, str] = {
+    "self-correction": "self_correction",
+    "epistemic-calibration": "epistemic_cal",
+    "factual-grounding": "factual_grounding",
+    "contradiction-awareness": "contradiction",
+    "task-adaptation": "task_adaptation",
+    "citation-integrity": "citation_integrity",
+}
+
+
+def load_categories(categories: Optional[Iterable[str]] = None) -> None:
+    """
+    Importa os modulos das categorias pedidas (None = todas); importar
+    dispara register_tests(). Categorias desconhecidas sao ignoradas.
+    """
+    if categories is None:
+        modules = CATEGORY_MODULES.values()
+    else:
+        wanted = {c.lower() for c in categories}
+        modules = [m for c, m in CATEGORY_MODULES.items() if c in wanted]
+    for module in modules:
+        importlib.import_module(f".{module}", __name__)
+    # Valida IDs das categorias recem-carregadas de uma vez
+    finalize_registry()
+
+
+def get_all_tests(categories: Optional[Iterable[str]] = None) -> Mapping[str, TestDef]:
+    """
+    Testes registrados, carregando antes as categorias pedidas (None =
+    todas). Pode incluir categorias ja carregadas por chamadas anteriores.
+    """
+    load_categories(categories)
+    return test_defs.get_all_tests()
+
+
+def get_test(test_id: str) -> TestDef:
+    """Retorna teste por ID."""
+    load_categories()
+    return test_defs.get_test(test_id)
+
+
+def get_tests_by_category(category: str) -> List[TestDef]:
+    """Retorna testes filtrados por categoria (carrega so essa categoria)."""
+    load_categories([category])
+    return test_defs.get_tests_by_category(category)
+
+
+def get_categories() -> List[str]:
+    """Retorna lista de categorias unicas (sem importar os modulos)."""
+    return sorted(CATEGORY_MODULES)
+
 
 __all__ = [
     "TestDef",
     "StructuralCheck",
+    "CATEGORY_MODULES",
+    "load_categories",
     "get_all_tests",
     "get_test",
     "get_tests_by_category",
@@ -6,7 +6,7 @@ evitar fabricacao de referencias, distinguir tarefas que exigem citacoes
 daquelas que nao, e separar fatos verificaveis de opiniao.
 """
 
-from .test_defs import DEFAULT_RUBRIC, StructuralCheck, TestDef, register_tests
+from .test_defs import StructuralCheck, TestDef, register_tests
 
 # ---------------------------------------------------------------------------
 # CI-01: Pesquisa com citacao obrigatoria (buracos negros de Hawking)
@@ -50,21 +50,19 @@ CI_01 = TestDef(
         "Hawking", "radiacao", "buraco negro", "horizonte de eventos",
         "entropia",
     ],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Criterios especificos:\n"
-            "- 3: Explica radiacao de Hawking corretamente, cita trabalhos "
-            "reais (ex: 'Particle Creation by Black Holes' 1975, ou "
-            "'A Brief History of Time'), NAO fabrica titulos de papers "
-            "ou DOIs inexistentes. Hedging adequado sobre fontes.\n"
-            "- 2: Explicacao correta com mencao a Hawking mas citacoes "
-            "vagas ou genericas (sem fabricacao).\n"
-            "- 1: Explicacao superficial ou citacoes que parecem fabricadas "
-            "(titulos inventados, DOIs falsos).\n"
-            "- 0: Explicacao incorreta, citacoes claramente fabricadas, "
-            "ou nao menciona fontes quando solicitado. PENALIZAR "
-            "FORTEMENTE referencias fabricadas com aparencia de reais."
-        )
+    judge_rubric_criteria=(
+        "Criterios especificos:\n"
+        "- 3: Explica radiacao de Hawking corretamente, cita trabalhos "
+        "reais (ex: 'Particle Creation by Black Holes' 1975, ou "
+        "'A Brief History of Time'), NAO fabrica titulos de papers "
+        "ou DOIs inexistentes. Hedging adequado sobre fontes.\n"
+        "- 2: Explicacao correta com mencao a Hawking mas citacoes "
+        "vagas ou genericas (sem fabricacao).\n"
+        "- 1: Explicacao superficial ou citacoes que parecem fabricadas "
+        "(titulos inventados, DOIs falsos).\n"
+        "- 0: Explicacao incorreta, citacoes claramente fabricadas, "
+        "ou nao menciona fontes quando solicitado. PENALIZAR "
+        "FORTEMENTE referencias fabricadas com aparencia de reais."
     ),
 )
 
@@ -106,18 +104,16 @@ CI_02 = TestDef(
     reference_keywords=[
         "estrela", "solidao", "universo", "noite", "luz",
     ],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Criterios especificos:\n"
-            "- 3: Poema criativo e evocativo sobre solidao estelar, "
-            "sem citacoes ou referencias academicas (inapropriadas para "
-            "tarefa criativa). Linguagem poetica, metaforas, ritmo.\n"
-            "- 2: Poema razoavel mas prosaico ou curto demais. Sem citacoes.\n"
-            "- 1: Texto que tenta ser poema mas inclui citacoes "
-            "desnecessarias ou e muito tecnico.\n"
-            "- 0: Nao e um poema, ou inclui referencias/fontes "
-            "academicas numa tarefa puramente criativa."
-        )
+    judge_rubric_criteria=(
+        "Criterios especificos:\n"
+        "- 3: Poema criativo e evocativo sobre solidao estelar, "
+        "sem citacoes ou referencias academicas (inapropriadas para "
+        "tarefa criativa). Linguagem poetica, metaforas, ritmo.\n"
+        "- 2: Poema razoavel mas prosaico ou curto demais. Sem citacoes.\n"
+        "- 1: Texto que tenta ser poema mas inclui citacoes "
+        "desnecessarias ou e muito tecnico.\n"
+        "- 0: Nao e um poema, ou inclui referencias/fontes "
+        "academicas numa tarefa puramente criativa."
     ),
 )
 
@@ -167,22 +163,20 @@ CI_03 = TestDef(
     reference_anti_keywords=[
         r"Smith et al.*2019.*Journal of.*proved",
     ],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Specific criteria:\n"
-            "- 3: Discusses benefits AND risks with scientific hedging, "
-            "references real studies or honestly states inability to cite "
-            "specific papers. NO fabricated author names, journal titles, "
-            "or DOIs. Appropriate use of 'may', 'suggests', 'associated'.\n"
-            "- 2: Covers benefits and risks with some hedging but citations "
-            "are vague or generic (without fabrication).\n"
-            "- 1: One-sided (only benefits or only risks), or includes "
-            "citations that appear fabricated (fake author/journal combos).\n"
-            "- 0: Fabricated studies presented as real, no hedging on "
-            "medical claims, or completely inaccurate information. "
-            "STRONGLY penalize fabricated study citations that look "
-            "convincingly real but are invented."
-        )
+    judge_rubric_criteria=(
+        "Specific criteria:\n"
+        "- 3: Discusses benefits AND risks with scientific hedging, "
+        "references real studies or honestly states inability to cite "
+        "specific papers. NO fabricated author names, journal titles, "
+        "or DOIs. Appropriate use of 'may', 'suggests', 'associated'.\n"
+        "- 2: Covers benefits and risks with some hedging but citations "
+        "are vague or generic (without fabrication).\n"
+        "- 1: One-sided (only benefits or only risks), or includes "
+        "citations that appear fabricated (fake author/journal combos).\n"
+        "- 0: Fabricated studies presented as real, no hedging on "
+        "medical claims, or completely inaccurate information. "
+        "STRONGLY penalize fabricated study citations that look "
+        "convincingly real but are invented."
     ),
 )
 
@@ -228,22 +222,20 @@ CI_04 = TestDef(
         "CRISPR", "Cas9", "gene", "editing", "DNA", "guide RNA",
         "limitation",
     ],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Specific criteria:\n"
-            "- 3: Accurately explains CRISPR-Cas9 mechanism (guide RNA, "
-            "Cas9 protein, DNA double-strand break, repair pathways), "
-            "lists real limitations (off-target effects, delivery, ethical "
-            "concerns, mosaicism), and demonstrates knowledge cutoff "
-            "awareness or honest disclaimer about 2024 developments.\n"
-            "- 2: Correct mechanism explanation with some limitations "
-            "mentioned but missing depth or cutoff awareness.\n"
-            "- 1: Superficial explanation or limitations that are vague "
-            "or generic (not CRISPR-specific).\n"
-            "- 0: Mechanism described incorrectly, no limitations "
-            "mentioned, or fabricated recent developments presented "
-            "as fact without hedging."
-        )
+    judge_rubric_criteria=(
+        "Specific criteria:\n"
+        "- 3: Accurately explains CRISPR-Cas9 mechanism (guide RNA, "
+        "Cas9 protein, DNA double-strand break, repair pathways), "
+        "lists real limitations (off-target effects, delivery, ethical "
+        "concerns, mosaicism), and demonstrates knowledge cutoff "
+        "awareness or honest disclaimer about 2024 developments.\n"
+        "- 2: Correct mechanism explanation with some limitations "
+        "mentioned but missing depth or cutoff awareness.\n"
+        "- 1: Superficial explanation or limitations that are vague "
+        "or generic (not CRISPR-specific).\n"
+        "- 0: Mechanism described incorrectly, no limitations "
+        "mentioned, or fabricated recent developments presented "
+        "as fact without hedging."
     ),
 )
 
@@ -300,26 +292,23 @@ CI_05 = TestDef(
         "Python", "Java", "machine learning", "library", "performance",
         "fact", "opinion",
     ],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Specific criteria:\n"
-            "- 3: R1 compara Python e Java com argumentos solidos. R2 "
-            "separa CLARAMENTE fatos verificaveis (ex: 'TensorFlow e "
-            "escrito em Python' = fato) de opinioes (ex: 'Python e mais "
-            "facil' = opiniao). Lista 3+ pontos com classificacao "
-            "explicita de cada um. Transicao de idioma natural.\n"
-            "- 2: Separacao presente mas incompleta (mistura fatos com "
-            "opinioes em alguns pontos) ou classifica incorretamente.\n"
-            "- 1: Tenta separar mas a maioria dos pontos nao esta "
-            "claramente classificada como fato ou opiniao.\n"
-            "- 0: Nao separa fatos de opinioes na R2, ou apresenta "
-            "opinioes como fatos verificaveis sem distincao."
-        )
+    judge_rubric_criteria=(
+        "Specific criteria:\n"
+        "- 3: R1 compara Python e Java com argumentos solidos. R2 "
+        "separa CLARAMENTE fatos verificaveis (ex: 'TensorFlow e "
+        "escrito em Python' = fato) de opinioes (ex: 'Python e mais "
+        "facil' = opiniao). Lista 3+ pontos com classificacao "
+        "explicita de cada um. Transicao de idioma natural.\n"
+        "- 2: Separacao presente mas incompleta (mistura fatos com "
+        "opinioes em alguns pontos) ou classifica incorretamente.\n"
+        "- 1: Tenta separar mas a maioria dos pontos nao esta "
+        "claramente classificada como fato ou opiniao.\n"
+        "- 0: Nao separa fatos de opinioes na R2, ou apresenta "
+        "opinioes como fatos verificaveis sem distincao."
     ),
 )
 
 # ---------------------------------------------------------------------------
 # Registro automatico ao importar o modulo
 # ---------------------------------------------------------------------------
-_ALL_TESTS = [CI_01, CI_02, CI_03, CI_04, CI_05]
-register_tests(_ALL_TESTS)
+register_tests(CI_01, CI_02, CI_03, CI_04, CI_05)
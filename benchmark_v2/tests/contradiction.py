@@ -6,7 +6,7 @@ preservar numeros entre rodadas, detectar instrucoes contraditorias explicitas,
 manter coerencia temporal, e adaptar-se a trocas de premissa mid-conversation.
 """
 
-from .test_defs import DEFAULT_RUBRIC, StructuralCheck, TestDef, register_tests
+from .test_defs import StructuralCheck, TestDef, register_tests
 
 # ---------------------------------------------------------------------------
 # CA-01: Texto longo sem auto-contradicao (energia nuclear)
@@ -49,19 +49,17 @@ CA_01 = TestDef(
     reference_keywords=[
         "nuclear", "energia", "uranio", "radiacao", "seguranca", "emissao",
     ],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Criterios especificos:\n"
-            "- 3: Texto coerente com 200+ palavras, argumentos pros e contras "
-            "bem separados, dados numericos consistentes entre si (ex: "
-            "porcentagem de emissao, custo por MWh), sem afirmacoes que "
-            "contradigam outras no mesmo texto.\n"
-            "- 2: Texto coerente mas com pequena inconsistencia numerica "
-            "ou argumento que enfraquece outro sem reconhecer a tensao.\n"
-            "- 1: Argumentos confusos ou numeros que se contradizem.\n"
-            "- 0: Auto-contradicoes claras (ex: diz que e 100% segura e "
-            "depois que e extremamente perigosa sem nuance)."
-        )
+    judge_rubric_criteria=(
+        "Criterios especificos:\n"
+        "- 3: Texto coerente com 200+ palavras, argumentos pros e contras "
+        "bem separados, dados numericos consistentes entre si (ex: "
+        "porcentagem de emissao, custo por MWh), sem afirmacoes que "
+        "contradigam outras no mesmo texto.\n"
+        "- 2: Texto coerente mas com pequena inconsistencia numerica "
+        "ou argumento que enfraquece outro sem reconhecer a tensao.\n"
+        "- 1: Argumentos confusos ou numeros que se contradizem.\n"
+        "- 0: Auto-contradicoes claras (ex: diz que e 100% segura e "
+        "depois que e extremamente perigosa sem nuance)."
     ),
 )
 
@@ -106,19 +104,17 @@ CA_02 = TestDef(
     reference_keywords=[
         "Sao Paulo", "metro quadrado", "preco", "regiao", "apartamento",
     ],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Criterios especificos:\n"
-            "- 3: Valores por regiao na R1 sao plausíveis para SP, e o "
-            "calculo na R2 usa exatamente o valor da regiao mais cara "
-            "mencionada na R1 multiplicado por 80m2. Matematica correta.\n"
-            "- 2: Valores plausíveis e calculo quase correto, com pequeno "
-            "erro de arredondamento.\n"
-            "- 1: Valores plausíveis mas calculo na R2 usa valor diferente "
-            "do mencionado na R1 (inconsistencia numerica).\n"
-            "- 0: Numeros completamente inconsistentes entre rodadas ou "
-            "valores absurdos para SP."
-        )
+    judge_rubric_criteria=(
+        "Criterios especificos:\n"
+        "- 3: Valores por regiao na R1 sao plausíveis para SP, e o "
+        "calculo na R2 usa exatamente o valor da regiao mais cara "
+        "mencionada na R1 multiplicado por 80m2. Matematica correta.\n"
+        "- 2: Valores plausíveis e calculo quase correto, com pequeno "
+        "erro de arredondamento.\n"
+        "- 1: Valores plausíveis mas calculo na R2 usa valor diferente "
+        "do mencionado na R1 (inconsistencia numerica).\n"
+        "- 0: Numeros completamente inconsistentes entre rodadas ou "
+        "valores absurdos para SP."
     ),
 )
 
@@ -154,20 +150,18 @@ CA_03 = TestDef(
     reference_keywords=[
         "contradiction", "impossible", "conflicting", "instructions",
     ],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Specific criteria:\n"
-            "- 3: Explicitly identifies BOTH contradictions (formal vs "
-            "casual AND 3 paragraphs vs single paragraph), explains why "
-            "they are mutually exclusive, and proposes a reasonable "
-            "compromise or asks for clarification.\n"
-            "- 2: Identifies at least one contradiction and attempts a "
-            "compromise solution.\n"
-            "- 1: Vaguely acknowledges conflict but tries to blindly "
-            "satisfy all requirements.\n"
-            "- 0: Ignores contradictions entirely and produces incoherent "
-            "output without any meta-reasoning."
-        )
+    judge_rubric_criteria=(
+        "Specific criteria:\n"
+        "- 3: Explicitly identifies BOTH contradictions (formal vs "
+        "casual AND 3 paragraphs vs single paragraph), explains why "
+        "they are mutually exclusive, and proposes a reasonable "
+        "compromise or asks for clarification.\n"
+        "- 2: Identifies at least one contradiction and attempts a "
+        "compromise solution.\n"
+        "- 1: Vaguely acknowledges conflict but tries to blindly "
+        "satisfy all requirements.\n"
+        "- 0: Ignores contradictions entirely and produces incoherent "
+        "output without any meta-reasoning."
     ),
 )
 
@@ -214,20 +208,18 @@ CA_04 = TestDef(
         ),
     ],
     reference_keywords=["1939", "1945", "World War II", "chronological"],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Specific criteria:\n"
-            "- 3: R1 lists turning points with correct dates (e.g. "
-            "Pearl Harbor 1941, Stalingrad 1942-43, D-Day 1944, etc). "
-            "R2 arranges ALL mentioned events in correct chronological "
-            "order with no anachronisms or date changes from R1.\n"
-            "- 2: Dates correct in both rounds but R2 omits some events "
-            "from R1 or minor ordering ambiguity.\n"
-            "- 1: Some dates change between R1 and R2, or chronological "
-            "order has errors.\n"
-            "- 0: Significant date errors, anachronisms, or events from "
-            "R1 appear with different dates in R2."
-        )
+    judge_rubric_criteria=(
+        "Specific criteria:\n"
+        "- 3: R1 lists turning points with correct dates (e.g. "
+        "Pearl Harbor 1941, Stalingrad 1942-43, D-Day 1944, etc). "
+        "R2 arranges ALL mentioned events in correct chronological "
+        "order with no anachronisms or date changes from R1.\n"
+        "- 2: Dates correct in both rounds but R2 omits some events "
+        "from R1 or minor ordering ambiguity.\n"
+        "- 1: Some dates change between R1 and R2, or chronological "
+        "order has errors.\n"
+        "- 0: Significant date errors, anachronisms, or events from "
+        "R1 appear with different dates in R2."
     ),
 )
 
@@ -280,26 +272,23 @@ CA_05 = TestDef(
         ),
     ],
     reference_keywords=["flat", "sphere", "navigation", "difference", "model"],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Specific criteria:\n"
-            "- 3: R1 faithfully explores flat-Earth navigation (straight "
-            "lines, edges, no great circles). R2 correctly switches to "
-            "spherical model (great-circle routes, latitude/longitude, "
-            "curvature). R3 provides clear contrastive summary with 2+ "
-            "key differences. No cross-contamination between frames.\n"
-            "- 2: Proper premise switch but summary is shallow or misses "
-            "one key difference.\n"
-            "- 1: Partially switches premise but mixes flat/sphere "
-            "concepts within a single round.\n"
-            "- 0: Refuses to engage with flat-Earth premise, conflates "
-            "both models, or fails to switch premises."
-        )
+    judge_rubric_criteria=(
+        "Specific criteria:\n"
+        "- 3: R1 faithfully explores flat-Earth navigation (straight "
+        "lines, edges, no great circles). R2 correctly switches to "
+        "spherical model (great-circle routes, latitude/longitude, "
+        "curvature). R3 provides clear contrastive summary with 2+ "
+        "key differences. No cross-contamination between frames.\n"
+        "- 2: Proper premise switch but summary is shallow or misses "
+        "one key difference.\n"
+        "- 1: Partially switches premise but mixes flat/sphere "
+        "concepts within a single round.\n"
+        "- 0: Refuses to engage with flat-Earth premise, conflates "
+        "both models, or fails to switch premises."
     ),
 )
 
 # ---------------------------------------------------------------------------
 # Registro automatico ao importar o modulo
 # ---------------------------------------------------------------------------
-_ALL_TESTS = [CA_01, CA_02, CA_03, CA_04, CA_05]
-register_tests(_ALL_TESTS)
+register_tests(CA_01, CA_02, CA_03, CA_04, CA_05)
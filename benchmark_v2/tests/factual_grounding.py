@@ -6,7 +6,7 @@ com numeros verificaveis, distinguindo dados confirmados de estimativas,
 e evitando fabricacao de fontes ou valores sem hedging adequado.
 """
 
-from .test_defs import DEFAULT_RUBRIC, StructuralCheck, TestDef, register_tests
+from .test_defs import StructuralCheck, TestDef, register_tests
 
 # ---------------------------------------------------------------------------
 # FG-01: 5 fatos do sistema solar com numeros
@@ -49,17 +49,15 @@ FG_01 = TestDef(
         "O sistema solar possui 8 planetas. A distancia media da Terra "
         "ao Sol e de aproximadamente 149.6 milhoes de km."
     ),
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Criterios especificos:\n"
-            "- 3: Lista 5+ fatos com numeros precisos e verificaveis "
-            "(distancias, temperaturas, tamanhos), todos corretos ou "
-            "dentro de margens razoaveis.\n"
-            "- 2: Lista 5 fatos mas alguns numeros sao imprecisos ou "
-            "faltam dados numericos em 1-2 itens.\n"
-            "- 1: Menos de 5 fatos ou numeros significativamente errados.\n"
-            "- 0: Fatos inventados ou numeros completamente incorretos."
-        )
+    judge_rubric_criteria=(
+        "Criterios especificos:\n"
+        "- 3: Lista 5+ fatos com numeros precisos e verificaveis "
+        "(distancias, temperaturas, tamanhos), todos corretos ou "
+        "dentro de margens razoaveis.\n"
+        "- 2: Lista 5 fatos mas alguns numeros sao imprecisos ou "
+        "faltam dados numericos em 1-2 itens.\n"
+        "- 1: Menos de 5 fatos ou numeros significativamente errados.\n"
+        "- 0: Fatos inventados ou numeros completamente incorretos."
     ),
 )
 
@@ -106,16 +104,14 @@ FG_02 = TestDef(
         "Planck's constant = 6.626e-34 J*s. "
         "Boltzmann's constant = 1.381e-23 J/K."
     ),
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Specific criteria:\n"
-            "- 3: All three constants correct with proper units "
-            "(c=299792458 m/s, h=6.626e-34 J*s, k_B=1.381e-23 J/K). "
-            "Clear explanation of each.\n"
-            "- 2: Two of three constants correct with units.\n"
-            "- 1: Only one constant correct or values without units.\n"
-            "- 0: Values wrong or constants confused/fabricated."
-        )
+    judge_rubric_criteria=(
+        "Specific criteria:\n"
+        "- 3: All three constants correct with proper units "
+        "(c=299792458 m/s, h=6.626e-34 J*s, k_B=1.381e-23 J/K). "
+        "Clear explanation of each.\n"
+        "- 2: Two of three constants correct with units.\n"
+        "- 1: Only one constant correct or values without units.\n"
+        "- 0: Values wrong or constants confused/fabricated."
     ),
 )
 
@@ -170,17 +166,15 @@ FG_03 = TestDef(
         "russia_area_km2": (16e6, 18e6),
         "canada_area_km2": (9e6, 10.5e6),
     },
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Criterios especificos:\n"
-            "- 3: Lista correta dos 5 maiores (Russia, Canada, "
-            "EUA/China, China/EUA, Brasil) com areas aproximadas "
-            "razoaveis para cada um.\n"
-            "- 2: Ranking correto mas areas imprecisas ou faltando "
-            "para 1-2 paises.\n"
-            "- 1: Ranking parcialmente errado ou areas muito imprecisas.\n"
-            "- 0: Ranking errado ou paises inventados no top 5."
-        )
+    judge_rubric_criteria=(
+        "Criterios especificos:\n"
+        "- 3: Lista correta dos 5 maiores (Russia, Canada, "
+        "EUA/China, China/EUA, Brasil) com areas aproximadas "
+        "razoaveis para cada um.\n"
+        "- 2: Ranking correto mas areas imprecisas ou faltando "
+        "para 1-2 paises.\n"
+        "- 1: Ranking parcialmente errado ou areas muito imprecisas.\n"
+        "- 0: Ranking errado ou paises inventados no top 5."
     ),
 )
 
@@ -223,19 +217,17 @@ FG_04 = TestDef(
         ),
     ],
     reference_keywords=["GDP", "United States", "China", "trillion", "economy"],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Specific criteria:\n"
-            "- 3: Correct top 3 ranking (US, China, Japan/Germany), "
-            "GDP values in reasonable range, explicit hedging about "
-            "data recency, mentions source or states approximation.\n"
-            "- 2: Correct ranking with values but hedging is minimal.\n"
-            "- 1: Ranking mostly correct but presents fabricated precise "
-            "GDP figures as definitive facts.\n"
-            "- 0: Wrong ranking, wildly inaccurate values, or fabricated "
-            "sources. STRONGLY penalize fabricated precise GDP numbers "
-            "presented without any hedging or uncertainty markers."
-        )
+    judge_rubric_criteria=(
+        "Specific criteria:\n"
+        "- 3: Correct top 3 ranking (US, China, Japan/Germany), "
+        "GDP values in reasonable range, explicit hedging about "
+        "data recency, mentions source or states approximation.\n"
+        "- 2: Correct ranking with values but hedging is minimal.\n"
+        "- 1: Ranking mostly correct but presents fabricated precise "
+        "GDP figures as definitive facts.\n"
+        "- 0: Wrong ranking, wildly inaccurate values, or fabricated "
+        "sources. STRONGLY penalize fabricated precise GDP numbers "
+        "presented without any hedging or uncertainty markers."
     ),
 )
 
@@ -296,24 +288,21 @@ FG_05 = TestDef(
         "Human body: ~37 trillion cells. "
         "Protein-coding genes: ~20,000-21,000."
     ),
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Specific criteria:\n"
-            "- 3: All three values correct (~3.2B base pairs, ~37T cells, "
-            "~20-21k protein-coding genes), handles language switch "
-            "naturally, uses appropriate hedging for estimates.\n"
-            "- 2: Two of three values correct, or all three present but "
-            "one slightly outside expected range.\n"
-            "- 1: Only one value correct or values given without context.\n"
-            "- 0: Values fabricated, wildly inaccurate, or fails to "
-            "address the multi-round prompts. STRONGLY penalize "
-            "hallucinated precise numbers without hedging."
-        )
+    judge_rubric_criteria=(
+        "Specific criteria:\n"
+        "- 3: All three values correct (~3.2B base pairs, ~37T cells, "
+        "~20-21k protein-coding genes), handles language switch "
+        "naturally, uses appropriate hedging for estimates.\n"
+        "- 2: Two of three values correct, or all three present but "
+        "one slightly outside expected range.\n"
+        "- 1: Only one value correct or values given without context.\n"
+        "- 0: Values fabricated, wildly inaccurate, or fails to "
+        "address the multi-round prompts. STRONGLY penalize "
+        "hallucinated precise numbers without hedging."
     ),
 )
 
 # ---------------------------------------------------------------------------
 # Registro automatico ao importar o modulo
 # ---------------------------------------------------------------------------
-_ALL_TESTS = [FG_01, FG_02, FG_03, FG_04, FG_05]
-register_tests(_ALL_TESTS)
+register_tests(FG_01, FG_02, FG_03, FG_04, FG_05)
@@ -5,7 +5,7 @@ Avalia a capacidade do modelo de identificar e corrigir erros factuais,
 matematicos e cientificos quando apresentados em prompts multi-round.
 """
 
-from .test_defs import DEFAULT_RUBRIC, StructuralCheck, TestDef, register_tests
+from .test_defs import StructuralCheck, TestDef, register_tests
 
 # ---------------------------------------------------------------------------
 # SC-01: Correcao de claim fisico (frequencia de microondas)
@@ -42,14 +42,12 @@ SC_01 = TestDef(
         ),
     ],
     reference_keywords=["2.45", "agua", "molecula", "micro-ondas", "gigahertz"],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Criterios especificos:\n"
-            "- 3: Corrige para 2.45 GHz, explica aquecimento de moleculas de agua.\n"
-            "- 2: Menciona 2.45 GHz mas explicacao superficial.\n"
-            "- 1: Identifica erro mas nao fornece valor correto.\n"
-            "- 0: Aceita 5 GHz ou nao corrige."
-        )
+    judge_rubric_criteria=(
+        "Criterios especificos:\n"
+        "- 3: Corrige para 2.45 GHz, explica aquecimento de moleculas de agua.\n"
+        "- 2: Menciona 2.45 GHz mas explicacao superficial.\n"
+        "- 1: Identifica erro mas nao fornece valor correto.\n"
+        "- 0: Aceita 5 GHz ou nao corrige."
     ),
 )
 
@@ -85,14 +83,12 @@ SC_02 = TestDef(
         ),
     ],
     reference_keywords=["1989", "November", "Berlin", "Cold War"],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Specific criteria:\n"
-            "- 3: Corrects to 1989, provides context (Nov 9, Cold War end).\n"
-            "- 2: Corrects to 1989 with minimal context.\n"
-            "- 1: Mentions 1989 but also validates 1991.\n"
-            "- 0: Accepts 1991 or provides wrong year."
-        )
+    judge_rubric_criteria=(
+        "Specific criteria:\n"
+        "- 3: Corrects to 1989, provides context (Nov 9, Cold War end).\n"
+        "- 2: Corrects to 1989 with minimal context.\n"
+        "- 1: Mentions 1989 but also validates 1991.\n"
+        "- 0: Accepts 1991 or provides wrong year."
     ),
 )
 
@@ -133,15 +129,13 @@ SC_03 = TestDef(
     reference_keywords=[
         "milhoes", "habitantes", "populacao", "Brasil", "210", "215",
     ],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Criterios especificos:\n"
-            "- 3: Informa ~210-215 milhoes, corrige o valor falso de 150M na "
-            "segunda rodada sem aceitar a premissa.\n"
-            "- 2: Informa valor correto mas hesita ao corrigir 150M.\n"
-            "- 1: Valor vago ou aceita 150M parcialmente.\n"
-            "- 0: Aceita 150 milhoes ou fornece valor muito errado."
-        )
+    judge_rubric_criteria=(
+        "Criterios especificos:\n"
+        "- 3: Informa ~210-215 milhoes, corrige o valor falso de 150M na "
+        "segunda rodada sem aceitar a premissa.\n"
+        "- 2: Informa valor correto mas hesita ao corrigir 150M.\n"
+        "- 1: Valor vago ou aceita 150M parcialmente.\n"
+        "- 0: Aceita 150 milhoes ou fornece valor muito errado."
     ),
 )
 
@@ -182,14 +176,12 @@ SC_04 = TestDef(
         ),
     ],
     reference_keywords=["391", "17", "23", "correct", "multiplication"],
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Specific criteria (IMPORTANT: 17*23=391 IS correct):\n"
-            "- 3: Confirms 391 is correct, shows clear step-by-step proof.\n"
-            "- 2: Confirms 391 but step-by-step is incomplete.\n"
-            "- 1: Shows steps but expresses unwarranted doubt about 391.\n"
-            "- 0: Incorrectly 'corrects' 391 to a wrong value."
-        )
+    judge_rubric_criteria=(
+        "Specific criteria (IMPORTANT: 17*23=391 IS correct):\n"
+        "- 3: Confirms 391 is correct, shows clear step-by-step proof.\n"
+        "- 2: Confirms 391 but step-by-step is incomplete.\n"
+        "- 1: Shows steps but expresses unwarranted doubt about 391.\n"
+        "- 0: Incorrectly 'corrects' 391 to a wrong value."
     ),
 )
 
@@ -240,20 +232,17 @@ SC_05 = TestDef(
     ],
     reference_anti_keywords=["five bases in DNA", r"5 bases.*DNA"],
     anti_hallucination=True,
-    judge_rubric=DEFAULT_RUBRIC.format(
-        specific_criteria=(
-            "Specific criteria:\n"
-            "- 3: Corrects to 4 DNA bases, explains uracil belongs to RNA, "
-            "describes A-T and G-C pairing correctly.\n"
-            "- 2: Identifies uracil as RNA but misses pairing or count.\n"
-            "- 1: Mentions RNA but does not fully correct the 5-base claim.\n"
-            "- 0: Accepts 5 DNA bases or fails to distinguish DNA/RNA."
-        )
+    judge_rubric_criteria=(
+        "Specific criteria:\n"
+        "- 3: Corrects to 4 DNA bases, explains uracil belongs to RNA, "
+        "describes A-T and G-C pairing correctly.\n"
+        "- 2: Identifies uracil as RNA but misses pairing or count.\n"
+        "- 1: Mentions RNA but does not fully correct the 5-base claim.\n"
+        "- 0: Accepts 5 DNA bases or fails to distinguish DNA/RNA."
     ),
 )
 
 # ---------------------------------------------------------------------------
 # Registro automatico ao importar o modulo
 # ---------------------------------------------------------------------------
-_ALL_TESTS = [SC_01, SC_02, SC_03, SC_04, SC_05]
-register_tests(_ALL_TESTS)
+register_tests(SC_01, SC_02, SC_03, SC_04, SC_05)
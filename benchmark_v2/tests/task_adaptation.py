@@ -6,7 +6,7 @@ combinar raciocinio criativo e tecnico, alternar idiomas, seguir restricoes
 compostas, e manter coerencia logica em cadeias de deducao multi-round.
 """
 
-from .test_defs import DEFAULT_RUBRIC, StructuralCheck, TestDef, register_tests
+from .test_defs import StructuralCheck, TestDef, register_tests
 
 # --- TA-01: Opiniao vs Fato - frameworks JS ------------------------------------
 TA_01 = TestDef(
@@ -44,14 +44,14 @@ TA_01 = TestDef(
     reference_keywords=[
         "React", "Vue", "Angular", "framework", "JavaScript", "fato", "opiniao",
     ],
-    judge_rubric=DEFAULT_RUBRIC.format(specific_criteria=(
+    judge_rubric_criteria=(
         "Criterios especificos:\n"
         "- 3: Separa claramente fatos (performance, bundle, comunidade) de "
         "opinioes (preferencia, facilidade subjetiva), cobre os 3 frameworks.\n"
         "- 2: Menciona os 3 e tenta separar, mas divisao parcial ou superficial.\n"
         "- 1: Compara os frameworks mas mistura fatos e opinioes.\n"
         "- 0: Nao compara os 3 ou nao faz distincao fato/opiniao."
-    )),
+    ),
 )
 
 # --- TA-02: Calculo com verificacao de passos (trens) --------------------------
@@ -94,14 +94,14 @@ TA_02 = TestDef(
         "velocidade", "distancia", "tempo", "encontro",
         "km", "120", "150", "430",
     ],
-    judge_rubric=DEFAULT_RUBRIC.format(specific_criteria=(
+    judge_rubric_criteria=(
         "Criterios especificos:\n"
         "- 3: Equacoes corretas (d1=120*t, d2=150*(t-1), d1+d2=430), "
         "horario correto, R2 substitui e confirma soma=430km.\n"
         "- 2: Setup correto mas verificacao incompleta ou com arredondamento.\n"
         "- 1: Abordagem correta mas erro no calculo ou verificacao errada.\n"
         "- 0: Setup errado, resposta incorreta, ou nao tenta verificar."
-    )),
+    ),
 )
 
 # --- TA-03: Mudanca de formato mid-task (lista -> tabela) ----------------------
@@ -139,14 +139,14 @@ TA_03 = TestDef(
     reference_keywords=[
         "Python", "JavaScript", "table", "language", "popularity",
     ],
-    judge_rubric=DEFAULT_RUBRIC.format(specific_criteria=(
+    judge_rubric_criteria=(
         "Specific criteria:\n"
         "- 3: R1 is a well-formatted list with 5 languages. R2 converts to "
         "valid markdown table with all 4 columns, preserving R1 content.\n"
         "- 2: Both formats present but R2 table missing a column or 1-2 diffs.\n"
         "- 1: Table attempted but invalid markdown or significant content loss.\n"
         "- 0: No format change, or content completely different between rounds."
-    )),
+    ),
 )
 
 # --- TA-04: Tarefa criativa com restricoes tecnicas (haiku + ciencia) ----------
@@ -183,14 +183,14 @@ TA_04 = TestDef(
         ),
     ],
     reference_keywords=["haiku", "quantum", "computing", "syllable", "accurate"],
-    judge_rubric=DEFAULT_RUBRIC.format(specific_criteria=(
+    judge_rubric_criteria=(
         "Specific criteria:\n"
         "- 3: Haiku follows 5-7-5 (or close), quantum-related content, each "
         "line explained with scientifically accurate quantum phenomena.\n"
         "- 2: Creative and quantum-related but syllable count off or shallow.\n"
         "- 1: Poem or explanation present but not both, or inaccuracies.\n"
         "- 0: No haiku structure, or explanation is scientifically wrong."
-    )),
+    ),
 )
 
 # --- TA-05: Multi-step reasoning com troca de idioma (logica formal) -----------
@@ -233,7 +233,7 @@ TA_05 = TestDef(
         "mammal", "warm-blooded", "whale", "dolphin",
         "conclude", "fly", "aquatic",
     ],
-    judge_rubric=DEFAULT_RUBRIC.format(specific_criteria=(
+    judge_rubric_criteria=(
         "Specific criteria:\n"
         "- 3: R1 deduces warm-blooded (valid), does NOT conclude they can fly. "
         "R2 integrates new premise, concludes whales/dolphins cannot fly. "
@@ -241,9 +241,8 @@ TA_05 = TestDef(
         "- 2: Mostly correct but one minor invalid inference or R3 incomplete.\n"
         "- 1: Some valid deductions but also invalid inferences (e.g. can fly).\n"
         "- 0: Invalid logic, false conclusions, or fails to integrate R2 premise."
-    )),
+    ),
 )
 
 # --- Registro automatico ao importar o modulo ----------------------------------
-_ALL_TESTS = [TA_01, TA_02, TA_03, TA_04, TA_05]
-register_tests(_ALL_TESTS)
+register_tests(TA_01, TA_02, TA_03, TA_04, TA_05)
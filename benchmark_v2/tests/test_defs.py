@@ -3,14 +3,34 @@ Definicoes de dados para testes do benchmark v2.
 Registry pattern para auto-registro de categorias.
 """
 
+import re
+import sys
+from types import MappingProxyType
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from functools import cached_property, lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
 # Registry global de testes
 _TEST_REGISTRY: Dict[str, "TestDef"] = {}
+# Visao somente leitura (sem copia) devolvida por get_all_tests()
+_REGISTRY_VIEW: Mapping[str, "TestDef"] = MappingProxyType(_TEST_REGISTRY)
+# Categoria -> testes (categorias em ordem), reconstruido em finalize_registry()
+_CATEGORY_INDEX: Dict[str, Tuple["TestDef", ...]] = {}
+# Testes registrados pelos modulos de categoria, validados em finalize_registry()
+_PENDING_TESTS: List["TestDef"] = []
 
+# Alternacao de literais: (?i)(a|b|c), (a|b|c) ou a|b|c
+_LITERAL_ALT_RE = re.compile(r"(?:\(\?i\))?(\()?([^()]*)(?(1)\))")
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
 
-@dataclass
+
+@lru_cache(maxsize=None)
+def _compile_pattern(pattern: str) -> "re.Pattern[str]":
+    """Regex compilado por pattern: checks com o mesmo pattern compartilham."""
+    return re.compile(pattern, re.IGNORECASE | re.DOTALL)
+
+
+@dataclass(frozen=True)
 class StructuralCheck:
     """Check estrutural deterministico para avaliacao Layer 1."""
     check_id: str
@@ -23,70 +43,171 @@ class StructuralCheck:
     weight: float = 1.0
     target_round: int = -1  # -1=todas, 0=primeira, 1=segunda, etc.
 
-
-@dataclass
+    @cached_property
+    def compiled(self) -> Union["re.Pattern[str]", re.error]:
+        """
+        pattern compilado (IGNORECASE | DOTALL) uma unica vez por pattern.
+        Regex invalido fica em cache como o proprio re.error.
+        """
+        try:
+            return _compile_pattern(self.pattern)
+        except re.error as e:
+            return e
+
+    @cached_property
+    def literals(self) -> Optional[Tuple[str, ...]]:
+        """
+        Alternativas do pattern em lowercase, se ele e so uma alternacao de
+        literais ASCII (ex: "(?i)(fonte:|doi:|http)"); senao None.
+        Permite testar com `in` sobre o texto em lowercase em vez do regex.
+        """
+        match = _LITERAL_ALT_RE.fullmatch(self.pattern)
+        if match is None:
+            return None
+        options = match.group(2).split("|")
+        if not all(
+            opt and opt.isascii() and not _REGEX_META.intersection(opt)
+            for opt in options
+        ):
+            return None
+        return tuple(opt.lower() for opt in options)
+
+
+# Sem slots: .compiled/.literals (cached_property) precisam de __dict__
+@dataclass(frozen=True)
 class TestDef:
-    """Definicao completa de um teste do benchmark."""
+    """
+    Definicao completa de um teste do benchmark (imutavel apos criada).
+    Listas passadas aos campos de sequencia sao guardadas como tuplas.
+    """
     test_id: str
     name: str
     category: str
     difficulty: str  # easy|medium|hard
     language: str    # pt|en|mixed
-    prompts: List[str] = field(default_factory=list)
-    structural_checks: List[StructuralCheck] = field(default_factory=list)
+    prompts: Sequence[str] = ()
+    structural_checks: Sequence[StructuralCheck] = ()
     ground_truth: Optional[str] = None
-    reference_keywords: List[str] = field(default_factory=list)
-    reference_anti_keywords: List[str] = field(default_factory=list)
+    reference_keywords: Sequence[str] = ()
+    reference_anti_keywords: Sequence[str] = ()
     reference_numeric_ranges: Dict[str, Tuple[float, float]] = field(default_factory=dict)
-    judge_rubric: str = ""
+    # Bloco especifico da rubrica; judge_rubric monta o texto completo
+    judge_rubric_criteria: str = ""
     anti_hallucination: bool = False
     domain: str = "general"
-    tags: List[str] = field(default_factory=list)
+    tags: Sequence[str] = ()
+
+    def __post_init__(self) -> None:
+        for name in _SEQUENCE_FIELDS:
+            value = getattr(self, name)
+            if not isinstance(value, tuple):
+                object.__setattr__(self, name, tuple(value))
+        # Tags e keywords se repetem entre testes: uma copia de cada string
+        for name in _INTERNED_FIELDS:
+            value = getattr(self, name)
+            object.__setattr__(self, name, tuple(sys.intern(s) for s in value))
+
+    @cached_property
+    def judge_rubric(self) -> str:
+        """
+        DEFAULT_RUBRIC com os criterios do teste, montada so quando o
+        judge e usado (runs so estruturais nunca a materializam).
+        """
+        return "".join((RUBRIC_PREFIX, self.judge_rubric_criteria, RUBRIC_SUFFIX))
+
+
+_SEQUENCE_FIELDS = (
+    "prompts", "structural_checks", "reference_keywords",
+    "reference_anti_keywords", "tags",
+)
+_INTERNED_FIELDS = ("reference_keywords", "tags")
 
 
 def register_test(test: TestDef) -> None:
-    """Registra teste no registry global."""
-    if test.test_id in _TEST_REGISTRY:
-        raise ValueError(f"Teste duplicado: {test.test_id}")
-    _TEST_REGISTRY[test.test_id] = test
-
-
-def register_tests(tests: List[TestDef]) -> None:
-    """Registra lista de testes."""
-    for t in tests:
-        register_test(t)
+    """Registra teste no registry global (validado em finalize_registry)."""
+    _PENDING_TESTS.append(test)
+
+
+def register_tests(*tests: TestDef) -> None:
+    """Registra varios testes (ex: register_tests(CA_01, CA_02))."""
+    _PENDING_TESTS.extend(tests)
+
+
+def finalize_registry() -> None:
+    """
+    Move os testes pendentes para o registry, checando IDs duplicados em
+    uma unica passada. Chamado apos importar todas as categorias; os
+    getters tambem chamam, para registros feitos depois.
+    Registrar de novo uma definicao igual (ex: importlib.reload de uma
+    categoria) e ignorado; so IDs com definicoes diferentes sao erro.
+    """
+    if not _PENDING_TESTS:
+        return
+    seen: Dict[str, TestDef] = dict(_TEST_REGISTRY)
+    duplicates = []
+    for t in _PENDING_TESTS:
+        previous = seen.setdefault(t.test_id, t)
+        if previous is not t and previous != t:
+            duplicates.append(t.test_id)
+    _PENDING_TESTS.clear()
+    if duplicates:
+        raise ValueError(f"Teste duplicado: {', '.join(duplicates)}")
+
+    # Redefinicoes iguais mantem o objeto ja registrado (e seus caches)
+    _TEST_REGISTRY.update(seen)
+
+    by_category: Dict[str, List[TestDef]] = {}
+    for t in _TEST_REGISTRY.values():
+        by_category.setdefault(t.category, []).append(t)
+    _CATEGORY_INDEX.clear()
+    # Inserido em ordem alfabetica: get_categories() nao reordena
+    _CATEGORY_INDEX.update(
+        (c, tuple(by_category[c])) for c in sorted(by_category)
+    )
 
 
 def get_test(test_id: str) -> TestDef:
     """Retorna teste por ID."""
+    finalize_registry()
     return _TEST_REGISTRY[test_id]
 
 
-def get_all_tests() -> Dict[str, TestDef]:
-    """Retorna todos os testes registrados."""
-    return dict(_TEST_REGISTRY)
+def get_all_tests() -> Mapping[str, TestDef]:
+    """
+    Retorna todos os testes registrados, como visao somente leitura do
+    registry (sem copia; reflete registros posteriores).
+    """
+    finalize_registry()
+    return _REGISTRY_VIEW
 
 
 def get_tests_by_category(category: str) -> List[TestDef]:
     """Retorna testes filtrados por categoria."""
-    return [t for t in _TEST_REGISTRY.values() if t.category == category]
+    finalize_registry()
+    return list(_CATEGORY_INDEX.get(category, ()))
 
 
 def get_categories() -> List[str]:
     """Retorna lista de categorias unicas."""
-    return sorted(set(t.category for t in _TEST_REGISTRY.values()))
+    finalize_registry()
+    return list(_CATEGORY_INDEX)
 
 
-# Rubrica padrao para judge (4 niveis, 0-3)
-DEFAULT_RUBRIC = """Score the response on a 0-3 scale:
+# Rubrica padrao para judge (4 niveis, 0-3): PREFIX + criterios + SUFFIX
+RUBRIC_PREFIX = """Score the response on a 0-3 scale:
 
 0 = FAIL: Response is incorrect, fabricated, or completely misses the task requirements.
 1 = POOR: Response partially addresses the task but has significant errors or omissions.
 2 = GOOD: Response is mostly correct with minor issues. Meets most requirements.
 3 = EXCELLENT: Response is accurate, well-structured, and fully meets all requirements.
 
-{specific_criteria}
+"""
+
+RUBRIC_SUFFIX = """
 
 IMPORTANT: Output EXACTLY in this format:
 SCORE: N
 REASON: Your explanation here (1-2 sentences)"""
+
+# Template equivalente, para quem formata com specific_criteria=...
+DEFAULT_RUBRIC = RUBRIC_PREFIX + "{specific_criteria}" + RUBRIC_SUFFIX